@@ -0,0 +1,166 @@
+import os
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('numpy', 'python', 'numba')
+
+# Sequential kernels for the path-dependent loops; 'python' runs them interpreted (slow, useful
+# for debugging) and 'numba' compiles them on first use. The trading kernels keep the exact
+# operation order of the vectorized NumPy code so their results are bit-identical. The AR filter
+# runs the plain O(N) recurrence instead of NumPy's doubling scan, so it only matches to rounding.
+
+def ar_filter_kernel(shocks, coefficients):
+    n = shocks.shape[0]
+    values = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return values
+    
+    values[0] = shocks[0]
+    for i in range(1, n):
+        values[i] = shocks[i] + coefficients[i] * values[i - 1]
+    
+    return values
+
+def longest_run_kernel(mask):
+    num_rows, n = mask.shape
+    result = np.zeros(num_rows, dtype=np.int64)
+    
+    for r in range(num_rows):
+        best = 0
+        current = 0
+        for i in range(n):
+            if mask[r, i]:
+                current += 1
+                if current > best:
+                    best = current
+            else:
+                current = 0
+        result[r] = best
+    
+    return result
+
+def long_only_kernel(close, slippage, entry, exit, last_rows, initial_capital, commission):
+    n, num_runs = entry.shape
+    capital_curve = np.empty((n, num_runs), dtype=np.float64)
+    position_curve = np.empty((n, num_runs), dtype=np.int64)
+    
+    capacity = num_runs
+    for i in range(n):
+        for r in range(num_runs):
+            if entry[i, r] or exit[i, r]:
+                capacity += 1
+    
+    runs = np.empty(capacity, dtype=np.int64)
+    rows = np.empty(capacity, dtype=np.int64)
+    is_buy = np.empty(capacity, dtype=np.bool_)
+    price = np.empty(capacity, dtype=np.float64)
+    shares = np.empty(capacity, dtype=np.int64)
+    value = np.empty(capacity, dtype=np.float64)
+    pnl = np.full(capacity, np.nan)
+    pnl_pct = np.full(capacity, np.nan)
+    k = 0
+    
+    for r in range(num_runs):
+        capital = initial_capital
+        position = 0
+        entry_price = 0.0
+        
+        for i in range(n):
+            if position == 0 and entry[i, r]:
+                execution_price = close[i, r] * (1 + slippage[i, r])
+                units = np.trunc(capital / (execution_price * (1 + commission)))
+                if np.isfinite(units) and units > 0:
+                    shares_to_buy = int(units)
+                    cost = shares_to_buy * execution_price * (1 + commission)
+                    entry_price = execution_price
+                    position = shares_to_buy
+                    capital -= cost
+                    
+                    runs[k] = r
+                    rows[k] = i
+                    is_buy[k] = True
+                    price[k] = execution_price
+                    shares[k] = shares_to_buy
+                    value[k] = cost
+                    k += 1
+            elif position > 0 and exit[i, r]:
+                execution_price = close[i, r] * (1 - slippage[i, r])
+                proceeds = position * execution_price * (1 - commission)
+                
+                runs[k] = r
+                rows[k] = i
+                is_buy[k] = False
+                price[k] = execution_price
+                shares[k] = position
+                value[k] = proceeds
+                pnl[k] = proceeds - (position * entry_price * (1 + commission))
+                pnl_pct[k] = ((execution_price / entry_price) - 1) * 100
+                k += 1
+                
+                capital += proceeds
+                position = 0
+            
+            capital_curve[i, r] = capital
+            position_curve[i, r] = position
+        
+        if position > 0:
+            last = last_rows[r]
+            execution_price = close[last, r] * (1 - slippage[last, r])
+            proceeds = position * execution_price * (1 - commission)
+            
+            runs[k] = r
+            rows[k] = last
+            is_buy[k] = False
+            price[k] = execution_price
+            shares[k] = position
+            value[k] = proceeds
+            pnl[k] = proceeds - (position * entry_price * (1 + commission))
+            pnl_pct[k] = ((execution_price / entry_price) - 1) * 100
+            k += 1
+    
+    return (
+        capital_curve, position_curve,
+        (runs[:k], rows[:k], is_buy[:k], price[:k], shares[:k], value[:k], pnl[:k], pnl_pct[:k])
+    )
+
+KERNELS = {
+    'ar_filter': ar_filter_kernel,
+    'longest_run': longest_run_kernel,
+    'long_only': long_only_kernel
+}
+
+_compiled = {}
+_backend = None
+
+def available_backends():
+    return [name for name in BACKENDS if name != 'numba' or numba is not None]
+
+def set_backend(name='auto'):
+    global _backend
+    name = name.lower()
+    if name == 'auto':
+        name = 'numba' if numba is not None else 'numpy'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name}, expected one of {BACKENDS} or 'auto'")
+    if name == 'numba' and numba is None:
+        raise ValueError("The numba backend needs numba installed (pip install numba)")
+    
+    _backend = name
+    return _backend
+
+def get_backend():
+    if _backend is None:
+        set_backend(os.environ.get('BACKTEST_BACKEND', 'auto'))
+    return _backend
+
+def kernel(name, backend=None):
+    backend = backend or get_backend()
+    if backend == 'numba':
+        if name not in _compiled:
+            _compiled[name] = numba.njit(cache=True, nogil=True)(KERNELS[name])
+        return _compiled[name]
+    return KERNELS[name]
@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from metrics import PerformanceMetrics
+from recorders import TradeRecorder, EquityRecorder
+import backends
+from instrumentation import StageProfiler
 
 class BacktestEngine:
     
@@ -8,7 +12,8 @@ class BacktestEngine:
         self.initial_capital = initial_capital
         self.commission = commission
         self.base_slippage = base_slippage
-        
+        self.profiler = StageProfiler()
+    
     def _calculate_realistic_slippage(self, data, index, is_buy):
         if 'TEMP_ATR' in data.columns:
             atr = data['TEMP_ATR'].iloc[index]
@@ -24,19 +29,18 @@ class BacktestEngine:
         slippage = min(slippage, 0.005)
         
         return slippage if is_buy else -slippage
-        
+    
     def run_backtest(self, data, signals):
         capital = self.initial_capital
         position = 0
         position_value = 0
         entry_price = 0
         
-        trades = []
-        equity_curve = []
+        trades = TradeRecorder()
+        equity_curve = EquityRecorder(len(data))
         
         for i in range(len(data)):
             current_price = data['Close'].iloc[i]
-            date = data.index[i]
             
             if signals['entry'].iloc[i] and position == 0:
                 slippage = self._calculate_realistic_slippage(data, i, True)
@@ -52,28 +56,18 @@ class BacktestEngine:
                     capital -= cost
                     position_value = position * current_price
                     
-                    trades.append({
-                        'date': date,
-                        'type': 'BUY',
-                        'price': entry_price,
-                        'shares': shares_to_buy,
-                        'value': cost
-                    })
+                    trades.record(i, 'BUY', entry_price, shares_to_buy, cost)
             
             elif signals['exit'].iloc[i] and position > 0:
                 slippage = self._calculate_realistic_slippage(data, i, False)
                 execution_price = current_price * (1 + slippage)
                 proceeds = position * execution_price * (1 - self.commission)
                 
-                trades.append({
-                    'date': date,
-                    'type': 'SELL',
-                    'price': execution_price,
-                    'shares': position,
-                    'value': proceeds,
-                    'pnl': proceeds - (position * entry_price * (1 + self.commission)),
-                    'pnl_pct': ((execution_price / entry_price) - 1) * 100
-                })
+                trades.record(
+                    i, 'SELL', execution_price, position, proceeds,
+                    proceeds - (position * entry_price * (1 + self.commission)),
+                    ((execution_price / entry_price) - 1) * 100
+                )
                 
                 capital += proceeds
                 position = 0
@@ -83,12 +77,7 @@ class BacktestEngine:
                 position_value = position * current_price
             
             total_equity = capital + position_value
-            equity_curve.append({
-                'date': date,
-                'equity': total_equity,
-                'capital': capital,
-                'position_value': position_value
-            })
+            equity_curve.record(total_equity, capital, position_value)
         
         if position > 0:
             final_price = data['Close'].iloc[-1]
@@ -96,227 +85,309 @@ class BacktestEngine:
             execution_price = final_price * (1 + slippage)
             proceeds = position * execution_price * (1 - self.commission)
             
-            trades.append({
-                'date': data.index[-1],
-                'type': 'SELL',
-                'price': execution_price,
-                'shares': position,
-                'value': proceeds,
-                'pnl': proceeds - (position * entry_price * (1 + self.commission)),
-                'pnl_pct': ((execution_price / entry_price) - 1) * 100
-            })
+            trades.record(
+                len(data) - 1, 'SELL', execution_price, position, proceeds,
+                proceeds - (position * entry_price * (1 + self.commission)),
+                ((execution_price / entry_price) - 1) * 100
+            )
             
             capital += proceeds
         
-        metrics = self._calculate_metrics(
-            equity_curve, 
-            trades, 
-            self.initial_capital
-        )
+        if len(data) == 0:
+            metrics = self._empty_metrics()
+        else:
+            metrics = self._metrics_from_arrays(
+                PerformanceMetrics.equity_stats(equity_curve.equity, self.initial_capital),
+                trades.sell_pnl(),
+                trades.durations(data.index)
+            )
         
         return {
             'metrics': metrics,
-            'trades': pd.DataFrame(trades),
-            'equity_curve': pd.DataFrame(equity_curve)
+            'trades': trades.to_frame(data.index),
+            'equity_curve': equity_curve.to_frame(data.index) if len(data) > 0 else pd.DataFrame()
         }
     
-    def _calculate_metrics(self, equity_curve, trades, initial_capital):
-        df_equity = pd.DataFrame(equity_curve)
-        df_trades = pd.DataFrame(trades)
-        
-        if len(df_equity) == 0:
-            return self._empty_metrics()
-        
-        final_equity = df_equity['equity'].iloc[-1]
-        total_return = ((final_equity / initial_capital) - 1) * 100
-        
-        df_equity['returns'] = df_equity['equity'].pct_change()
-        returns = df_equity['returns'].dropna()
+    def _slippage_array(self, data):
+        close = data['Close'].to_numpy(dtype=np.float64)
+        atr = data['TEMP_ATR'].to_numpy(dtype=np.float64) if 'TEMP_ATR' in data.columns else None
+        return self._volatility_slippage(close, atr)
+    
+    def _volatility_slippage(self, close, atr=None):
+        slippage = np.full(close.shape, self.base_slippage)
+        if atr is not None:
+            valid = ~np.isnan(atr) & (close > 0)
+            volatility_factor = atr[valid] / close[valid]
+            slippage[valid] = self.base_slippage * (1 + volatility_factor * 10)
         
-        df_equity['peak'] = df_equity['equity'].cummax()
-        df_equity['drawdown'] = (df_equity['equity'] - df_equity['peak']) / df_equity['peak'] * 100
-        max_drawdown = df_equity['drawdown'].min()
+        return np.minimum(slippage, 0.005)
+    
+    def _new_long_only_state(self, num_runs):
+        return {
+            'capital': np.full(num_runs, self.initial_capital, dtype=np.float64),
+            'position': np.zeros(num_runs, dtype=np.int64),
+            'entry_price': np.zeros(num_runs, dtype=np.float64)
+        }
+    
+    def _step_long_only(self, close, slippage, entry, exit, state):
+        n, num_runs = entry.shape
+        close = np.broadcast_to(close.reshape(n, -1), (n, num_runs))
+        slippage = np.broadcast_to(slippage.reshape(n, -1), (n, num_runs))
         
-        avg_drawdown = df_equity['drawdown'].mean()
-        drawdown_duration = self._calculate_drawdown_duration(df_equity)
+        capital = state['capital']
+        position = state['position']
+        entry_price = state['entry_price']
         
-        if len(returns) > 0 and returns.std() > 0:
-            sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252)
-            downside_returns = returns[returns < 0]
-            if len(downside_returns) > 0 and downside_returns.std() > 0:
-                sortino_ratio = (returns.mean() / downside_returns.std()) * np.sqrt(252)
-            else:
-                sortino_ratio = 0
-            calmar_ratio = (total_return / abs(max_drawdown)) if max_drawdown != 0 else 0
-        else:
-            sharpe_ratio = 0
-            sortino_ratio = 0
-            calmar_ratio = 0
+        capital_states = np.empty((n + 1, num_runs), dtype=np.float64)
+        position_states = np.empty((n + 1, num_runs), dtype=np.int64)
+        capital_states[0] = capital
+        position_states[0] = position
+        changed = np.zeros((n + 1, num_runs), dtype=bool)
         
-        ulcer_index = np.sqrt(np.mean(df_equity['drawdown'] ** 2))
+        trade_rows = [TradeRecorder() for _ in range(num_runs)]
         
-        if len(df_trades) > 0:
-            sell_trades = df_trades[df_trades['type'] == 'SELL'].copy()
-            num_trades = len(sell_trades)
+        for i in np.flatnonzero((entry | exit).any(axis=1)):
+            current_price = close[i]
             
-            if num_trades > 0:
-                wins = sell_trades[sell_trades['pnl'] > 0]
-                losses = sell_trades[sell_trades['pnl'] < 0]
-                
-                num_wins = len(wins)
-                num_losses = len(losses)
-                win_rate = (num_wins / num_trades) * 100
-                
-                avg_win = wins['pnl'].mean() if num_wins > 0 else 0
-                avg_loss = losses['pnl'].mean() if num_losses > 0 else 0
-                
-                total_wins = wins['pnl'].sum() if num_wins > 0 else 0
-                total_losses = abs(losses['pnl'].sum()) if num_losses > 0 else 0
-                
-                profit_factor = total_wins / total_losses if total_losses != 0 else 0
-                payoff_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else 0
-                
-                expectancy = (win_rate/100 * avg_win) + ((1 - win_rate/100) * avg_loss)
-                
-                max_win = wins['pnl'].max() if num_wins > 0 else 0
-                max_loss = losses['pnl'].min() if num_losses > 0 else 0
-                
-                buy_dates = df_trades[df_trades['type'] == 'BUY']['date'].values
-                sell_dates = sell_trades['date'].values
-                if len(buy_dates) > 0 and len(sell_dates) > 0:
-                    trade_durations = []
-                    for i in range(min(len(buy_dates), len(sell_dates))):
-                        duration = (sell_dates[i] - buy_dates[i]).astype('timedelta64[D]').astype(int)
-                        trade_durations.append(duration)
-                    avg_trade_duration = np.mean(trade_durations) if trade_durations else 0
-                    max_trade_duration = np.max(trade_durations) if trade_durations else 0
-                    min_trade_duration = np.min(trade_durations) if trade_durations else 0
-                else:
-                    avg_trade_duration = 0
-                    max_trade_duration = 0
-                    min_trade_duration = 0
-                
-                consecutive_wins = self._calculate_consecutive(sell_trades, 'pnl', lambda x: x > 0)
-                consecutive_losses = self._calculate_consecutive(sell_trades, 'pnl', lambda x: x < 0)
-                max_consecutive_wins = max(consecutive_wins) if consecutive_wins else 0
-                max_consecutive_losses = max(consecutive_losses) if consecutive_losses else 0
-                
-                recovery_factor = total_return / abs(max_drawdown) if max_drawdown != 0 else 0
+            sell = np.flatnonzero(exit[i] & (position > 0))
+            buy = np.flatnonzero(entry[i] & (position == 0))
+            
+            if len(buy) > 0:
+                execution_price = current_price[buy] * (1 + slippage[i, buy])
+                shares_to_buy = np.trunc(capital[buy] / (execution_price * (1 + self.commission))).astype(np.int64)
+                filled = shares_to_buy > 0
+                buy = buy[filled]
+                execution_price = execution_price[filled]
+                shares_to_buy = shares_to_buy[filled]
                 
-                if win_rate < 100 and payoff_ratio > 0:
-                    kelly_pct = (win_rate/100 - (1 - win_rate/100) / payoff_ratio) * 100 if payoff_ratio > 0 else 0
-                else:
-                    kelly_pct = 0
+                cost = shares_to_buy * execution_price * (1 + self.commission)
+                entry_price[buy] = execution_price
+                position[buy] = shares_to_buy
+                capital[buy] -= cost
                 
-                time_in_market = sum(trade_durations) if 'trade_durations' in locals() else 0
-                total_days_traded = len(df_equity)
-                exposure_time = (time_in_market / total_days_traded * 100) if total_days_traded > 0 else 0
+                for j, price, shares, value in zip(buy, execution_price, shares_to_buy, cost):
+                    trade_rows[j].record(i, 'BUY', price, shares, value)
+            
+            if len(sell) > 0:
+                execution_price = current_price[sell] * (1 - slippage[i, sell])
+                shares = position[sell]
+                proceeds = shares * execution_price * (1 - self.commission)
+                pnl = proceeds - (shares * entry_price[sell] * (1 + self.commission))
+                pnl_pct = ((execution_price / entry_price[sell]) - 1) * 100
+                capital[sell] += proceeds
+                position[sell] = 0
                 
-            else:
-                num_wins = 0
-                num_losses = 0
-                win_rate = 0
-                avg_win = 0
-                avg_loss = 0
-                profit_factor = 0
-                payoff_ratio = 0
-                expectancy = 0
-                max_win = 0
-                max_loss = 0
-                avg_trade_duration = 0
-                max_trade_duration = 0
-                min_trade_duration = 0
-                max_consecutive_wins = 0
-                max_consecutive_losses = 0
-                recovery_factor = 0
-                kelly_pct = 0
-                exposure_time = 0
-        else:
-            num_trades = 0
-            num_wins = 0
-            num_losses = 0
-            win_rate = 0
-            avg_win = 0
-            avg_loss = 0
-            profit_factor = 0
-            payoff_ratio = 0
-            expectancy = 0
-            max_win = 0
-            max_loss = 0
-            avg_trade_duration = 0
-            max_trade_duration = 0
-            min_trade_duration = 0
-            max_consecutive_wins = 0
-            max_consecutive_losses = 0
-            recovery_factor = 0
-            kelly_pct = 0
-            exposure_time = 0
+                for j, price, qty, value, trade_pnl, trade_pnl_pct in zip(sell, execution_price, shares, proceeds, pnl, pnl_pct):
+                    trade_rows[j].record(i, 'SELL', price, qty, value, trade_pnl, trade_pnl_pct)
+            
+            touched = np.concatenate([buy, sell])
+            capital_states[i + 1, touched] = capital[touched]
+            position_states[i + 1, touched] = position[touched]
+            changed[i + 1, touched] = True
+        
+        last_change = np.where(changed, np.arange(n + 1)[:, None], 0)
+        np.maximum.accumulate(last_change, axis=0, out=last_change)
+        capital_curve = np.take_along_axis(capital_states, last_change, axis=0)[1:]
+        position_curve = np.take_along_axis(position_states, last_change, axis=0)[1:]
         
-        total_days = len(df_equity)
-        annual_return = ((1 + total_return/100) ** (252/total_days) - 1) * 100 if total_days > 0 else 0
+        return capital_curve, position_curve, trade_rows
+    
+    def _close_open_positions(self, close, slippage, last_rows, state, trade_rows):
+        position = state['position']
+        entry_price = state['entry_price']
+        
+        for j in np.flatnonzero(position > 0):
+            last = last_rows[j]
+            execution_price = close[last, j] * (1 - slippage[last, j])
+            proceeds = position[j] * execution_price * (1 - self.commission)
+            trade_rows[j].record(
+                last, 'SELL', execution_price, position[j], proceeds,
+                proceeds - (position[j] * entry_price[j] * (1 + self.commission)),
+                ((execution_price / entry_price[j]) - 1) * 100
+            )
+            state['capital'][j] += proceeds
+            position[j] = 0
+    
+    def _simulate_long_only_kernel(self, close, slippage, entry, exit, last_rows):
+        n, num_runs = entry.shape
+        capital_curve, position_curve, trades = backends.kernel('long_only')(
+            np.broadcast_to(np.asarray(close, dtype=np.float64).reshape(n, -1), (n, num_runs)),
+            np.broadcast_to(np.asarray(slippage, dtype=np.float64).reshape(n, -1), (n, num_runs)),
+            entry, exit, np.asarray(last_rows, dtype=np.int64),
+            float(self.initial_capital), float(self.commission)
+        )
         
+        runs, columns = trades[0], trades[1:]
+        bounds = np.searchsorted(runs, np.arange(num_runs + 1))
+        trade_rows = [
+            TradeRecorder.from_columns(*(column[bounds[j]:bounds[j + 1]] for column in columns))
+            for j in range(num_runs)
+        ]
+        return capital_curve, position_curve, trade_rows
+    
+    def _simulate_long_only(self, close, slippage, entry, exit, last_rows=None):
+        n, num_runs = entry.shape
+        if last_rows is None:
+            last_rows = np.full(num_runs, n - 1)
+        if backends.get_backend() != 'numpy':
+            return self._simulate_long_only_kernel(close, slippage, entry, exit, last_rows)
+        
+        state = self._new_long_only_state(num_runs)
+        
+        capital_curve, position_curve, trade_rows = self._step_long_only(
+            close, slippage, entry, exit, state
+        )
+        
+        self._close_open_positions(
+            np.broadcast_to(close.reshape(n, -1), (n, num_runs)),
+            np.broadcast_to(slippage.reshape(n, -1), (n, num_runs)),
+            last_rows, state, trade_rows
+        )
+        
+        return capital_curve, position_curve, trade_rows
+    
+    def _equity_columns(self, rows, close, capital_curve, position_curve):
+        close = close[rows]
+        capital_curve = capital_curve[rows]
+        position_curve = position_curve[rows]
+        
+        position_value = np.where(position_curve > 0, position_curve * close, 0.0)
+        return capital_curve + position_value, capital_curve, position_value
+    
+    def _package_results(self, index, rows, equity, capital, position_value, trades, equity_stats):
         return {
-            'total_return_pct': round(float(total_return), 2),
-            'annual_return_pct': round(float(annual_return), 2),
-            'final_equity': round(float(final_equity), 2),
-            'sharpe_ratio': round(float(sharpe_ratio), 2),
-            'sortino_ratio': round(float(sortino_ratio), 2),
-            'calmar_ratio': round(float(calmar_ratio), 2),
-            'max_drawdown_pct': round(float(max_drawdown), 2),
-            'avg_drawdown_pct': round(float(avg_drawdown), 2),
-            'max_drawdown_duration': int(drawdown_duration),
-            'ulcer_index': round(float(ulcer_index), 2),
-            'recovery_factor': round(float(recovery_factor), 2),
-            'num_trades': int(num_trades),
-            'num_wins': int(num_wins),
-            'num_losses': int(num_losses),
-            'win_rate_pct': round(float(win_rate), 2),
-            'avg_win': round(float(avg_win), 2),
-            'avg_loss': round(float(avg_loss), 2),
-            'max_win': round(float(max_win), 2),
-            'max_loss': round(float(max_loss), 2),
-            'profit_factor': round(float(profit_factor), 2),
-            'payoff_ratio': round(float(payoff_ratio), 2),
-            'expectancy': round(float(expectancy), 2),
-            'avg_trade_duration_days': round(float(avg_trade_duration), 2),
-            'max_trade_duration_days': int(max_trade_duration),
-            'min_trade_duration_days': int(min_trade_duration),
-            'max_consecutive_wins': int(max_consecutive_wins),
-            'max_consecutive_losses': int(max_consecutive_losses),
-            'kelly_pct': round(float(kelly_pct), 2),
-            'exposure_time_pct': round(float(exposure_time), 2)
+            'metrics': self._metrics_from_arrays(equity_stats, trades.sell_pnl(), trades.durations(index)),
+            'trades': trades.to_frame(index),
+            'equity_curve': EquityRecorder.frame(index[rows], equity, capital, position_value)
         }
     
-    def _calculate_consecutive(self, trades, column, condition):
-        streaks = []
-        current_streak = 0
-        for value in trades[column]:
-            if condition(value):
-                current_streak += 1
+    def run_backtest_batch(self, data, signals):
+        names = list(signals.keys())
+        
+        if len(data) == 0:
+            return {
+                name: {
+                    'metrics': self._empty_metrics(),
+                    'trades': pd.DataFrame(),
+                    'equity_curve': pd.DataFrame()
+                }
+                for name in names
+            }
+        
+        n = len(data)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        entry = np.zeros((n, len(names)), dtype=bool)
+        exit = np.zeros((n, len(names)), dtype=bool)
+        rows = []
+        last_rows = np.full(len(names), n - 1)
+        
+        for j, name in enumerate(names):
+            strategy_signals = signals[name]
+            
+            if strategy_signals.index.equals(data.index):
+                row_index = slice(None)
             else:
-                if current_streak > 0:
-                    streaks.append(current_streak)
-                current_streak = 0
-        if current_streak > 0:
-            streaks.append(current_streak)
-        return streaks
+                row_index = data.index.get_indexer(strategy_signals.index)
+                if (row_index < 0).any():
+                    raise ValueError(f"Signals for {name} contain dates that are not in data")
+                if len(row_index) > 0:
+                    last_rows[j] = row_index[-1]
+            
+            entry[row_index, j] = strategy_signals['entry'].to_numpy(dtype=bool)
+            exit[row_index, j] = strategy_signals['exit'].to_numpy(dtype=bool)
+            rows.append(row_index)
+        
+        with self.profiler.stage('simulation', rows=n * len(names)):
+            capital_curve, position_curve, trade_rows = self._simulate_long_only(
+                close, self._slippage_array(data), entry, exit, last_rows
+            )
+            
+            columns = [
+                self._equity_columns(rows[j], close, capital_curve[:, j], position_curve[:, j])
+                for j in range(len(names))
+            ]
+            equity_matrix = np.full((n, len(names)), np.nan)
+            for j, (equity, _, _) in enumerate(columns):
+                equity_matrix[:len(equity), j] = equity
+        
+        with self.profiler.stage('metrics', rows=n * len(names)):
+            equity_stats = PerformanceMetrics.equity_stats(equity_matrix, self.initial_capital)
+            
+            results = {}
+            for j, name in enumerate(names):
+                if len(signals[name]) == 0:
+                    results[name] = {
+                        'metrics': self._empty_metrics(),
+                        'trades': pd.DataFrame(),
+                        'equity_curve': pd.DataFrame()
+                    }
+                    continue
+                
+                results[name] = self._package_results(
+                    data.index, rows[j], *columns[j], trade_rows[j],
+                    {key: value[j] for key, value in equity_stats.items()}
+                )
+        
+        return results
     
-    def _calculate_drawdown_duration(self, df_equity):
-        in_drawdown = False
-        max_duration = 0
-        current_duration = 0
-        for dd in df_equity['drawdown']:
-            if dd < 0:
-                if not in_drawdown:
-                    in_drawdown = True
-                    current_duration = 1
-                else:
-                    current_duration += 1
-                max_duration = max(max_duration, current_duration)
-            else:
-                in_drawdown = False
-                current_duration = 0
-        return max_duration
+    def run_backtest_vectorized(self, data, signals):
+        return self.run_backtest_batch(data, {'signals': signals})['signals']
+    
+    def _metrics_from_arrays(self, equity_stats, pnl, durations):
+        trade_stats = PerformanceMetrics.trade_stats(
+            pnl, durations, equity_stats['total_return'], equity_stats['max_drawdown'],
+            equity_stats['total_days']
+        )
+        return PerformanceMetrics.summarize(equity_stats, trade_stats)
+    
+    def _trade_arrays(self, trades):
+        if len(trades) == 0:
+            return np.array([], dtype=np.float64), np.array([], dtype=np.int64)
+        
+        if isinstance(trades, pd.DataFrame):
+            is_sell = (trades['type'] == 'SELL').to_numpy()
+            is_buy = (trades['type'] == 'BUY').to_numpy()
+            dates = trades['date'].values
+            pnl = trades['pnl'].to_numpy(dtype=np.float64)[is_sell] if is_sell.any() else np.array([])
+            return pnl, PerformanceMetrics.trade_durations(dates[is_buy], dates[is_sell])
+        
+        buys = [trade['date'] for trade in trades if trade['type'] == 'BUY']
+        sells = [trade for trade in trades if trade['type'] == 'SELL']
+        pnl = np.array([trade['pnl'] for trade in sells], dtype=np.float64)
+        durations = PerformanceMetrics.trade_durations(
+            pd.DatetimeIndex(buys).values,
+            pd.DatetimeIndex([trade['date'] for trade in sells]).values
+        )
+        return pnl, durations
+    
+    def _calculate_metrics(self, equity_curve, trades, initial_capital):
+        if isinstance(equity_curve, dict):
+            equity = np.asarray(equity_curve['equity'], dtype=np.float64)
+        else:
+            equity = np.array([row['equity'] for row in equity_curve], dtype=np.float64)
+        
+        if len(equity) == 0:
+            return self._empty_metrics()
+        
+        equity_stats = PerformanceMetrics.equity_stats(equity, initial_capital)
+        return self._metrics_from_arrays(equity_stats, *self._trade_arrays(trades))
+    
+    def _summarize_metrics(self, df_trades, final_equity, total_return, sharpe_ratio, sortino_ratio,
+                           calmar_ratio, max_drawdown, avg_drawdown, drawdown_duration, ulcer_index,
+                           total_days):
+        equity_stats = {
+            'final_equity': final_equity,
+            'total_return': total_return,
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'calmar_ratio': calmar_ratio,
+            'max_drawdown': max_drawdown,
+            'avg_drawdown': avg_drawdown,
+            'drawdown_duration': drawdown_duration,
+            'ulcer_index': ulcer_index,
+            'total_days': total_days
+        }
+        return self._metrics_from_arrays(equity_stats, *self._trade_arrays(df_trades))
     
     def _empty_metrics(self):
         return {
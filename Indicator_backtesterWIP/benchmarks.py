@@ -0,0 +1,244 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import backends
+from data_generator import HistoricalDataGenerator
+from indicators import TechnicalIndicators
+from strategies import StrategyGenerator
+from backtest_engine import BacktestEngine
+from results_logger import ResultsLogger
+
+class BenchmarkSuite:
+    
+    # (bars per symbol, symbols)
+    SCALES = {
+        'small': [(1_000, 1), (1_000, 50)],
+        'medium': [(100_000, 1), (1_000, 500)],
+        'large': [(10_000_000, 1), (10_000, 500)]
+    }
+    
+    def __init__(self, repeat=1, memory=True, loop_limit=10_000, seed=42):
+        self.repeat = repeat
+        self.memory = memory
+        self.loop_limit = loop_limit
+        self.seed = seed
+    
+    def _measure(self, func):
+        seconds = np.inf
+        result = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = func()
+            seconds = min(seconds, time.perf_counter() - start)
+        
+        peak = None
+        if self.memory:
+            # Measured on a separate pass so tracing overhead never shows up in the timings.
+            tracemalloc.start()
+            try:
+                func()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        
+        return result, seconds, peak
+    
+    def _generate(self, bars, symbols):
+        start = pd.Timestamp('2000-01-03 09:30')
+        end = start + pd.Timedelta(minutes=bars - 1)
+        generator = HistoricalDataGenerator(self.seed)
+        
+        if symbols == 1:
+            return [generator.generate_ohlcv('BENCH', str(start), str(end), initial_price=300, freq='min')]
+        
+        names = [f"SYM{i:03d}" for i in range(1, symbols + 1)]
+        panel = generator.generate_panel(names, str(start), str(end), initial_price=300, freq='min', seed=self.seed)
+        return [panel[name] for name in names]
+    
+    def run_case(self, bars, symbols):
+        case = f"{bars}x{symbols}"
+        total_bars = bars * symbols
+        strategies = StrategyGenerator.get_all_strategies()
+        engine = BacktestEngine()
+        stages = {}
+        
+        def record(stage, func, rows):
+            result, seconds, peak = self._measure(func)
+            stages[stage] = {
+                'seconds': seconds,
+                'rows': rows,
+                'bars_per_sec': rows / seconds if seconds > 0 else np.inf,
+                'peak_mb': peak / 2**20 if peak is not None else None
+            }
+            return result
+        
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            frames = record('generate', lambda: self._generate(bars, symbols), total_bars)
+            frames = record(
+                'add_all_indicators',
+                lambda: [TechnicalIndicators.add_all_indicators(frame) for frame in frames],
+                total_bars
+            )
+            
+            signals = {}
+            for name, strategy_func in strategies.items():
+                signals[name] = record(
+                    f"strategy:{name}", lambda: [strategy_func(frame) for frame in frames], total_bars
+                )
+            
+            runs = total_bars * len(strategies)
+            if total_bars <= self.loop_limit:
+                record(
+                    'run_backtest',
+                    lambda: [engine.run_backtest(frame, signals[name][k]) for name in strategies for k, frame in enumerate(frames)],
+                    runs
+                )
+            results = record(
+                'run_backtest_vectorized',
+                lambda: [engine.run_backtest_batch(frame, {name: signals[name][k] for name in strategies}) for k, frame in enumerate(frames)],
+                runs
+            )
+            
+            outcomes = [(name, result[name]) for result in results for name in strategies]
+            metrics = record(
+                '_calculate_metrics',
+                lambda: [
+                    engine._calculate_metrics(
+                        {'equity': outcome['equity_curve']['equity'].to_numpy()}, outcome['trades'], engine.initial_capital
+                    )
+                    for _, outcome in outcomes
+                ],
+                runs
+            )
+            
+            logger = ResultsLogger(os.path.join(tmp, 'bench.db'), os.path.join(tmp, 'bench.json'))
+            data_info = {'symbol': 'BENCH', 'num_days': bars}
+            record(
+                'save_result',
+                lambda: [logger.save_result(name, metric, data_info) for (name, _), metric in zip(outcomes, metrics)],
+                runs
+            )
+            logger.close()
+        
+        return case, stages
+    
+    def run(self, cases):
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'backend': backends.get_backend(),
+                'machine': platform.machine()
+            },
+            'cases': {}
+        }
+        
+        for bars, symbols in cases:
+            print(f"\nBenchmarking {bars:,} bars x {symbols} symbol(s)...")
+            case, stages = self.run_case(bars, symbols)
+            report['cases'][case] = stages
+            self.print_case(case, stages)
+        
+        return report
+    
+    @staticmethod
+    def print_case(case, stages):
+        print(f"{'Stage':<36} {'Seconds':>10} {'Bars/sec':>14} {'Peak MB':>10}")
+        print("-" * 72)
+        for stage, stats in stages.items():
+            peak = f"{stats['peak_mb']:>10.1f}" if stats['peak_mb'] is not None else f"{'-':>10}"
+            print(f"{stage:<36} {stats['seconds']:>10.4f} {stats['bars_per_sec']:>14,.0f} {peak}")
+    
+    @staticmethod
+    def save_baseline(report, path):
+        baseline = BenchmarkSuite.load_baseline(path)
+        baseline.update({key: value for key, value in report.items() if key != 'cases'})
+        baseline.setdefault('cases', {}).update(report['cases'])
+        with open(path, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n✓ Baseline saved to {path}")
+    
+    @staticmethod
+    def load_baseline(path):
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def compare(report, baseline, threshold=0.25, min_seconds=0.005):
+        regressions = []
+        for case, stages in report['cases'].items():
+            for stage, stats in stages.items():
+                reference = baseline.get('cases', {}).get(case, {}).get(stage)
+                if reference is None or reference['seconds'] < min_seconds:
+                    continue
+                
+                change = stats['seconds'] / reference['seconds'] - 1
+                if change > threshold:
+                    regressions.append((case, stage, reference['seconds'], stats['seconds'], change))
+        return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the backtesting pipeline stage by stage.")
+    parser.add_argument('--scale', choices=sorted(BenchmarkSuite.SCALES) + ['all'], default='small')
+    parser.add_argument('--bars', type=int, help="Run a single custom case with this many bars per symbol")
+    parser.add_argument('--symbols', type=int, default=1, help="Symbols for the custom --bars case")
+    parser.add_argument('--repeat', type=int, default=1, help="Keep the best of N timed runs per stage")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument('--loop-limit', type=int, default=10_000,
+                        help="Skip the bar-by-bar run_backtest above this many total bars")
+    parser.add_argument('--baseline', default='benchmark_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help="Record this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown before a stage counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--output', help="Also write the full report to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if args.bars:
+        cases = [(args.bars, args.symbols)]
+    elif args.scale == 'all':
+        cases = [case for scale in ('small', 'medium', 'large') for case in BenchmarkSuite.SCALES[scale]]
+    else:
+        cases = BenchmarkSuite.SCALES[args.scale]
+    
+    suite = BenchmarkSuite(repeat=args.repeat, memory=not args.no_memory, loop_limit=args.loop_limit)
+    report = suite.run(cases)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.save_baseline:
+        BenchmarkSuite.save_baseline(report, args.baseline)
+        return 0
+    
+    baseline = BenchmarkSuite.load_baseline(args.baseline)
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+    
+    regressions = BenchmarkSuite.compare(report, baseline, args.threshold)
+    if not regressions:
+        print(f"\n✓ No stage regressed more than {args.threshold:.0%} against {args.baseline}")
+        return 0
+    
+    print(f"\n✗ {len(regressions)} stage(s) regressed more than {args.threshold:.0%}:")
+    for case, stage, before, after, change in regressions:
+        print(f"  {case:<16} {stage:<36} {before:.4f}s -> {after:.4f}s (+{change:.0%})")
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
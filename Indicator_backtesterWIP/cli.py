@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+# Heavy modules (pandas, numpy, the engine) are imported inside the functions that need them
+# so `--help` and malformed arguments return before they load; `--list` and strategy or
+# parameter validation still import the strategy module and with it pandas.
+
+DEFAULT_START = '2020-01-01'
+DEFAULT_END = '2024-12-31'
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="Run backtests without the interactive menu and log results with ResultsLogger."
+    )
+    parser.add_argument('-s', '--strategies', default='all',
+                        help="Comma-separated strategy names, or 'all' (default)")
+    parser.add_argument('--symbols', default='SPY', help="Comma-separated symbols (default SPY)")
+    parser.add_argument('--start', default=DEFAULT_START, help=f"First date (default {DEFAULT_START})")
+    parser.add_argument('--end', default=DEFAULT_END, help=f"Last date (default {DEFAULT_END})")
+    parser.add_argument('--params', help="JSON file with per-strategy parameters and an optional 'indicators' block")
+    parser.add_argument('-w', '--workers', type=int, default=1, help="Process pool size (default 1, no pool)")
+    parser.add_argument('--csv-dir', help="Directory of <SYMBOL>.csv files to ingest instead of synthetic data")
+    parser.add_argument('--cache-dir', default='data_cache', help="Columnar dataset cache (default data_cache)")
+    parser.add_argument('--seed', type=int, default=42,
+                        help="Synthetic data seed; each symbol's data is derived from this seed and its name")
+    parser.add_argument('--initial-price', type=float, default=300, help="Synthetic starting price")
+    parser.add_argument('--capital', type=float, default=10000, help="Initial capital per backtest")
+    parser.add_argument('--log-file', default='backtest_results.db', help="Results database")
+    parser.add_argument('--list', action='store_true', help="List available strategies and exit")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only print errors and the final summary line")
+    
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    args.symbols = [symbol.strip() for symbol in args.symbols.split(',') if symbol.strip()]
+    if not args.symbols:
+        parser.error("--symbols needs at least one symbol")
+    return parser, args
+
+def load_params(path):
+    if path is None:
+        return {}, {}
+    
+    with open(path, 'r') as f:
+        params = json.load(f)
+    if not isinstance(params, dict):
+        raise ValueError(f"{path} must contain a JSON object")
+    
+    indicator_params = params.pop('indicators', {})
+    return indicator_params, params
+
+def validate_params(indicator_params, strategy_params):
+    import inspect
+    from indicators import LazyIndicatorFrame
+    from strategies import StrategyGenerator
+    
+    if not isinstance(indicator_params, dict):
+        raise ValueError("'indicators' must be a JSON object")
+    available = [name for name in inspect.signature(LazyIndicatorFrame).parameters if name not in ('data', 'calculator')]
+    unknown = [name for name in indicator_params if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown indicator parameters: {', '.join(unknown)}. Available: {', '.join(available)}")
+    
+    resolve_strategies(','.join(strategy_params) or 'all')
+    for strategy_name, params in strategy_params.items():
+        if not isinstance(params, dict):
+            raise ValueError(f"Parameters for {strategy_name} must be a JSON object")
+        available = list(StrategyGenerator.RULES[strategy_name].params())
+        unknown = [name for name in params if name not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown parameters for {strategy_name}: {', '.join(unknown)}. "
+                f"Available: {', '.join(available) or 'none'}"
+            )
+
+def symbol_seed(seed, symbol):
+    # Hashing the name keeps a symbol's data independent of where it appears in --symbols.
+    digest = hashlib.blake2b(f"{seed}:{symbol}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, 'little')
+
+def resolve_strategies(selection):
+    from strategies import StrategyGenerator
+    
+    available = list(StrategyGenerator.get_all_strategies())
+    if selection.strip().lower() == 'all':
+        return available
+    
+    selected = [name.strip() for name in selection.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}. Available: {', '.join(available)}")
+    return selected
+
+def prepare_dataset(store, symbol, args):
+    # Reuse whatever the cache already holds for this symbol: ingested CSVs while the file is
+    # unchanged, synthetic data while the generator settings match.
+    csv_path = os.path.join(args.csv_dir, f"{symbol}.csv") if args.csv_dir else None
+    if csv_path and os.path.exists(csv_path):
+        if not store.is_current(symbol, csv_path):
+            store.ingest_csv(csv_path, symbol=symbol, verbose=not args.quiet)
+        return 'csv'
+    
+    source = {
+        'generator': 'HistoricalDataGenerator',
+        'seed': symbol_seed(args.seed, symbol),
+        'start': args.start,
+        'end': args.end,
+        'initial_price': args.initial_price
+    }
+    if symbol in store.symbols() and store.metadata(symbol)['source'] == source:
+        return 'cache'
+    
+    from data_generator import HistoricalDataGenerator
+    data = HistoricalDataGenerator(source['seed']).generate_ohlcv(
+        symbol=symbol, start_date=args.start, end_date=args.end, initial_price=args.initial_price
+    )
+    store.write_frame(symbol, data, source)
+    return 'generated'
+
+def run_symbol(task):
+    from columnar_store import ColumnarStore
+    from indicators import LazyIndicatorFrame
+    from strategies import StrategyGenerator
+    from backtest_engine import BacktestEngine
+    
+    symbol = task['symbol']
+    data = ColumnarStore(task['cache_dir']).load(symbol, task['start'], task['end'])
+    if len(data) == 0:
+        raise ValueError(f"No data for {symbol} between {task['start']} and {task['end']}")
+    
+    frame = LazyIndicatorFrame(data, **task['indicator_params'])
+    
+    columns = []
+    for strategy_name in task['strategies']:
+        for column in StrategyGenerator.get_strategy_requirements(strategy_name) + ['TEMP_ATR']:
+            if column not in columns:
+                columns.append(column)
+    
+    data = frame.materialize(columns)
+    signals = StrategyGenerator.generate_signals(data, task['strategies'], task['strategy_params'])
+    results = BacktestEngine(initial_capital=task['capital']).run_backtest_batch(data, signals)
+    
+    outcomes = []
+    for name in task['strategies']:
+        dates = signals[name].index
+        data_info = {
+            'symbol': symbol,
+            'start_date': str(dates[0].date()) if len(dates) else task['start'],
+            'end_date': str(dates[-1].date()) if len(dates) else task['end'],
+            'num_days': len(dates)
+        }
+        if task['strategy_params'].get(name) or task['indicator_params']:
+            data_info['params'] = {'strategy': task['strategy_params'].get(name, {}), 'indicators': task['indicator_params']}
+        outcomes.append((name, results[name]['metrics'], data_info))
+    return symbol, outcomes
+
+def main(argv=None):
+    parser, args = parse_args(argv)
+    
+    if args.list:
+        from strategies import StrategyGenerator
+        for name in StrategyGenerator.get_all_strategies():
+            print(f"{name:<28} {StrategyGenerator.get_strategy_description(name)}")
+        return 0
+    
+    try:
+        strategy_names = resolve_strategies(args.strategies)
+        indicator_params, strategy_params = load_params(args.params)
+        validate_params(indicator_params, strategy_params)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    
+    from columnar_store import ColumnarStore
+    store = ColumnarStore(args.cache_dir)
+    for symbol in args.symbols:
+        origin = prepare_dataset(store, symbol, args)
+        if not args.quiet:
+            print(f"✓ {symbol}: {'cached dataset' if origin == 'cache' else origin + ' data'} ready")
+    
+    # Split each symbol's strategies into chunks so the pool has work even for a single symbol.
+    num_chunks = min(len(strategy_names), -(-args.workers // len(args.symbols)))
+    chunks = [
+        strategy_names[i * len(strategy_names) // num_chunks:(i + 1) * len(strategy_names) // num_chunks]
+        for i in range(num_chunks)
+    ]
+    tasks = [{
+        'symbol': symbol,
+        'strategies': chunk,
+        'start': args.start,
+        'end': args.end,
+        'cache_dir': args.cache_dir,
+        'capital': args.capital,
+        'indicator_params': indicator_params,
+        'strategy_params': strategy_params
+    } for symbol in args.symbols for chunk in chunks]
+    
+    if args.workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(tasks))) as pool:
+            chunk_results = list(pool.map(run_symbol, tasks))
+    else:
+        chunk_results = [run_symbol(task) for task in tasks]
+    
+    completed = {}
+    for symbol, outcomes in chunk_results:
+        completed.setdefault(symbol, []).extend(outcomes)
+    completed = list(completed.items())
+    
+    from results_logger import ResultsLogger
+    logger = ResultsLogger(args.log_file)
+    try:
+        with logger.session(verbose=not args.quiet):
+            for symbol, outcomes in completed:
+                for name, metrics, data_info in outcomes:
+                    logger.save_result(name, metrics, data_info)
+                    if not args.quiet:
+                        print(
+                            f"  {symbol:<8} {name:<28} return {metrics['total_return_pct']:>8.2f}%  "
+                            f"sharpe {metrics['sharpe_ratio']:>6.2f}  trades {metrics['num_trades']:>4}"
+                        )
+    finally:
+        logger.close()
+    
+    print(f"✓ {sum(len(outcomes) for _, outcomes in completed)} backtests completed for {len(completed)} symbol(s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
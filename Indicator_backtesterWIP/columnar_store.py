@@ -0,0 +1,188 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+class ColumnarStore:
+    
+    PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+    
+    def __init__(self, root='data_cache'):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+    
+    def _symbol_dir(self, symbol):
+        return os.path.join(self.root, symbol)
+    
+    def _column_path(self, symbol, column):
+        return os.path.join(self._symbol_dir(symbol), f"{column}.npy")
+    
+    def _meta_path(self, symbol):
+        return os.path.join(self._symbol_dir(symbol), 'meta.json')
+    
+    @staticmethod
+    def _count_rows(csv_path, block_size=1 << 24):
+        lines = 0
+        last = b'\n'
+        with open(csv_path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                lines += block.count(b'\n')
+                last = block[-1:]
+        if last != b'\n':
+            lines += 1
+        return lines - 1
+    
+    def symbols(self):
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(self._meta_path(name))
+        )
+    
+    def metadata(self, symbol):
+        with open(self._meta_path(symbol), 'r') as f:
+            return json.load(f)
+    
+    def is_current(self, symbol, csv_path):
+        if not os.path.exists(self._meta_path(symbol)):
+            return False
+        
+        stat = os.stat(csv_path)
+        source = self.metadata(symbol)['source']
+        return source.get('mtime_ns') == stat.st_mtime_ns and source.get('size') == stat.st_size
+    
+    def ingest_csv(self, csv_path, symbol=None, dtype=np.float64, chunksize=1_000_000, verbose=True):
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError(f"Price dtype must be float32 or float64, got {dtype}")
+        
+        num_rows = self._count_rows(csv_path)
+        reader = pd.read_csv(
+            csv_path, chunksize=chunksize, dtype={column: np.float64 for column in self.PRICE_COLUMNS}
+        )
+        
+        columns = None
+        row = 0
+        first_date = None
+        previous_date = None
+        for chunk in reader:
+            date_column = chunk.columns[0]
+            if columns is None:
+                if symbol is None:
+                    if 'Symbol' in chunk.columns:
+                        symbol = str(chunk['Symbol'].iloc[0])
+                    else:
+                        symbol = os.path.splitext(os.path.basename(csv_path))[0]
+                os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+                
+                columns = {
+                    'Date': np.lib.format.open_memmap(
+                        self._column_path(symbol, 'Date.tmp'), mode='w+', dtype='datetime64[ns]', shape=(num_rows,)
+                    )
+                }
+                for column in self.PRICE_COLUMNS:
+                    columns[column] = np.lib.format.open_memmap(
+                        self._column_path(symbol, f"{column}.tmp"), mode='w+', dtype=dtype, shape=(num_rows,)
+                    )
+                if 'Volume' in chunk.columns:
+                    columns['Volume'] = np.lib.format.open_memmap(
+                        self._column_path(symbol, 'Volume.tmp'), mode='w+', dtype=np.int64, shape=(num_rows,)
+                    )
+            
+            dates = pd.to_datetime(chunk[date_column]).to_numpy(dtype='datetime64[ns]')
+            if len(dates) > 0:
+                if (previous_date is not None and dates[0] < previous_date) or np.any(dates[1:] < dates[:-1]):
+                    raise ValueError(f"{csv_path} is not sorted by date")
+                first_date = dates[0] if first_date is None else first_date
+                previous_date = dates[-1]
+            
+            rows = slice(row, row + len(chunk))
+            columns['Date'][rows] = dates
+            for column in self.PRICE_COLUMNS:
+                columns[column][rows] = chunk[column].to_numpy(dtype=np.float64)
+            if 'Volume' in columns:
+                columns['Volume'][rows] = chunk['Volume'].to_numpy(dtype=np.int64)
+            row += len(chunk)
+        
+        if columns is None:
+            raise ValueError(f"{csv_path} contains no rows")
+        
+        for column, values in columns.items():
+            values.flush()
+            if row != num_rows:
+                # Blank lines make the newline count overshoot, so copy out only the parsed rows.
+                np.save(self._column_path(symbol, f"{column}.trim.tmp"), values[:row])
+                os.replace(self._column_path(symbol, f"{column}.trim.tmp"), self._column_path(symbol, f"{column}.tmp"))
+        columns = list(columns)
+        for column in columns:
+            os.replace(self._column_path(symbol, f"{column}.tmp"), self._column_path(symbol, column))
+        
+        stat = os.stat(csv_path)
+        meta = self._write_meta(
+            symbol, columns, row, first_date, previous_date,
+            {'path': os.path.abspath(csv_path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+        )
+        
+        if verbose:
+            print(f"✓ Ingested {row} rows for {symbol} into {self._symbol_dir(symbol)}")
+        return meta
+    
+    def _write_meta(self, symbol, columns, rows, start, end, source):
+        meta = {
+            'symbol': symbol,
+            'rows': rows,
+            'dtypes': {column: str(np.load(self._column_path(symbol, column), mmap_mode='r').dtype) for column in columns},
+            'start': str(start),
+            'end': str(end),
+            'source': source
+        }
+        with open(self._meta_path(symbol), 'w') as f:
+            json.dump(meta, f, indent=2)
+        return meta
+    
+    def write_frame(self, symbol, data, source=None, dtype=np.float64):
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError(f"Price dtype must be float32 or float64, got {dtype}")
+        
+        os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+        columns = {'Date': data.index.values.astype('datetime64[ns]')}
+        for column in self.PRICE_COLUMNS:
+            columns[column] = data[column].to_numpy(dtype=dtype)
+        if 'Volume' in data.columns:
+            columns['Volume'] = data['Volume'].to_numpy(dtype=np.int64)
+        
+        for column, values in columns.items():
+            np.save(self._column_path(symbol, f"{column}.tmp"), values)
+            os.replace(self._column_path(symbol, f"{column}.tmp"), self._column_path(symbol, column))
+        
+        dates = columns['Date']
+        return self._write_meta(
+            symbol, list(columns), len(dates), dates[0] if len(dates) else None,
+            dates[-1] if len(dates) else None, source or {}
+        )
+    
+    def load_arrays(self, symbol, start=None, end=None, columns=None, mmap=True):
+        meta = self.metadata(symbol)
+        columns = [c for c in meta['dtypes'] if c != 'Date'] if columns is None else list(columns)
+        
+        dates = np.load(self._column_path(symbol, 'Date'), mmap_mode='r')
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left'))
+        if isinstance(end, str):
+            end = pd.Period(end).end_time
+        hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side='right'))
+        
+        arrays = {'Date': dates[lo:hi] if mmap else np.array(dates[lo:hi])}
+        for column in columns:
+            values = np.load(self._column_path(symbol, column), mmap_mode='r')[lo:hi]
+            arrays[column] = values if mmap else np.array(values)
+        return arrays
+    
+    def load(self, symbol, start=None, end=None, columns=None, mmap=True):
+        arrays = self.load_arrays(symbol, start, end, columns, mmap)
+        index = pd.DatetimeIndex(arrays.pop('Date'), name='Date')
+        df = pd.DataFrame(arrays, index=index, copy=False)
+        df['Symbol'] = symbol
+        return df
@@ -1,83 +1,147 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import backends
 
 class HistoricalDataGenerator:
     
+    OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+    
     def __init__(self, seed=42):
-        np.random.seed(seed)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
     
-    def generate_ohlcv(self, symbol='SPY', start_date='2020-01-01', 
-                       end_date='2024-12-31', initial_price=300):
+    @staticmethod
+    def _date_range(start_date, end_date, freq='B'):
         start = pd.to_datetime(start_date)
         end = pd.to_datetime(end_date)
         
-        date_range = pd.bdate_range(start=start, end=end)
-        n_days = len(date_range)
+        if freq == 'B':
+            return pd.bdate_range(start=start, end=end)
+        return pd.date_range(start=start, end=end, freq=freq)
+    
+    @staticmethod
+    def _bar_scale(freq='B'):
+        if freq == 'B':
+            return 1.0
+        try:
+            bar_length = pd.Timedelta(pd.tseries.frequencies.to_offset(freq))
+        except (TypeError, ValueError):
+            return 1.0
+        return min(1.0, bar_length / pd.Timedelta(days=1))
+    
+    @staticmethod
+    def _ar_filter(shocks, coefficients):
+        if backends.get_backend() != 'numpy':
+            return backends.kernel('ar_filter')(shocks, coefficients)
+        
+        values = shocks.copy()
+        multipliers = coefficients.copy()
+        tolerance = np.finfo(np.float64).eps
+        shift = 1
         
-        drift = 0.0003
-        volatility = 0.015
+        while shift < len(values) and np.abs(multipliers[shift:]).max() > tolerance:
+            carried = multipliers[shift:] * values[:-shift]
+            multipliers[shift:] *= multipliers[:-shift].copy()
+            values[shift:] += carried
+            shift *= 2
         
-        regime_changes = np.random.randint(50, 150, size=n_days//100 + 1)
+        return values
+    
+    @staticmethod
+    def _simulate_path(rng, n_days, initial_price, bar_scale=1.0):
+        drift = 0.0003 * bar_scale
+        volatility = 0.015 * np.sqrt(bar_scale)
+        
+        regime_changes = rng.integers(50, 150, size=n_days//100 + 1)
         regime_boundaries = np.cumsum(regime_changes)
         regime_boundaries = regime_boundaries[regime_boundaries < n_days]
+        regime_ends = np.append(regime_boundaries, n_days)
+        regime_lengths = np.diff(regime_ends, prepend=0)
+        num_regimes = len(regime_lengths)
+        
+        regime_drift = rng.normal(drift, drift/2, num_regimes)
+        regime_vol = rng.uniform(volatility * 0.7, volatility * 1.3, num_regimes)
+        ar_coef = rng.uniform(0.05, 0.15, num_regimes)
         
-        returns = np.zeros(n_days)
-        current_idx = 0
-        
-        for regime_end in np.append(regime_boundaries, n_days):
-            regime_length = regime_end - current_idx
-            
-            regime_drift = np.random.normal(drift, drift/2)
-            regime_vol = np.random.uniform(volatility * 0.7, volatility * 1.3)
-            
-            regime_returns = np.random.normal(regime_drift, regime_vol, regime_length)
-            
-            ar_coef = np.random.uniform(0.05, 0.15)
-            for i in range(1, regime_length):
-                regime_returns[i] += ar_coef * regime_returns[i-1]
-            
-            returns[current_idx:regime_end] = regime_returns
-            current_idx = regime_end
+        shocks = rng.normal(np.repeat(regime_drift, regime_lengths), np.repeat(regime_vol, regime_lengths))
+        
+        coefficients = np.repeat(ar_coef, regime_lengths)
+        coefficients[regime_ends[:-1]] = 0
+        coefficients[0] = 0
+        returns = HistoricalDataGenerator._ar_filter(shocks, coefficients)
         
         closes = initial_price * np.exp(np.cumsum(returns))
         
         intraday_vol = volatility * 0.4
         
-        data = []
-        for i, close in enumerate(closes):
-            
-            if i == 0:
-                open_price = initial_price
-            else:
-                gap = np.random.normal(0, volatility * 0.3)
-                open_price = closes[i-1] * (1 + gap)
-            
-            intraday_return = np.random.normal(0, intraday_vol)
-            intraday_range = abs(np.random.lognormal(np.log(intraday_vol), 0.5)) * close
-            
-            high = max(open_price, close) + np.random.uniform(0, intraday_range * 0.5)
-            low = min(open_price, close) - np.random.uniform(0, intraday_range * 0.5)
-            
-            high = max(high, open_price, close)
-            low = min(low, open_price, close)
-            
-            base_volume = 80000000
-            volume_mult = np.random.lognormal(0, 0.6)
-            range_factor = (high - low) / close
-            volume = int(base_volume * volume_mult * (1 + range_factor * 5))
-            
-            data.append({
-                'Date': date_range[i],
-                'Open': round(open_price, 2),
-                'High': round(high, 2),
-                'Low': round(low, 2),
-                'Close': round(close, 2),
-                'Volume': volume
-            })
-        
-        df = pd.DataFrame(data)
-        df.set_index('Date', inplace=True)
+        opens = np.empty(n_days)
+        opens[:1] = initial_price
+        opens[1:] = closes[:-1] * (1 + rng.normal(0, volatility * 0.3, n_days - 1))
+        
+        intraday_range = np.abs(rng.lognormal(np.log(intraday_vol), 0.5, n_days)) * closes
+        
+        body_high = np.maximum(opens, closes)
+        body_low = np.minimum(opens, closes)
+        highs = np.maximum(body_high + rng.uniform(0, intraday_range * 0.5), body_high)
+        lows = np.minimum(body_low - rng.uniform(0, intraday_range * 0.5), body_low)
+        
+        base_volume = 80000000 * bar_scale
+        volume_mult = rng.lognormal(0, 0.6, n_days)
+        range_factor = (highs - lows) / closes
+        volumes = (base_volume * volume_mult * (1 + range_factor * 5)).astype(np.int64)
+        
+        values = np.empty((n_days, 5))
+        for column, series in enumerate((opens, highs, lows, closes)):
+            np.round(series, 2, out=values[:, column])
+        values[:, 4] = volumes
+        
+        return values
+    
+    def generate_ohlcv(self, symbol='SPY', start_date='2020-01-01',
+                       end_date='2024-12-31', initial_price=300, freq='B'):
+        date_range = self._date_range(start_date, end_date, freq)
+        values = self._simulate_path(self.rng, len(date_range), initial_price, self._bar_scale(freq))
+        
+        df = pd.DataFrame(values, columns=self.OHLCV_COLUMNS, index=pd.DatetimeIndex(date_range, name='Date'))
+        df['Volume'] = df['Volume'].astype(np.int64)
+        df['Symbol'] = symbol
+        
+        return df
+    
+    def generate_paths(self, n_paths=1000, start_date='2020-01-01', end_date='2024-12-31',
+                       initial_price=300, freq='B', seed=None):
+        date_range = pd.DatetimeIndex(self._date_range(start_date, end_date, freq), name='Date')
+        bar_scale = self._bar_scale(freq)
+        
+        seed_sequence = np.random.SeedSequence(self.seed if seed is None else seed)
+        paths = np.empty((n_paths, len(date_range), len(self.OHLCV_COLUMNS)))
+        
+        initial_prices = np.broadcast_to(np.asarray(initial_price, dtype=np.float64), (n_paths,))
+        
+        for i, child in enumerate(seed_sequence.spawn(n_paths)):
+            paths[i] = self._simulate_path(np.random.default_rng(child), len(date_range), initial_prices[i], bar_scale)
+        
+        return paths, date_range
+    
+    def generate_panel(self, symbols, start_date='2020-01-01', end_date='2024-12-31',
+                       initial_price=300, freq='B', seed=None):
+        paths, date_range = self.generate_paths(
+            len(symbols), start_date, end_date, initial_price, freq, seed
+        )
+        
+        columns = pd.MultiIndex.from_product([list(symbols), self.OHLCV_COLUMNS], names=['Symbol', 'Field'])
+        values = paths.transpose(1, 0, 2).reshape(len(date_range), -1)
+        panel = pd.DataFrame(values, columns=columns, index=date_range)
+        
+        for symbol in symbols:
+            panel[(symbol, 'Volume')] = panel[(symbol, 'Volume')].astype(np.int64)
+        
+        return panel
+    
+    def path_frame(self, paths, date_range, path_index, symbol='SPY'):
+        df = pd.DataFrame(paths[path_index], columns=self.OHLCV_COLUMNS, index=date_range)
+        df['Volume'] = df['Volume'].astype(np.int64)
         df['Symbol'] = symbol
         
         return df
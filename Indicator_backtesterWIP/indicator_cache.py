@@ -0,0 +1,142 @@
+import os
+import hashlib
+import weakref
+from collections import OrderedDict
+import pandas as pd
+import numpy as np
+from indicators import TechnicalIndicators
+
+class IndicatorCache:
+    
+    INPUT_COLUMNS = {
+        'calculate_rsi': ['Close'],
+        'calculate_sma': ['Close'],
+        'calculate_ema': ['Close'],
+        'calculate_macd': ['Close'],
+        'calculate_bbands': ['Close'],
+        'calculate_stochastic': ['High', 'Low', 'Close'],
+        'calculate_atr': ['High', 'Low', 'Close']
+    }
+    
+    OUTPUT_COLUMNS = {
+        'calculate_macd': ['MACD', 'Signal', 'Histogram'],
+        'calculate_bbands': ['BB_Upper', 'BB_Middle', 'BB_Lower'],
+        'calculate_stochastic': ['Stoch_K', 'Stoch_D']
+    }
+    
+    def __init__(self, max_bytes=256 * 1024 * 1024, cache_dir=None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._fingerprints = {}
+        
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def fingerprint(data, columns):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(data.index.values).view(np.uint8))
+        for column in columns:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=np.float64)).view(np.uint8))
+        return digest.hexdigest()
+    
+    def _frame_fingerprint(self, data, columns):
+        # Hashing the inputs is O(N), so each live frame is hashed once per column set. The weakref
+        # guards against a new frame reusing the id of a collected one; in-place edits are not tracked.
+        marker = (len(data), data.index[-1] if len(data) else None)
+        memo = self._fingerprints.get(id(data))
+        if memo is None or memo[0]() is not data or memo[1] != marker:
+            memo = (weakref.ref(data), marker, {})
+            self._fingerprints = {k: v for k, v in self._fingerprints.items() if v[0]() is not None}
+            self._fingerprints[id(data)] = memo
+        
+        columns = tuple(columns)
+        if columns not in memo[2]:
+            memo[2][columns] = self.fingerprint(data, columns)
+        return memo[2][columns]
+    
+    def _disk_path(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.npy")
+    
+    def _store(self, key, values):
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key).nbytes
+        
+        self._entries[key] = values
+        self.current_bytes += values.nbytes
+        
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+    
+    def _lookup(self, key):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        
+        if self.cache_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                values = np.load(path)
+                self._store(key, values)
+                return values
+        
+        return None
+    
+    def get_or_compute(self, name, data, **params):
+        key = (self._frame_fingerprint(data, self.INPUT_COLUMNS[name]), name, tuple(sorted(params.items())))
+        values = self._lookup(key)
+        
+        if values is None:
+            self.misses += 1
+            result = getattr(TechnicalIndicators, name)(data, **params)
+            values = result.to_numpy(dtype=np.float64)
+            self._store(key, values)
+            
+            if self.cache_dir:
+                path = self._disk_path(key)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, values)
+                os.replace(tmp_path, path)
+        else:
+            self.hits += 1
+        
+        if name in self.OUTPUT_COLUMNS:
+            return pd.DataFrame(values, index=data.index, columns=self.OUTPUT_COLUMNS[name])
+        return pd.Series(values, index=data.index)
+    
+    def calculate_rsi(self, data, period=14):
+        return self.get_or_compute('calculate_rsi', data, period=period)
+    
+    def calculate_sma(self, data, period=20):
+        return self.get_or_compute('calculate_sma', data, period=period)
+    
+    def calculate_ema(self, data, period=12):
+        return self.get_or_compute('calculate_ema', data, period=period)
+    
+    def calculate_macd(self, data, fast=12, slow=26, signal=9):
+        return self.get_or_compute('calculate_macd', data, fast=fast, slow=slow, signal=signal)
+    
+    def calculate_bbands(self, data, period=20, std_dev=2):
+        return self.get_or_compute('calculate_bbands', data, period=period, std_dev=std_dev)
+    
+    def calculate_stochastic(self, data, k_period=14, d_period=3):
+        return self.get_or_compute('calculate_stochastic', data, k_period=k_period, d_period=d_period)
+    
+    def calculate_atr(self, data, period=14):
+        return self.get_or_compute('calculate_atr', data, period=period)
+    
+    def add_all_indicators(self, data, **params):
+        return TechnicalIndicators.add_all_indicators(data, calculator=self, **params)
+    
+    def clear(self):
+        self._entries.clear()
+        self._fingerprints.clear()
+        self.current_bytes = 0
@@ -1,5 +1,9 @@
+import bisect
+import math
+from collections import deque
 import pandas as pd
 import numpy as np
+from kernels import RollingKernels
 
 class TechnicalIndicators:
     
@@ -29,11 +33,11 @@ class TechnicalIndicators:
         signal_line = macd.ewm(span=signal, adjust=False).mean()
         histogram = macd - signal_line
         
-        return pd.DataFrame({
+        return pd.concat({
             'MACD': macd,
             'Signal': signal_line,
             'Histogram': histogram
-        })
+        }, axis=1)
     
     @staticmethod
     def calculate_bbands(data, period=20, std_dev=2):
@@ -43,24 +47,31 @@ class TechnicalIndicators:
         upper_band = sma + (std * std_dev)
         lower_band = sma - (std * std_dev)
         
-        return pd.DataFrame({
+        return pd.concat({
             'BB_Upper': upper_band,
             'BB_Middle': sma,
             'BB_Lower': lower_band
-        })
+        }, axis=1)
+    
+    @staticmethod
+    def _like(values, template):
+        if isinstance(template, pd.DataFrame):
+            return pd.DataFrame(values, index=template.index, columns=template.columns)
+        return pd.Series(values, index=template.index)
     
     @staticmethod
     def calculate_stochastic(data, k_period=14, d_period=3):
-        low_min = data['Low'].rolling(window=k_period).min()
-        high_max = data['High'].rolling(window=k_period).max()
+        low, high = data['Low'], data['High']
+        low_min = TechnicalIndicators._like(RollingKernels.rolling_min(low.to_numpy(dtype=np.float64), k_period), low)
+        high_max = TechnicalIndicators._like(RollingKernels.rolling_max(high.to_numpy(dtype=np.float64), k_period), high)
         
         k = 100 * ((data['Close'] - low_min) / (high_max - low_min))
         d = k.rolling(window=d_period).mean()
         
-        return pd.DataFrame({
+        return pd.concat({
             'Stoch_K': k,
             'Stoch_D': d
-        })
+        }, axis=1)
     
     @staticmethod
     def calculate_atr(data, period=14):
@@ -68,35 +79,354 @@ class TechnicalIndicators:
         high_close = np.abs(data['High'] - data['Close'].shift())
         low_close = np.abs(data['Low'] - data['Close'].shift())
         
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
+        true_range = np.fmax(np.fmax(high_low, high_close), low_close)
         atr = true_range.rolling(window=period).mean()
         
         return atr
     
     @staticmethod
-    def add_all_indicators(data):
-        df = data.copy()
+    def calculate_pivot_high(data, length=5):
+        high = data['High'].to_numpy(dtype=np.float64)
+        pivots = np.full(high.shape, np.nan)
+        is_pivot = RollingKernels.pivot_high(high, length)
+        pivots[2 * length:] = np.where(is_pivot[length:len(high) - length], high[length:len(high) - length], np.nan)
+        return TechnicalIndicators._like(pivots, data['High'])
+    
+    @staticmethod
+    def calculate_pivot_low(data, length=5):
+        low = data['Low'].to_numpy(dtype=np.float64)
+        pivots = np.full(low.shape, np.nan)
+        is_pivot = RollingKernels.pivot_low(low, length)
+        pivots[2 * length:] = np.where(is_pivot[length:len(low) - length], low[length:len(low) - length], np.nan)
+        return TechnicalIndicators._like(pivots, data['Low'])
+    
+    @staticmethod
+    def calculate_fvg(data):
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        high_2 = np.concatenate((np.full(min(2, len(high)), np.nan), high[:-2]))
+        low_2 = np.concatenate((np.full(min(2, len(low)), np.nan), low[:-2]))
         
-        df['TEMP_RSI'] = TechnicalIndicators.calculate_rsi(df)
-        df['TEMP_SMA_20'] = TechnicalIndicators.calculate_sma(df, 20)
-        df['TEMP_SMA_50'] = TechnicalIndicators.calculate_sma(df, 50)
-        df['TEMP_EMA_12'] = TechnicalIndicators.calculate_ema(df, 12)
+        bullish = low > high_2
+        bearish = high < low_2
+        return pd.DataFrame({
+            'Bull_Top': np.where(bullish, low, np.nan),
+            'Bull_Bottom': np.where(bullish, high_2, np.nan),
+            'Bear_Top': np.where(bearish, low_2, np.nan),
+            'Bear_Bottom': np.where(bearish, high, np.nan)
+        }, index=data.index)
+    
+    @staticmethod
+    def add_all_indicators(data, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9,
+                           bb_period=20, bb_std=2, stoch_k=14, stoch_d=3, atr_period=14, calculator=None):
+        frame = LazyIndicatorFrame(
+            data, rsi_period=rsi_period, macd_fast=macd_fast, macd_slow=macd_slow,
+            macd_signal=macd_signal, bb_period=bb_period, bb_std=bb_std, stoch_k=stoch_k,
+            stoch_d=stoch_d, atr_period=atr_period, calculator=calculator
+        )
+        return frame.materialize()
+
+class _PriceLadder:
+    
+    __slots__ = ('capacity', 'tolerance', 'sides', 'order', 'alive', 'next_id')
+    
+    UPPER = 0
+    LOWER = 1
+    
+    def __init__(self, capacity, tolerance=0.0):
+        self.capacity = capacity
+        self.tolerance = tolerance
+        self.sides = ([], [])
+        self.order = deque()
+        self.alive = {}
+        self.next_id = 0
+    
+    def _discard(self, entry_id):
+        side, key, other = self.alive.pop(entry_id)
+        entries = self.sides[side]
+        del entries[bisect.bisect_left(entries, (key, entry_id))]
+    
+    def add(self, side, key, other=np.nan):
+        entries = self.sides[side]
+        if self.tolerance > 0:
+            i = bisect.bisect_left(entries, (key,))
+            for neighbor in entries[max(i - 1, 0):i + 1]:
+                if abs(neighbor[0] - key) < self.tolerance:
+                    return False
         
-        macd_data = TechnicalIndicators.calculate_macd(df)
-        df['TEMP_MACD'] = macd_data['MACD']
-        df['TEMP_MACD_Signal'] = macd_data['Signal']
-        df['TEMP_MACD_Hist'] = macd_data['Histogram']
+        entry_id = self.next_id
+        self.next_id += 1
+        bisect.insort(entries, (key, entry_id, other))
+        self.alive[entry_id] = (side, key, other)
+        self.order.append(entry_id)
         
-        bb_data = TechnicalIndicators.calculate_bbands(df)
-        df['TEMP_BB_Upper'] = bb_data['BB_Upper']
-        df['TEMP_BB_Middle'] = bb_data['BB_Middle']
-        df['TEMP_BB_Lower'] = bb_data['BB_Lower']
+        while len(self.alive) > self.capacity:
+            oldest = self.order.popleft()
+            if oldest in self.alive:
+                self._discard(oldest)
+        return True
+    
+    def breach(self, high, low, inclusive):
+        upper, lower = self.sides
+        cut = bisect.bisect_right(upper, (high, math.inf)) if inclusive else bisect.bisect_left(upper, (high,))
+        for _, entry_id, _ in upper[:cut]:
+            del self.alive[entry_id]
+        del upper[:cut]
         
-        stoch_data = TechnicalIndicators.calculate_stochastic(df)
-        df['TEMP_Stoch_K'] = stoch_data['Stoch_K']
-        df['TEMP_Stoch_D'] = stoch_data['Stoch_D']
+        cut = bisect.bisect_left(lower, (low,)) if inclusive else bisect.bisect_right(lower, (low, math.inf))
+        for _, entry_id, _ in lower[cut:]:
+            del self.alive[entry_id]
+        del lower[cut:]
+    
+    def nearest(self):
+        upper, lower = self.sides
+        if lower:
+            highest = lower[bisect.bisect_left(lower, (lower[-1][0],))]
+        return (
+            (upper[0][0], upper[0][2]) if upper else (np.nan, np.nan),
+            (highest[0], highest[2]) if lower else (np.nan, np.nan)
+        )
+
+class SwingFVGIndicator:
+    
+    LEVEL_TIMEFRAMES = {'4H': 5, '1H': 8, '15m': 10}
+    FVG_TIMEFRAMES = ('1H', '15m', '5m')
+    
+    def __init__(self, swing_length=5, max_gaps=5, tolerance=0.1, level_timeframes=None,
+                 fvg_timeframes=None, base_freq='1min'):
+        self.swing_length = swing_length
+        self.max_gaps = max_gaps
+        self.tolerance = tolerance
+        self.level_timeframes = self.LEVEL_TIMEFRAMES if level_timeframes is None else level_timeframes
+        self.fvg_timeframes = self.FVG_TIMEFRAMES if fvg_timeframes is None else fvg_timeframes
+        self.base_freq = base_freq
+    
+    @staticmethod
+    def columns(level_timeframes=None, fvg_timeframes=None):
+        level_timeframes = SwingFVGIndicator.LEVEL_TIMEFRAMES if level_timeframes is None else level_timeframes
+        fvg_timeframes = SwingFVGIndicator.FVG_TIMEFRAMES if fvg_timeframes is None else fvg_timeframes
+        columns = []
+        for timeframe in level_timeframes:
+            columns += [f'Swing_High_{timeframe}', f'Swing_Low_{timeframe}']
+        for timeframe in fvg_timeframes:
+            columns += [f'FVG_Bull_Top_{timeframe}', f'FVG_Bull_Bottom_{timeframe}',
+                        f'FVG_Bear_Top_{timeframe}', f'FVG_Bear_Bottom_{timeframe}']
+        return columns
+    
+    @staticmethod
+    def _events(rows):
+        events = np.flatnonzero(rows[1:] != rows[:-1]) + 1
+        if len(rows) > 0:
+            events = np.concatenate(([0], events))
+        return events[rows[events] >= 0]
+    
+    @staticmethod
+    def _sweep(ladder, events, add, high, low, inclusive):
+        n = len(high)
+        nearest = np.full((n, 4), np.nan)
+        pos = 0
+        
+        for stop in list(events) + [n]:
+            while pos < stop:
+                (upper, upper_other), (lower, lower_other) = ladder.nearest()
+                if inclusive:
+                    hit = (high[pos:stop] >= upper) | (low[pos:stop] <= lower)
+                else:
+                    hit = (high[pos:stop] > upper) | (low[pos:stop] < lower)
+                
+                first = int(hit.argmax())
+                end = pos + first if hit[first] else stop
+                nearest[pos:end] = (upper, upper_other, lower, lower_other)
+                if end == stop:
+                    pos = stop
+                    break
+                
+                ladder.breach(high[end], low[end], inclusive)
+                (upper, upper_other), (lower, lower_other) = ladder.nearest()
+                nearest[end] = (upper, upper_other, lower, lower_other)
+                pos = end + 1
+            
+            if stop == n:
+                break
+            
+            add(stop)
+            ladder.breach(high[stop], low[stop], inclusive)
+            (upper, upper_other), (lower, lower_other) = ladder.nearest()
+            nearest[stop] = (upper, upper_other, lower, lower_other)
+            pos = stop + 1
+        
+        return nearest
+    
+    def compute(self, data):
+        from timeframes import TimeframeResampler
+        
+        data = LazyIndicatorFrame.from_arrays(data)
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        
+        timeframes = [tf for tf in dict.fromkeys(list(self.level_timeframes) + list(self.fvg_timeframes)) if tf != 'base']
+        resampler = TimeframeResampler(data, timeframes, self.base_freq) if timeframes else None
+        
+        def completed(timeframe):
+            if timeframe == 'base':
+                return data, np.arange(len(data))
+            return resampler.bars(timeframe), resampler.completed_rows(timeframe)
+        
+        columns = {}
+        for timeframe, max_levels in self.level_timeframes.items():
+            bars, rows = completed(timeframe)
+            events = self._events(rows)
+            pivot_high = TechnicalIndicators.calculate_pivot_high(bars, self.swing_length).to_numpy()
+            pivot_low = TechnicalIndicators.calculate_pivot_low(bars, self.swing_length).to_numpy()
+            events = events[~np.isnan(pivot_high[rows[events]]) | ~np.isnan(pivot_low[rows[events]])]
+            ladder = _PriceLadder(max_levels, self.tolerance)
+            
+            def add_levels(i):
+                j = rows[i]
+                if not np.isnan(pivot_high[j]):
+                    ladder.add(_PriceLadder.UPPER, pivot_high[j])
+                if not np.isnan(pivot_low[j]):
+                    ladder.add(_PriceLadder.LOWER, pivot_low[j])
+            
+            nearest = self._sweep(ladder, events, add_levels, high, low, inclusive=False)
+            columns[f'Swing_High_{timeframe}'] = nearest[:, 0]
+            columns[f'Swing_Low_{timeframe}'] = nearest[:, 2]
+        
+        for timeframe in self.fvg_timeframes:
+            bars, rows = completed(timeframe)
+            events = self._events(rows)
+            gaps = TechnicalIndicators.calculate_fvg(bars)
+            bull_top, bull_bottom = gaps['Bull_Top'].to_numpy(), gaps['Bull_Bottom'].to_numpy()
+            bear_top, bear_bottom = gaps['Bear_Top'].to_numpy(), gaps['Bear_Bottom'].to_numpy()
+            events = events[~np.isnan(bull_bottom[rows[events]]) | ~np.isnan(bear_top[rows[events]])]
+            ladder = _PriceLadder(self.max_gaps)
+            
+            def add_gaps(i):
+                j = rows[i]
+                if not np.isnan(bull_bottom[j]):
+                    ladder.add(_PriceLadder.LOWER, bull_bottom[j], bull_top[j])
+                if not np.isnan(bear_top[j]):
+                    ladder.add(_PriceLadder.UPPER, bear_top[j], bear_bottom[j])
+            
+            nearest = self._sweep(ladder, events, add_gaps, high, low, inclusive=True)
+            columns[f'FVG_Bear_Top_{timeframe}'] = nearest[:, 0]
+            columns[f'FVG_Bear_Bottom_{timeframe}'] = nearest[:, 1]
+            columns[f'FVG_Bull_Bottom_{timeframe}'] = nearest[:, 2]
+            columns[f'FVG_Bull_Top_{timeframe}'] = nearest[:, 3]
+        
+        return pd.DataFrame(
+            {column: columns[column] for column in self.columns(self.level_timeframes, self.fvg_timeframes)},
+            index=data.index
+        )
+
+class LazyIndicatorFrame:
+    
+    INDICATOR_COLUMNS = [
+        'TEMP_RSI', 'TEMP_SMA_20', 'TEMP_SMA_50', 'TEMP_EMA_12',
+        'TEMP_MACD', 'TEMP_MACD_Signal', 'TEMP_MACD_Hist',
+        'TEMP_BB_Upper', 'TEMP_BB_Middle', 'TEMP_BB_Lower',
+        'TEMP_Stoch_K', 'TEMP_Stoch_D', 'TEMP_ATR'
+    ]
+    
+    SWING_FVG_COLUMNS = SwingFVGIndicator.columns()
+    
+    def __init__(self, data, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9,
+                 bb_period=20, bb_std=2, stoch_k=14, stoch_d=3, atr_period=14, swing_length=5,
+                 max_gaps=5, calculator=None):
+        data = self.from_arrays(data)
+        self.data = data
+        self.index = data.index
+        self.calc = calculator or TechnicalIndicators
+        self.params = {
+            'rsi_period': rsi_period,
+            'macd_fast': macd_fast,
+            'macd_slow': macd_slow,
+            'macd_signal': macd_signal,
+            'bb_period': bb_period,
+            'bb_std': bb_std,
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            'atr_period': atr_period,
+            'swing_length': swing_length,
+            'max_gaps': max_gaps
+        }
+        self._computed = {}
+    
+    @staticmethod
+    def from_arrays(data):
+        if isinstance(data, pd.DataFrame):
+            return data
         
-        df['TEMP_ATR'] = TechnicalIndicators.calculate_atr(df)
+        columns = dict(data)
+        index = pd.DatetimeIndex(columns.pop('Date'), name='Date')
+        return pd.DataFrame(columns, index=index, copy=False)
+    
+    def _calculate(self, column):
+        calc = self.calc
+        data = self.data
+        p = self.params
+        
+        if column == 'TEMP_RSI':
+            return {column: calc.calculate_rsi(data, p['rsi_period'])}
+        if column == 'TEMP_SMA_20':
+            return {column: calc.calculate_sma(data, 20)}
+        if column == 'TEMP_SMA_50':
+            return {column: calc.calculate_sma(data, 50)}
+        if column == 'TEMP_EMA_12':
+            return {column: calc.calculate_ema(data, 12)}
+        if column in ('TEMP_MACD', 'TEMP_MACD_Signal', 'TEMP_MACD_Hist'):
+            macd_data = calc.calculate_macd(data, p['macd_fast'], p['macd_slow'], p['macd_signal'])
+            return {
+                'TEMP_MACD': macd_data['MACD'],
+                'TEMP_MACD_Signal': macd_data['Signal'],
+                'TEMP_MACD_Hist': macd_data['Histogram']
+            }
+        if column in ('TEMP_BB_Upper', 'TEMP_BB_Middle', 'TEMP_BB_Lower'):
+            bb_data = calc.calculate_bbands(data, p['bb_period'], p['bb_std'])
+            return {
+                'TEMP_BB_Upper': bb_data['BB_Upper'],
+                'TEMP_BB_Middle': bb_data['BB_Middle'],
+                'TEMP_BB_Lower': bb_data['BB_Lower']
+            }
+        if column in ('TEMP_Stoch_K', 'TEMP_Stoch_D'):
+            stoch_data = calc.calculate_stochastic(data, p['stoch_k'], p['stoch_d'])
+            return {
+                'TEMP_Stoch_K': stoch_data['Stoch_K'],
+                'TEMP_Stoch_D': stoch_data['Stoch_D']
+            }
+        if column == 'TEMP_ATR':
+            return {column: calc.calculate_atr(data, p['atr_period'])}
+        if column in self.SWING_FVG_COLUMNS:
+            swing_fvg = SwingFVGIndicator(swing_length=p['swing_length'], max_gaps=p['max_gaps']).compute(data)
+            return {name: swing_fvg[name] for name in self.SWING_FVG_COLUMNS}
+        
+        raise KeyError(column)
+    
+    def preload(self, columns):
+        for column, values in columns.items():
+            self._computed[column] = pd.Series(values, index=self.index, copy=False)
+    
+    def __getitem__(self, column):
+        if column in self.data.columns:
+            return self.data[column]
+        if column not in self._computed:
+            self._computed.update(self._calculate(column))
+        return self._computed[column]
+    
+    def __contains__(self, column):
+        return (column in self.data.columns or column in self.INDICATOR_COLUMNS
+                or column in self.SWING_FVG_COLUMNS)
+    
+    def materialize(self, columns=None):
+        df = self.data.copy(deep=False)
+        
+        for column in self.INDICATOR_COLUMNS if columns is None else columns:
+            if column not in df.columns:
+                df[column] = self[column]
         
         return df
+    
+    def trimmed(self, columns, extra_columns=('TEMP_ATR',)):
+        columns = list(columns)
+        df = self.materialize(columns + [c for c in extra_columns if c not in columns])
+        return df.dropna(subset=['Close'] + columns)
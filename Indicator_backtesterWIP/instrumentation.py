@@ -0,0 +1,183 @@
+import json
+import os
+import time
+import tracemalloc
+
+class _NullStage:
+    
+    __slots__ = ('rows',)
+    
+    def __init__(self):
+        self.rows = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    
+    __slots__ = ('profiler', 'name', 'rows', 'args', 'start_ns', 'cpu_start_ns', 'memory_start', 'peak')
+    
+    def __init__(self, profiler, name, rows, args):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.args = args
+        self.memory_start = 0
+        self.peak = 0
+    
+    def __enter__(self):
+        profiler = self.profiler
+        if profiler.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                profiler._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if profiler._stack:
+                parent = profiler._stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.peak = current
+        
+        profiler._stack.append(self)
+        self.cpu_start_ns = time.process_time_ns()
+        self.start_ns = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc):
+        end_ns = time.perf_counter_ns()
+        cpu_end_ns = time.process_time_ns()
+        profiler = self.profiler
+        profiler._stack.pop()
+        
+        allocated = peak = None
+        if profiler.memory and tracemalloc.is_tracing():
+            current, traced_peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, traced_peak)
+            if profiler._stack:
+                parent = profiler._stack[-1]
+                parent.peak = max(parent.peak, self.peak)
+            allocated = current - self.memory_start
+            peak = self.peak - self.memory_start
+        
+        profiler.records.append({
+            'stage': self.name,
+            'start_us': (self.start_ns - profiler.origin_ns) / 1e3,
+            'wall_ms': (end_ns - self.start_ns) / 1e6,
+            'cpu_ms': (cpu_end_ns - self.cpu_start_ns) / 1e6,
+            'alloc_bytes': allocated,
+            'peak_bytes': peak,
+            'rows': self.rows,
+            'depth': len(profiler._stack),
+            'args': self.args
+        })
+        return False
+
+class StageProfiler:
+    
+    FORMATS = ('json', 'chrome')
+    
+    def __init__(self, enabled=False, memory=True, output=None, fmt='json'):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown profile format {fmt}, expected one of {self.FORMATS}")
+        
+        self.enabled = enabled
+        self.memory = memory
+        self.output = output
+        self.fmt = fmt
+        self.records = []
+        self.origin_ns = time.perf_counter_ns()
+        self._stack = []
+        self._started_tracing = False
+    
+    @classmethod
+    def from_env(cls, enabled=None):
+        # BACKTEST_PROFILE=1|json|chrome turns profiling on; BACKTEST_PROFILE_OUTPUT picks the file
+        # and BACKTEST_PROFILE_MEMORY=0 skips tracemalloc.
+        setting = os.environ.get('BACKTEST_PROFILE', '').strip().lower()
+        if enabled is None:
+            enabled = setting not in ('', '0', 'false', 'no', 'off')
+        
+        fmt = 'chrome' if setting == 'chrome' else 'json'
+        memory = os.environ.get('BACKTEST_PROFILE_MEMORY', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+        return cls(enabled, memory, os.environ.get('BACKTEST_PROFILE_OUTPUT'), fmt)
+    
+    def stage(self, name, rows=None, **args):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows, args)
+    
+    def reset(self):
+        self.records = []
+        self.origin_ns = time.perf_counter_ns()
+    
+    def summary(self):
+        stages = {}
+        for record in self.records:
+            stats = stages.setdefault(record['stage'], {
+                'calls': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'alloc_bytes': None, 'peak_bytes': None, 'rows': None
+            })
+            stats['calls'] += 1
+            stats['wall_ms'] += record['wall_ms']
+            stats['cpu_ms'] += record['cpu_ms']
+            if record['alloc_bytes'] is not None:
+                stats['alloc_bytes'] = (stats['alloc_bytes'] or 0) + record['alloc_bytes']
+                stats['peak_bytes'] = max(stats['peak_bytes'] or 0, record['peak_bytes'])
+            if record['rows'] is not None:
+                stats['rows'] = (stats['rows'] or 0) + record['rows']
+        return stages
+    
+    def print_summary(self):
+        if not self.records:
+            return
+        
+        print("\n" + "="*60)
+        print("STAGE PROFILE")
+        print("="*60)
+        print(f"{'Stage':<14} {'Calls':>6} {'Wall ms':>10} {'CPU ms':>10} {'Peak MB':>9} {'Rows':>12}")
+        print("-" * 66)
+        for name, stats in self.summary().items():
+            peak = f"{stats['peak_bytes'] / 2**20:>9.1f}" if stats['peak_bytes'] is not None else f"{'-':>9}"
+            rows = f"{stats['rows']:>12,}" if stats['rows'] is not None else f"{'-':>12}"
+            print(f"{name:<14} {stats['calls']:>6} {stats['wall_ms']:>10.1f} {stats['cpu_ms']:>10.1f} {peak} {rows}")
+    
+    def to_json(self):
+        return {'stages': self.summary(), 'records': self.records}
+    
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args = {key: record[key] for key in ('cpu_ms', 'alloc_bytes', 'peak_bytes', 'rows') if record[key] is not None}
+            args.update(record['args'])
+            events.append({
+                'name': record['stage'],
+                'cat': 'backtest',
+                'ph': 'X',
+                'ts': record['start_us'],
+                'dur': record['wall_ms'] * 1e3,
+                'pid': pid,
+                'tid': 0,
+                'args': args
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    
+    def export(self, path=None, fmt=None):
+        fmt = fmt or self.fmt
+        path = path or self.output or ('backtest_trace.json' if fmt == 'chrome' else 'backtest_profile.json')
+        payload = self.to_chrome_trace() if fmt == 'chrome' else self.to_json()
+        
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2, default=str)
+        
+        print(f"✓ Stage profile written to {path}")
+        return path
+    
+    def close(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
@@ -0,0 +1,89 @@
+import numpy as np
+
+class RollingKernels:
+    
+    @staticmethod
+    def _blocks(values, window, fill):
+        values = np.asarray(values, dtype=np.float64)
+        if window < 1:
+            raise ValueError(f"Window must be at least 1, got {window}")
+        
+        n = values.shape[0]
+        num_blocks = -(-n // window)
+        padded = np.full((num_blocks * window,) + values.shape[1:], fill)
+        padded[:n] = values
+        return values, padded.reshape((num_blocks, window) + values.shape[1:])
+    
+    @staticmethod
+    def _extreme(values, window, ufunc, fill):
+        # van Herk/Gil-Werman: every window is the union of one block suffix and the next
+        # block's prefix, so two accumulate passes give O(N) regardless of the window.
+        values, blocks = RollingKernels._blocks(values, window, fill)
+        n = values.shape[0]
+        result = np.full(values.shape, np.nan)
+        if n < window:
+            return result
+        
+        prefix = ufunc.accumulate(blocks, axis=1).reshape((-1,) + values.shape[1:])
+        suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape((-1,) + values.shape[1:])
+        result[window - 1:] = ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+        return result
+    
+    @staticmethod
+    def rolling_max(values, window):
+        return RollingKernels._extreme(values, window, np.maximum, -np.inf)
+    
+    @staticmethod
+    def rolling_min(values, window):
+        return RollingKernels._extreme(values, window, np.minimum, np.inf)
+    
+    @staticmethod
+    def rolling_argmax(values, window):
+        values, blocks = RollingKernels._blocks(values, window, -np.inf)
+        n = values.shape[0]
+        result = np.full(values.shape, -1, dtype=np.int64)
+        if n < window:
+            return result
+        
+        shape = (-1,) + values.shape[1:]
+        positions = np.arange(blocks.shape[0] * window).reshape((blocks.shape[0], window) + (1,) * (values.ndim - 1))
+        positions = np.broadcast_to(positions, blocks.shape)
+        
+        prefix = np.maximum.accumulate(blocks, axis=1)
+        rises = np.ones(blocks.shape, dtype=bool)
+        rises[:, 1:] = prefix[:, 1:] != prefix[:, :-1]
+        prefix_arg = np.maximum.accumulate(np.where(rises, positions, -1), axis=1)
+        
+        suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+        records = np.where(blocks == suffix, positions, np.iinfo(np.int64).max)
+        suffix_arg = np.minimum.accumulate(records[:, ::-1], axis=1)[:, ::-1]
+        
+        prefix, prefix_arg = prefix.reshape(shape)[window - 1:n], prefix_arg.reshape(shape)[window - 1:n]
+        suffix, suffix_arg = suffix.reshape(shape)[:n - window + 1], suffix_arg.reshape(shape)[:n - window + 1]
+        
+        argmax = np.where(suffix >= prefix, suffix_arg, prefix_arg)
+        result[window - 1:] = np.where(np.isnan(suffix) | np.isnan(prefix), -1, argmax)
+        return result
+    
+    @staticmethod
+    def rolling_argmin(values, window):
+        return RollingKernels.rolling_argmax(-np.asarray(values, dtype=np.float64), window)
+    
+    @staticmethod
+    def pivot_high(values, left, right=None):
+        right = left if right is None else right
+        values = np.asarray(values, dtype=np.float64)
+        n = values.shape[0]
+        pivots = np.zeros(values.shape, dtype=bool)
+        if n < left + right + 1:
+            return pivots
+        
+        center = values[left:n - right]
+        left_max = RollingKernels.rolling_max(values, left)[left - 1:n - right - 1]
+        right_max = RollingKernels.rolling_max(values, right)[left + right:]
+        pivots[left:n - right] = (center > left_max) & (center > right_max)
+        return pivots
+    
+    @staticmethod
+    def pivot_low(values, left, right=None):
+        return RollingKernels.pivot_high(-np.asarray(values, dtype=np.float64), left, right)
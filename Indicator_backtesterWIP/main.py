@@ -1,44 +1,68 @@
 import sys
 from data_generator import HistoricalDataGenerator
-from indicators import TechnicalIndicators
+from indicators import LazyIndicatorFrame
 from strategies import StrategyGenerator
 from backtest_engine import BacktestEngine
 from results_logger import ResultsLogger
+from optimizer import ParameterOptimizer
+from monte_carlo import MonteCarloBacktester
+from walk_forward import WalkForwardScheduler
+from portfolio_engine import PortfolioEngine
+from instrumentation import StageProfiler
+from snapshot_cache import SnapshotCache
 import pandas as pd
 
 class BacktestingSystem:
     
-    def __init__(self):
+    def __init__(self, symbol='SPY', profile=None, snapshot_dir=SnapshotCache.DEFAULT_ROOT):
+        self.symbol = symbol
+        self.snapshots = SnapshotCache(snapshot_dir) if snapshot_dir else None
+        self.profiler = StageProfiler.from_env(profile)
         self.data_generator = HistoricalDataGenerator()
         self.backtest_engine = BacktestEngine(initial_capital=10000)
+        self.backtest_engine.profiler = self.profiler
         self.logger = ResultsLogger()
         self.historical_data = None
-        self.data_with_indicators = None
-        
-    def setup(self):
+        self.indicator_frame = None
+    
+    def setup(self, data=None):
         print("\n" + "="*60)
         print("TRADING STRATEGY BACKTEST FRAMEWORK")
         print("="*60)
         print("\nInitializing system...")
         
-        print("Generating historical price data (SPY, 2020-2024)...")
-        self.historical_data = self.data_generator.generate_ohlcv(
-            symbol='SPY',
-            start_date='2020-01-01',
-            end_date='2024-12-31',
-            initial_price=300
-        )
-        
-        print("Calculating technical indicators...")
-        self.data_with_indicators = TechnicalIndicators.add_all_indicators(
-            self.historical_data
-        )
+        ohlcv_params = {
+            'symbol': self.symbol,
+            'start_date': '2020-01-01',
+            'end_date': '2024-12-31',
+            'initial_price': 300
+        }
         
-        self.data_with_indicators = self.data_with_indicators.dropna()
+        with self.profiler.stage('generation') as stage:
+            if data is not None:
+                print(f"Loading historical price data ({self.symbol})...")
+                self.historical_data = LazyIndicatorFrame.from_arrays(data)
+                self.indicator_frame = LazyIndicatorFrame(self.historical_data)
+            elif self.snapshots is not None:
+                self.historical_data, self.indicator_frame, cached = self.snapshots.get_or_build(
+                    {'seed': self.data_generator.seed, **ohlcv_params}, {},
+                    lambda: self.data_generator.generate_ohlcv(**ohlcv_params)
+                )
+                print(f"{'Loaded cached' if cached else 'Generated and cached'} historical price data ({self.symbol}, 2020-2024)")
+            else:
+                print(f"Generating historical price data ({self.symbol}, 2020-2024)...")
+                self.historical_data = self.data_generator.generate_ohlcv(**ohlcv_params)
+                self.indicator_frame = LazyIndicatorFrame(self.historical_data)
+            stage.rows = len(self.historical_data)
         
-        print(f"✓ Data ready: {len(self.data_with_indicators)} trading days")
-        print(f"  Date range: {self.data_with_indicators.index[0].date()} to {self.data_with_indicators.index[-1].date()}")
-        print(f"  Price range: ${self.data_with_indicators['Close'].min():.2f} - ${self.data_with_indicators['Close'].max():.2f}")
+        print(f"✓ Data ready: {len(self.historical_data)} trading days")
+        print(f"  Date range: {self.historical_data.index[0].date()} to {self.historical_data.index[-1].date()}")
+        print(f"  Price range: ${self.historical_data['Close'].min():.2f} - ${self.historical_data['Close'].max():.2f}")
+    
+    def strategy_data(self, strategy_name):
+        return self.indicator_frame.trimmed(
+            StrategyGenerator.get_strategy_requirements(strategy_name)
+        )
     
     def display_available_strategies(self):
         strategies = StrategyGenerator.get_all_strategies()
@@ -87,17 +111,31 @@ class BacktestingSystem:
         strategies = StrategyGenerator.get_all_strategies()
         strategy_func = strategies[strategy_name]
         
-        print(f"\n{'='*60}")
-        print(f"RUNNING: {strategy_name}")
-        print(f"{'='*60}")
+        self.print_header(strategy_name)
         
-        signals = strategy_func(self.data_with_indicators)
+        with self.profiler.stage('indicators', strategy=strategy_name) as stage:
+            data = self.strategy_data(strategy_name)
+            stage.rows = len(data)
         
-        results = self.backtest_engine.run_backtest(
-            self.data_with_indicators,
+        with self.profiler.stage('signals', rows=len(data), strategy=strategy_name):
+            signals = strategy_func(data)
+        
+        results = self.backtest_engine.run_backtest_vectorized(
+            data,
             signals
         )
         
+        with self.profiler.stage('logging', rows=1):
+            self.report_results(strategy_name, results, data.index)
+        
+        return results
+    
+    def print_header(self, strategy_name):
+        print(f"\n{'='*60}")
+        print(f"RUNNING: {strategy_name}")
+        print(f"{'='*60}")
+    
+    def report_results(self, strategy_name, results, dates):
         metrics = results['metrics']
         print("\nPerformance Metrics:")
         print(f"  Total Return:              {metrics['total_return_pct']:>8.2f}%")
@@ -131,22 +169,34 @@ class BacktestingSystem:
         print(f"  Exposure Time:             {metrics['exposure_time_pct']:>8.2f}%")
         
         data_info = {
-            'symbol': 'SPY',
-            'start_date': str(self.data_with_indicators.index[0].date()),
-            'end_date': str(self.data_with_indicators.index[-1].date()),
-            'num_days': len(self.data_with_indicators)
+            'symbol': self.symbol,
+            'start_date': str(dates[0].date()),
+            'end_date': str(dates[-1].date()),
+            'num_days': len(dates)
         }
         self.logger.save_result(strategy_name, metrics, data_info)
-        
-        return results
     
     def run_multiple_backtests(self, strategy_names):
-        results = {}
-        
+        columns = []
         for strategy_name in strategy_names:
-            result = self.run_backtest(strategy_name)
-            results[strategy_name] = result
-            print()
+            for column in StrategyGenerator.get_strategy_requirements(strategy_name) + ['TEMP_ATR']:
+                if column not in columns:
+                    columns.append(column)
+        
+        with self.profiler.stage('indicators', rows=len(self.historical_data)):
+            data = self.indicator_frame.materialize(columns)
+        
+        with self.profiler.stage('signals') as stage:
+            signals = StrategyGenerator.generate_signals(data, strategy_names)
+            stage.rows = sum(len(frame) for frame in signals.values())
+        
+        results = self.backtest_engine.run_backtest_batch(data, signals)
+        
+        with self.profiler.stage('logging', rows=len(strategy_names)), self.logger.session():
+            for strategy_name in strategy_names:
+                self.print_header(strategy_name)
+                self.report_results(strategy_name, results[strategy_name], signals[strategy_name].index)
+                print()
         
         print("\n" + "="*60)
         print("ALL BACKTESTS COMPLETED")
@@ -231,6 +281,174 @@ class BacktestingSystem:
         else:
             print("\nNot enough data to determine best strategy yet.")
     
+    def optimize_parameters(self):
+        strategies = StrategyGenerator.get_all_strategies()
+        strategy_names = list(strategies.keys())
+        
+        self.display_available_strategies()
+        choice = input("\nStrategy to optimize (number): ").strip()
+        try:
+            strategy_name = strategy_names[int(choice) - 1]
+        except (ValueError, IndexError):
+            print("Invalid selection.")
+            return
+        
+        n_iter = input("Random samples to test (blank for full grid): ").strip()
+        n_iter = int(n_iter) if n_iter.isdigit() else None
+        
+        optimizer = ParameterOptimizer(
+            self.historical_data,
+            initial_capital=self.backtest_engine.initial_capital,
+            commission=self.backtest_engine.commission,
+            logger=self.logger
+        )
+        ranking = optimizer.optimize(strategy_name, n_iter=n_iter)
+        
+        print("\nTOP PARAMETER SETS:")
+        print("-" * 60)
+        if ranking.empty:
+            print("No results.")
+        else:
+            print(ranking[['label', 'total_return_pct', 'sharpe_ratio', 'max_drawdown_pct', 'num_trades']].to_string(index=False))
+    
+    def monte_carlo_analysis(self):
+        strategies = StrategyGenerator.get_all_strategies()
+        strategy_names = list(strategies.keys())
+        
+        self.display_available_strategies()
+        choice = input("\nStrategy to stress test (number): ").strip()
+        try:
+            strategy_name = strategy_names[int(choice) - 1]
+        except (ValueError, IndexError):
+            print("Invalid selection.")
+            return
+        
+        n_paths = input("Number of synthetic paths (default 1000): ").strip()
+        n_paths = int(n_paths) if n_paths.isdigit() and int(n_paths) > 0 else 1000
+        
+        print(f"\nSimulating {n_paths} independent paths for {strategy_name}...")
+        monte_carlo = MonteCarloBacktester(
+            strategy_name,
+            engine=self.backtest_engine,
+            generator=self.data_generator
+        )
+        results = monte_carlo.run(n_paths=n_paths)
+        
+        print("\nMONTE CARLO DISTRIBUTION:")
+        print("-" * 60)
+        print(results['summary'].to_string(float_format=lambda value: f"{value:.2f}"))
+    
+    def walk_forward_analysis(self):
+        strategies = StrategyGenerator.get_all_strategies()
+        strategy_names = list(strategies.keys())
+        
+        self.display_available_strategies()
+        choice = input("\nStrategy for walk-forward analysis (number): ").strip()
+        try:
+            strategy_name = strategy_names[int(choice) - 1]
+        except (ValueError, IndexError):
+            print("Invalid selection.")
+            return
+        
+        train_bars = input("In-sample bars per window (default 504): ").strip()
+        train_bars = int(train_bars) if train_bars.isdigit() and int(train_bars) > 0 else 504
+        test_bars = input("Out-of-sample bars per window (default 126): ").strip()
+        test_bars = int(test_bars) if test_bars.isdigit() and int(test_bars) > 0 else 126
+        anchored = input("Anchored in-sample windows? (yes/no, default no): ").strip().lower() == 'yes'
+        n_iter = input("Random samples per window (blank for full grid): ").strip()
+        n_iter = int(n_iter) if n_iter.isdigit() else None
+        
+        scheduler = WalkForwardScheduler(
+            self.historical_data,
+            initial_capital=self.backtest_engine.initial_capital,
+            commission=self.backtest_engine.commission
+        )
+        results = scheduler.run(
+            strategy_name,
+            train_bars=train_bars,
+            test_bars=test_bars,
+            anchored=anchored,
+            n_iter=n_iter
+        )
+        
+        windows = results['windows']
+        print("\nOUT-OF-SAMPLE WINDOWS:")
+        print("-" * 60)
+        if 'params' in windows.columns:
+            print(windows[['window', 'test_start', 'test_end', 'params', 'total_return_pct', 'sharpe_ratio', 'num_trades']].to_string(index=False))
+        else:
+            print("No windows produced results.")
+            return
+        
+        metrics = results['metrics']
+        print("\nSTITCHED OUT-OF-SAMPLE PERFORMANCE:")
+        print(f"  Total Return:              {metrics['total_return_pct']:>8.2f}%")
+        print(f"  Sharpe Ratio:              {metrics['sharpe_ratio']:>8.2f}")
+        print(f"  Max Drawdown:              {metrics['max_drawdown_pct']:>8.2f}%")
+        print(f"  Number of Trades:          {metrics['num_trades']:>8}")
+        
+        equity_curve = results['equity_curve']
+        if not equity_curve.empty:
+            data_info = {
+                'symbol': self.symbol,
+                'start_date': str(equity_curve['date'].iloc[0].date()),
+                'end_date': str(equity_curve['date'].iloc[-1].date()),
+                'num_days': len(equity_curve),
+                'walk_forward': {'train_bars': train_bars, 'test_bars': test_bars, 'anchored': anchored}
+            }
+            self.logger.save_result(strategy_name, metrics, data_info, run_type='walk_forward')
+    
+    def portfolio_analysis(self):
+        strategies = StrategyGenerator.get_all_strategies()
+        strategy_names = list(strategies.keys())
+        
+        self.display_available_strategies()
+        choice = input("\nStrategy to trade across the portfolio (number): ").strip()
+        try:
+            strategy_name = strategy_names[int(choice) - 1]
+        except (ValueError, IndexError):
+            print("Invalid selection.")
+            return
+        
+        num_symbols = input("Number of symbols (default 20): ").strip()
+        num_symbols = int(num_symbols) if num_symbols.isdigit() and int(num_symbols) > 0 else 20
+        max_positions = input("Maximum concurrent positions (default 10): ").strip()
+        max_positions = int(max_positions) if max_positions.isdigit() and int(max_positions) > 0 else 10
+        
+        symbols = [f"SYM{i:03d}" for i in range(1, num_symbols + 1)]
+        print(f"\nGenerating {num_symbols} symbols and running {strategy_name}...")
+        panel = self.data_generator.generate_panel(symbols, start_date='2020-01-01', end_date='2024-12-31')
+        
+        engine = PortfolioEngine(
+            initial_capital=self.backtest_engine.initial_capital,
+            commission=self.backtest_engine.commission,
+            max_positions=max_positions
+        )
+        results = engine.run_panel(panel, strategy_name)
+        metrics = results['metrics']
+        
+        print("\nPORTFOLIO PERFORMANCE:")
+        print(f"  Total Return:              {metrics['total_return_pct']:>8.2f}%")
+        print(f"  Annual Return:             {metrics['annual_return_pct']:>8.2f}%")
+        print(f"  Sharpe Ratio:              {metrics['sharpe_ratio']:>8.2f}")
+        print(f"  Max Drawdown:              {metrics['max_drawdown_pct']:>8.2f}%")
+        print(f"  Number of Trades:          {metrics['num_trades']:>8}")
+        print(f"  Win Rate:                  {metrics['win_rate_pct']:>8.2f}%")
+        print(f"  Exposure Time:             {metrics['exposure_time_pct']:>8.2f}%")
+        
+        if not results['symbol_summary'].empty:
+            print("\nTOP SYMBOLS BY P&L:")
+            print(results['symbol_summary'].head(10).to_string(float_format=lambda value: f"{value:.2f}"))
+        
+        data_info = {
+            'symbols': symbols,
+            'start_date': str(panel.index[0].date()),
+            'end_date': str(panel.index[-1].date()),
+            'num_days': len(panel),
+            'portfolio': {'max_positions': max_positions}
+        }
+        self.logger.save_result(strategy_name, metrics, data_info, run_type='portfolio')
+    
     def main_menu(self):
         while True:
             print("\n" + "="*60)
@@ -240,9 +458,13 @@ class BacktestingSystem:
             print("2. Analyze all historical results")
             print("3. Export results to CSV")
             print("4. Clear all saved results")
-            print("5. Exit")
+            print("5. Optimize strategy parameters")
+            print("6. Monte Carlo robustness test")
+            print("7. Walk-forward analysis")
+            print("8. Portfolio backtest")
+            print("9. Exit")
             
-            choice = input("\nSelect option (1-5): ").strip()
+            choice = input("\nSelect option (1-9): ").strip()
             
             if choice == '1':
                 self.display_available_strategies()
@@ -262,6 +484,18 @@ class BacktestingSystem:
                     self.logger.clear_results()
             
             elif choice == '5':
+                self.optimize_parameters()
+            
+            elif choice == '6':
+                self.monte_carlo_analysis()
+            
+            elif choice == '7':
+                self.walk_forward_analysis()
+            
+            elif choice == '8':
+                self.portfolio_analysis()
+            
+            elif choice == '9':
                 print("\nThank you for using the Backtesting Framework!")
                 break
             
@@ -272,6 +506,11 @@ def main():
     system = BacktestingSystem()
     system.setup()
     system.main_menu()
+    
+    if system.profiler.enabled:
+        system.profiler.print_summary()
+        system.profiler.export()
+        system.profiler.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,219 @@
+import numpy as np
+import backends
+
+class PerformanceMetrics:
+    
+    @staticmethod
+    def longest_run(mask):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape[-1] == 0:
+            return np.zeros(mask.shape[:-1], dtype=np.int64)
+        if backends.get_backend() != 'numpy':
+            rows = np.ascontiguousarray(mask.reshape(-1, mask.shape[-1]))
+            return backends.kernel('longest_run')(rows).reshape(mask.shape[:-1])[()]
+        
+        counts = np.cumsum(mask, axis=-1)
+        run_starts = np.where(mask, 0, counts)
+        np.maximum.accumulate(run_starts, axis=-1, out=run_starts)
+        return (counts - run_starts).max(axis=-1)
+    
+    @staticmethod
+    def _row_mean(rows, mask):
+        if mask.all():
+            if rows.shape[-1] == 0:
+                return np.full(len(rows), np.nan)
+            return rows.mean(axis=-1)
+        return np.array([row[keep].mean() if keep.any() else np.nan for row, keep in zip(rows, mask)])
+    
+    @staticmethod
+    def _row_std(rows, mask):
+        if mask.all():
+            if rows.shape[-1] < 2:
+                return np.full(len(rows), np.nan)
+            return rows.std(axis=-1, ddof=1)
+        return np.array([row[keep].std(ddof=1) if keep.sum() > 1 else np.nan for row, keep in zip(rows, mask)])
+    
+    @staticmethod
+    def equity_stats(equity, initial_capital):
+        equity = np.asarray(equity, dtype=np.float64)
+        single = equity.ndim == 1
+        values = np.ascontiguousarray(np.atleast_2d(equity.T))
+        num_runs, n = values.shape
+        runs = np.arange(num_runs)
+        
+        valid = ~np.isnan(values)
+        total_days = valid.sum(axis=-1)
+        last_rows = n - 1 - np.argmax(valid[:, ::-1], axis=-1)
+        final_equity = values[runs, last_rows]
+        total_return = ((final_equity / initial_capital) - 1) * 100
+        
+        returns = values[:, 1:] / values[:, :-1] - 1
+        return_mask = valid[:, 1:] & valid[:, :-1]
+        downside_mask = return_mask & (returns < 0)
+        return_count = return_mask.sum(axis=-1)
+        downside_count = downside_mask.sum(axis=-1)
+        
+        peak = np.fmax.accumulate(values, axis=-1)
+        drawdown = (values - peak) / peak * 100
+        max_drawdown = np.where(valid, drawdown, np.inf).min(axis=-1)
+        avg_drawdown = PerformanceMetrics._row_mean(drawdown, valid)
+        drawdown_duration = PerformanceMetrics.longest_run(valid & (drawdown < 0))
+        ulcer_index = np.sqrt(PerformanceMetrics._row_mean(drawdown ** 2, valid))
+        
+        returns_mean = PerformanceMetrics._row_mean(returns, return_mask)
+        returns_std = PerformanceMetrics._row_std(returns, return_mask)
+        downside_std = PerformanceMetrics._row_std(returns, downside_mask)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            has_risk = (return_count > 0) & (returns_std > 0)
+            sharpe_ratio = np.where(has_risk, (returns_mean / returns_std) * np.sqrt(252), 0.0)
+            sortino_ratio = np.where(
+                has_risk & (downside_count > 0) & (downside_std > 0),
+                (returns_mean / downside_std) * np.sqrt(252), 0.0
+            )
+            calmar_ratio = np.where(
+                has_risk & (max_drawdown != 0),
+                total_return / np.abs(max_drawdown), 0.0
+            )
+        
+        empty = total_days == 0
+        stats = {
+            'final_equity': np.where(empty, initial_capital, final_equity),
+            'total_return': np.where(empty, 0.0, total_return),
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'calmar_ratio': calmar_ratio,
+            'max_drawdown': np.where(empty, 0.0, max_drawdown),
+            'avg_drawdown': np.where(empty, 0.0, avg_drawdown),
+            'drawdown_duration': drawdown_duration,
+            'ulcer_index': np.where(empty, 0.0, ulcer_index),
+            'total_days': total_days
+        }
+        
+        if single:
+            return {key: value[0] for key, value in stats.items()}
+        return stats
+    
+    @staticmethod
+    def trade_durations(buy_dates, sell_dates):
+        count = min(len(buy_dates), len(sell_dates))
+        buy_dates = np.asarray(buy_dates)[:count]
+        sell_dates = np.asarray(sell_dates)[:count]
+        return (sell_dates - buy_dates).astype('timedelta64[D]').astype(int)
+    
+    @staticmethod
+    def trade_stats(pnl, durations, total_return, max_drawdown, total_days):
+        pnl = np.asarray(pnl, dtype=np.float64)
+        num_trades = len(pnl)
+        
+        if num_trades == 0:
+            return {
+                'num_trades': 0, 'num_wins': 0, 'num_losses': 0, 'win_rate': 0, 'avg_win': 0,
+                'avg_loss': 0, 'profit_factor': 0, 'payoff_ratio': 0, 'expectancy': 0,
+                'max_win': 0, 'max_loss': 0, 'avg_trade_duration': 0, 'max_trade_duration': 0,
+                'min_trade_duration': 0, 'max_consecutive_wins': 0, 'max_consecutive_losses': 0,
+                'recovery_factor': 0, 'kelly_pct': 0, 'exposure_time': 0
+            }
+        
+        is_win = pnl > 0
+        is_loss = pnl < 0
+        wins = pnl[is_win]
+        losses = pnl[is_loss]
+        
+        num_wins = len(wins)
+        num_losses = len(losses)
+        win_rate = (num_wins / num_trades) * 100
+        
+        avg_win = wins.mean() if num_wins > 0 else 0
+        avg_loss = losses.mean() if num_losses > 0 else 0
+        
+        total_wins = wins.sum() if num_wins > 0 else 0
+        total_losses = abs(losses.sum()) if num_losses > 0 else 0
+        
+        profit_factor = total_wins / total_losses if total_losses != 0 else 0
+        payoff_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else 0
+        
+        expectancy = (win_rate/100 * avg_win) + ((1 - win_rate/100) * avg_loss)
+        
+        max_win = wins.max() if num_wins > 0 else 0
+        max_loss = losses.min() if num_losses > 0 else 0
+        
+        durations = np.asarray(durations)
+        if len(durations) > 0:
+            avg_trade_duration = np.mean(durations)
+            max_trade_duration = np.max(durations)
+            min_trade_duration = np.min(durations)
+        else:
+            avg_trade_duration = 0
+            max_trade_duration = 0
+            min_trade_duration = 0
+        
+        recovery_factor = total_return / abs(max_drawdown) if max_drawdown != 0 else 0
+        
+        if win_rate < 100 and payoff_ratio > 0:
+            kelly_pct = (win_rate/100 - (1 - win_rate/100) / payoff_ratio) * 100
+        else:
+            kelly_pct = 0
+        
+        time_in_market = int(durations.sum())
+        exposure_time = (time_in_market / total_days * 100) if total_days > 0 else 0
+        
+        return {
+            'num_trades': num_trades,
+            'num_wins': num_wins,
+            'num_losses': num_losses,
+            'win_rate': win_rate,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'profit_factor': profit_factor,
+            'payoff_ratio': payoff_ratio,
+            'expectancy': expectancy,
+            'max_win': max_win,
+            'max_loss': max_loss,
+            'avg_trade_duration': avg_trade_duration,
+            'max_trade_duration': max_trade_duration,
+            'min_trade_duration': min_trade_duration,
+            'max_consecutive_wins': PerformanceMetrics.longest_run(is_win),
+            'max_consecutive_losses': PerformanceMetrics.longest_run(is_loss),
+            'recovery_factor': recovery_factor,
+            'kelly_pct': kelly_pct,
+            'exposure_time': exposure_time
+        }
+    
+    @staticmethod
+    def summarize(equity, trades):
+        total_return = equity['total_return']
+        total_days = equity['total_days']
+        annual_return = ((1 + total_return/100) ** (252/total_days) - 1) * 100 if total_days > 0 else 0
+        
+        return {
+            'total_return_pct': round(float(total_return), 2),
+            'annual_return_pct': round(float(annual_return), 2),
+            'final_equity': round(float(equity['final_equity']), 2),
+            'sharpe_ratio': round(float(equity['sharpe_ratio']), 2),
+            'sortino_ratio': round(float(equity['sortino_ratio']), 2),
+            'calmar_ratio': round(float(equity['calmar_ratio']), 2),
+            'max_drawdown_pct': round(float(equity['max_drawdown']), 2),
+            'avg_drawdown_pct': round(float(equity['avg_drawdown']), 2),
+            'max_drawdown_duration': int(equity['drawdown_duration']),
+            'ulcer_index': round(float(equity['ulcer_index']), 2),
+            'recovery_factor': round(float(trades['recovery_factor']), 2),
+            'num_trades': int(trades['num_trades']),
+            'num_wins': int(trades['num_wins']),
+            'num_losses': int(trades['num_losses']),
+            'win_rate_pct': round(float(trades['win_rate']), 2),
+            'avg_win': round(float(trades['avg_win']), 2),
+            'avg_loss': round(float(trades['avg_loss']), 2),
+            'max_win': round(float(trades['max_win']), 2),
+            'max_loss': round(float(trades['max_loss']), 2),
+            'profit_factor': round(float(trades['profit_factor']), 2),
+            'payoff_ratio': round(float(trades['payoff_ratio']), 2),
+            'expectancy': round(float(trades['expectancy']), 2),
+            'avg_trade_duration_days': round(float(trades['avg_trade_duration']), 2),
+            'max_trade_duration_days': int(trades['max_trade_duration']),
+            'min_trade_duration_days': int(trades['min_trade_duration']),
+            'max_consecutive_wins': int(trades['max_consecutive_wins']),
+            'max_consecutive_losses': int(trades['max_consecutive_losses']),
+            'kelly_pct': round(float(trades['kelly_pct']), 2),
+            'exposure_time_pct': round(float(trades['exposure_time']), 2)
+        }
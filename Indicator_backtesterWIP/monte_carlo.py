@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from data_generator import HistoricalDataGenerator
+from indicators import LazyIndicatorFrame
+from strategies import StrategyGenerator
+from backtest_engine import BacktestEngine
+from metrics import PerformanceMetrics
+
+class MonteCarloBacktester:
+    
+    DISTRIBUTION_METRICS = ['total_return_pct', 'sharpe_ratio', 'max_drawdown_pct', 'num_trades']
+    
+    def __init__(self, strategy_name, engine=None, generator=None, indicator_params=None,
+                 strategy_params=None):
+        self.strategy_name = strategy_name
+        self.strategy_func = StrategyGenerator.get_all_strategies()[strategy_name]
+        self.requirements = StrategyGenerator.get_strategy_requirements(strategy_name)
+        self.engine = engine or BacktestEngine()
+        self.generator = generator or HistoricalDataGenerator()
+        self.indicator_params = indicator_params or {}
+        self.strategy_params = strategy_params or {}
+    
+    def _path_signals(self, paths, date_range):
+        num_paths, n = paths.shape[:2]
+        close = np.ascontiguousarray(paths[:, :, 3].T)
+        slippage = np.full((n, num_paths), self.engine.base_slippage)
+        entry = np.zeros((n, num_paths), dtype=bool)
+        exit = np.zeros((n, num_paths), dtype=bool)
+        active = np.zeros((n, num_paths), dtype=bool)
+        last_rows = np.full(num_paths, n - 1)
+        
+        for j in range(num_paths):
+            data = self.generator.path_frame(paths, date_range, j)
+            frame = LazyIndicatorFrame(data, **self.indicator_params).trimmed(self.requirements)
+            if len(frame) == 0:
+                continue
+            
+            signals = self.strategy_func(frame, **self.strategy_params)
+            rows = date_range.get_indexer(frame.index)
+            
+            slippage[rows, j] = self.engine._slippage_array(frame)
+            entry[rows, j] = signals['entry'].to_numpy(dtype=bool)
+            exit[rows, j] = signals['exit'].to_numpy(dtype=bool)
+            active[rows, j] = True
+            last_rows[j] = rows[-1]
+        
+        return close, slippage, entry, exit, active, last_rows
+    
+    def _distribution(self, close, capital_curve, position_curve, active, trade_rows):
+        position_value = np.where(position_curve > 0, position_curve * close, 0.0)
+        equity = np.where(active, capital_curve + position_value, np.nan)
+        stats = PerformanceMetrics.equity_stats(equity, self.engine.initial_capital)
+        
+        distribution = pd.DataFrame({
+            'total_return_pct': [round(float(value), 2) for value in stats['total_return']],
+            'sharpe_ratio': [round(float(value), 2) for value in stats['sharpe_ratio']],
+            'max_drawdown_pct': [round(float(value), 2) for value in stats['max_drawdown']],
+            'num_trades': [trades.num_sells for trades in trade_rows]
+        })
+        distribution.index.name = 'path'
+        
+        return distribution
+    
+    def run(self, n_paths=1000, start_date='2020-01-01', end_date='2024-12-31', initial_price=300,
+            freq='B', seed=None, percentiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        paths, date_range = self.generator.generate_paths(
+            n_paths, start_date, end_date, initial_price, freq, seed
+        )
+        close, slippage, entry, exit, active, last_rows = self._path_signals(paths, date_range)
+        
+        capital_curve, position_curve, trade_rows = self.engine._simulate_long_only(
+            close, slippage, entry, exit, last_rows
+        )
+        distribution = self._distribution(close, capital_curve, position_curve, active, trade_rows)
+        
+        return {
+            'distribution': distribution,
+            'summary': distribution[self.DISTRIBUTION_METRICS].describe(percentiles=list(percentiles)).T
+        }
@@ -0,0 +1,189 @@
+import os
+import itertools
+import random
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from indicators import LazyIndicatorFrame
+from strategies import StrategyGenerator
+from backtest_engine import BacktestEngine
+from indicator_cache import IndicatorCache
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_WORKER_DATA = None
+_WORKER_BLOCKS = None
+_WORKER_CACHE = None
+
+class SharedOHLCV:
+    
+    def __init__(self, data):
+        values = data[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        index = data.index.values.astype('datetime64[ns]').view(np.int64)
+        
+        self.values_block = self._copy_to_shared(values)
+        self.index_block = self._copy_to_shared(index)
+        self.spec = {
+            'values': self.values_block.name,
+            'index': self.index_block.name,
+            'rows': len(data),
+            'symbol': data['Symbol'].iloc[0] if 'Symbol' in data.columns and len(data) > 0 else None
+        }
+    
+    @staticmethod
+    def _copy_to_shared(array):
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        return block
+    
+    @staticmethod
+    def _attach(name):
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            return shared_memory.SharedMemory(name=name)
+    
+    @staticmethod
+    def attach(spec):
+        values_block = SharedOHLCV._attach(spec['values'])
+        index_block = SharedOHLCV._attach(spec['index'])
+        rows = spec['rows']
+        
+        values = np.ndarray((rows, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=values_block.buf)
+        index = np.ndarray((rows,), dtype=np.int64, buffer=index_block.buf)
+        
+        df = pd.DataFrame(values, columns=OHLCV_COLUMNS, index=pd.DatetimeIndex(index.view('datetime64[ns]'), name='Date'))
+        df['Volume'] = df['Volume'].astype(np.int64)
+        if spec['symbol'] is not None:
+            df['Symbol'] = spec['symbol']
+        
+        return df, (values_block, index_block)
+    
+    def close(self):
+        for block in (self.values_block, self.index_block):
+            block.close()
+            block.unlink()
+
+def _init_worker(spec, cache_dir=None):
+    global _WORKER_DATA, _WORKER_BLOCKS, _WORKER_CACHE
+    _WORKER_DATA, _WORKER_BLOCKS = SharedOHLCV.attach(spec)
+    _WORKER_CACHE = IndicatorCache(cache_dir=cache_dir)
+
+def _run_parameter_set(strategy_name, indicator_params, strategy_param_sets, initial_capital, commission):
+    frame = LazyIndicatorFrame(_WORKER_DATA, calculator=_WORKER_CACHE, **indicator_params)
+    data = frame.trimmed(StrategyGenerator.get_strategy_requirements(strategy_name))
+    strategy_func = StrategyGenerator.get_all_strategies()[strategy_name]
+    
+    signals = {
+        i: strategy_func(data, **params)
+        for i, params in enumerate(strategy_param_sets)
+    }
+    engine = BacktestEngine(initial_capital=initial_capital, commission=commission)
+    results = engine.run_backtest_batch(data, signals)
+    
+    data_info = {
+        'symbol': data['Symbol'].iloc[0] if 'Symbol' in data.columns and len(data) > 0 else None,
+        'start_date': str(data.index[0].date()) if len(data) > 0 else None,
+        'end_date': str(data.index[-1].date()) if len(data) > 0 else None,
+        'num_days': len(data)
+    }
+    
+    return [
+        (indicator_params, params, results[i]['metrics'], data_info)
+        for i, params in enumerate(strategy_param_sets)
+    ]
+
+class ParameterOptimizer:
+    
+    def __init__(self, data, initial_capital=10000, commission=0.001, max_workers=None, logger=None,
+                 cache_dir=None):
+        self.data = data
+        self.cache_dir = cache_dir
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.logger = logger
+    
+    @staticmethod
+    def expand_grid(indicator_grid, strategy_grid, n_iter=None, seed=None):
+        keys = list(indicator_grid) + list(strategy_grid)
+        values = [list(v) for v in indicator_grid.values()] + [list(v) for v in strategy_grid.values()]
+        total = int(np.prod([len(v) for v in values])) if values else 1
+        
+        if n_iter is None or n_iter >= total:
+            combos = itertools.product(*values)
+        else:
+            sizes = [len(v) for v in values]
+            picks = random.Random(seed).sample(range(total), n_iter)
+            combos = []
+            for pick in picks:
+                combo = []
+                for options, size in zip(reversed(values), reversed(sizes)):
+                    pick, position = divmod(pick, size)
+                    combo.append(options[position])
+                combos.append(tuple(reversed(combo)))
+        
+        num_indicator_keys = len(indicator_grid)
+        grouped = {}
+        for combo in combos:
+            indicator_params = tuple(zip(keys[:num_indicator_keys], combo[:num_indicator_keys]))
+            strategy_params = dict(zip(keys[num_indicator_keys:], combo[num_indicator_keys:]))
+            grouped.setdefault(indicator_params, []).append(strategy_params)
+        
+        return [(dict(k), v) for k, v in grouped.items()]
+    
+    @staticmethod
+    def format_label(strategy_name, indicator_params, strategy_params):
+        params = {**indicator_params, **strategy_params}
+        if not params:
+            return strategy_name
+        return f"{strategy_name}({', '.join(f'{k}={v}' for k, v in params.items())})"
+    
+    def optimize(self, strategy_name, indicator_grid=None, strategy_grid=None, n_iter=None,
+                 metric='sharpe_ratio', seed=None, top_n=10):
+        default_indicator_grid, default_strategy_grid = StrategyGenerator.get_parameter_grid(strategy_name)
+        indicator_grid = default_indicator_grid if indicator_grid is None else indicator_grid
+        strategy_grid = default_strategy_grid if strategy_grid is None else strategy_grid
+        
+        tasks = self.expand_grid(indicator_grid, strategy_grid, n_iter, seed)
+        num_runs = sum(len(param_sets) for _, param_sets in tasks)
+        print(f"Optimizing {strategy_name}: {num_runs} parameter sets across {self.max_workers} workers...")
+        
+        shared = SharedOHLCV(self.data)
+        rows = []
+        session = self.logger.session() if self.logger is not None else nullcontext()
+        try:
+            with session, ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                              initargs=(shared.spec, self.cache_dir)) as executor:
+                futures = [
+                    executor.submit(_run_parameter_set, strategy_name, indicator_params, param_sets,
+                                    self.initial_capital, self.commission)
+                    for indicator_params, param_sets in tasks
+                ]
+                
+                best = None
+                for future in as_completed(futures):
+                    for indicator_params, strategy_params, metrics, data_info in future.result():
+                        label = self.format_label(strategy_name, indicator_params, strategy_params)
+                        rows.append({'label': label, **indicator_params, **strategy_params, **metrics})
+                        
+                        if self.logger is not None:
+                            info = dict(data_info)
+                            info['params'] = {**indicator_params, **strategy_params}
+                            self.logger.save_result(strategy_name, metrics, info, run_type='optimization')
+                        
+                        if best is None or metrics[metric] > best[1]:
+                            best = (label, metrics[metric])
+                    
+                    print(f"  {len(rows)}/{num_runs} done - best {metric}: {best[1]:.2f} ({best[0]})")
+        finally:
+            shared.close()
+        
+        ranking = pd.DataFrame(rows)
+        if ranking.empty:
+            return ranking
+        
+        ranking = ranking.sort_values(metric, ascending=False).reset_index(drop=True)
+        return ranking.head(top_n) if top_n else ranking
@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+from backtest_engine import BacktestEngine
+from indicators import LazyIndicatorFrame
+from strategies import StrategyGenerator
+from metrics import PerformanceMetrics
+from data_generator import HistoricalDataGenerator
+
+class PortfolioEngine(BacktestEngine):
+    
+    def __init__(self, initial_capital=100000, commission=0.001, base_slippage=0.0005,
+                 max_positions=10, position_size=None):
+        super().__init__(initial_capital, commission, base_slippage)
+        self.max_positions = max_positions
+        self.position_size = position_size if position_size is not None else 1.0 / max_positions
+    
+    def _wide_fields(self, panel, symbols):
+        fields = [field for field in HistoricalDataGenerator.OHLCV_COLUMNS if field in panel.columns.get_level_values(1)]
+        values = np.concatenate(
+            [panel.xs(field, axis=1, level=1)[symbols].to_numpy(dtype=np.float64) for field in fields], axis=1
+        )
+        return pd.DataFrame(values, index=panel.index, columns=pd.MultiIndex.from_product([fields, symbols]))
+    
+    def prepare_signals(self, panel, strategy_name, indicator_params=None, strategy_params=None):
+        strategy_func = StrategyGenerator.get_all_strategies()[strategy_name]
+        requirements = list(StrategyGenerator.get_strategy_requirements(strategy_name))
+        symbols = list(panel.columns.get_level_values(0).unique())
+        n, num_symbols = len(panel.index), len(symbols)
+        
+        frame = LazyIndicatorFrame(self._wide_fields(panel, symbols), **(indicator_params or {}))
+        columns = list(dict.fromkeys(['Close'] + requirements + ['TEMP_ATR']))
+        wide = {column: frame[column].to_numpy(dtype=np.float64) for column in columns}
+        
+        close = wide['Close']
+        valid = ~np.isnan(close)
+        for column in requirements:
+            valid &= ~np.isnan(wide[column])
+        slippage = np.where(valid, self._volatility_slippage(close, wide['TEMP_ATR']), self.base_slippage)
+        
+        # Stack every symbol's trimmed rows into one long frame so each strategy runs once.
+        # NaN gap rows between symbols stand in for the missing history a shift() sees at
+        # the start of a single-symbol frame, so the gap only needs to cover the rule's lag.
+        gap = StrategyGenerator.RULES[strategy_name].max_lag()
+        keep = np.concatenate([np.ones((gap, num_symbols), dtype=bool), valid]).ravel(order='F')
+        padded_rows = np.flatnonzero(keep)
+        rows = padded_rows % (n + gap) - gap
+        cols = padded_rows // (n + gap)
+        is_bar = rows >= 0
+        
+        stacked = {}
+        for column in columns:
+            padded = np.concatenate([np.full((gap, num_symbols), np.nan), wide[column]])
+            stacked[column] = padded.ravel(order='F')[padded_rows]
+        
+        signals = strategy_func(pd.DataFrame(stacked, copy=False), **(strategy_params or {}))
+        entry = np.zeros((n, num_symbols), dtype=bool)
+        exit = np.zeros((n, num_symbols), dtype=bool)
+        entry[rows[is_bar], cols[is_bar]] = signals['entry'].to_numpy(dtype=bool)[is_bar]
+        exit[rows[is_bar], cols[is_bar]] = signals['exit'].to_numpy(dtype=bool)[is_bar]
+        
+        return close, slippage, entry, exit, symbols
+    
+    @staticmethod
+    def _last_valid_close(close):
+        priced = np.isfinite(close) & (close > 0)
+        last_row = np.where(priced, np.arange(len(close))[:, None], -1)
+        np.maximum.accumulate(last_row, axis=0, out=last_row)
+        marked = close[np.maximum(last_row, 0), np.arange(close.shape[1])]
+        return np.where(last_row >= 0, marked, np.nan)
+    
+    def _simulate_portfolio(self, close, slippage, entry, exit, priority=None):
+        n, num_symbols = close.shape
+        marked = self._last_valid_close(close)
+        
+        cash = float(self.initial_capital)
+        position = np.zeros(num_symbols, dtype=np.int64)
+        entry_price = np.zeros(num_symbols, dtype=np.float64)
+        entry_row = np.zeros(num_symbols, dtype=np.int64)
+        
+        cash_states = np.empty(n + 1, dtype=np.float64)
+        position_states = np.zeros((n + 1, num_symbols), dtype=np.int64)
+        cash_states[0] = cash
+        changed = np.zeros(n + 1, dtype=bool)
+        events = []
+        
+        priced = np.isfinite(close) & (close > 0)
+        tradable = entry & priced
+        exit = exit & priced
+        for i in np.flatnonzero((tradable | exit).any(axis=1)):
+            # Like the single-symbol engine, a symbol sold on this bar cannot be re-entered on it.
+            flat = position == 0
+            sell = np.flatnonzero(exit[i] & ~flat)
+            if len(sell) > 0:
+                execution_price = close[i, sell] * (1 - slippage[i, sell])
+                shares = position[sell]
+                proceeds = shares * execution_price * (1 - self.commission)
+                pnl = proceeds - (shares * entry_price[sell] * (1 + self.commission))
+                pnl_pct = ((execution_price / entry_price[sell]) - 1) * 100
+                
+                cash += proceeds.sum()
+                position[sell] = 0
+                events.append((i, sell, False, execution_price, shares, proceeds, pnl, pnl_pct, entry_row[sell]))
+            
+            buy = np.flatnonzero(tradable[i] & flat)
+            free_slots = self.max_positions - np.count_nonzero(position)
+            if len(buy) > 0 and free_slots > 0:
+                if priority is not None:
+                    buy = buy[np.argsort(-priority[i, buy], kind='stable')]
+                buy = buy[:free_slots]
+                
+                held = position > 0
+                equity = cash + (position[held] * marked[i, held]).sum()
+                budget = min(equity * self.position_size, cash / len(buy))
+                
+                execution_price = close[i, buy] * (1 + slippage[i, buy])
+                shares = np.trunc(budget / (execution_price * (1 + self.commission))).astype(np.int64)
+                filled = shares > 0
+                buy = buy[filled]
+                execution_price = execution_price[filled]
+                shares = shares[filled]
+                
+                cost = shares * execution_price * (1 + self.commission)
+                cash -= cost.sum()
+                position[buy] = shares
+                entry_price[buy] = execution_price
+                entry_row[buy] = i
+                if len(buy) > 0:
+                    events.append((i, buy, True, execution_price, shares, cost, None, None, None))
+            
+            cash_states[i + 1] = cash
+            position_states[i + 1] = position
+            changed[i + 1] = True
+        
+        last_change = np.where(changed, np.arange(n + 1), 0)
+        np.maximum.accumulate(last_change, out=last_change)
+        cash_curve = cash_states[last_change][1:]
+        position_curve = position_states[last_change][1:]
+        
+        held = np.flatnonzero(position > 0)
+        if len(held) > 0 and n > 0:
+            execution_price = marked[-1, held] * (1 - slippage[-1, held])
+            shares = position[held]
+            proceeds = shares * execution_price * (1 - self.commission)
+            events.append((
+                n - 1, held, False, execution_price, shares, proceeds,
+                proceeds - (shares * entry_price[held] * (1 + self.commission)),
+                ((execution_price / entry_price[held]) - 1) * 100,
+                entry_row[held]
+            ))
+        
+        return cash_curve, position_curve, marked, events
+    
+    def _trade_frame(self, index, symbol_names, events):
+        if not events:
+            return pd.DataFrame(), np.array([], dtype=np.float64), np.array([], dtype=np.int64)
+        
+        rows = np.concatenate([np.full(len(event[1]), event[0]) for event in events])
+        columns = np.concatenate([event[1] for event in events])
+        is_buy = np.concatenate([np.full(len(event[1]), event[2]) for event in events])
+        nan = [np.full(len(event[1]), np.nan) for event in events]
+        
+        trades = pd.DataFrame({
+            'date': index[rows],
+            'symbol': np.asarray(symbol_names, dtype=object)[columns],
+            'type': np.where(is_buy, 'BUY', 'SELL'),
+            'price': np.concatenate([event[3] for event in events]),
+            'shares': np.concatenate([event[4] for event in events]),
+            'value': np.concatenate([event[5] for event in events]),
+            'pnl': np.concatenate([nan[k] if event[2] else event[6] for k, event in enumerate(events)]),
+            'pnl_pct': np.concatenate([nan[k] if event[2] else event[7] for k, event in enumerate(events)])
+        })
+        
+        sells = [event for event in events if not event[2]]
+        if sells:
+            sell_rows = np.concatenate([np.full(len(event[1]), event[0]) for event in sells])
+            open_rows = np.concatenate([event[8] for event in sells])
+            dates = index.values
+            durations = (dates[sell_rows] - dates[open_rows]).astype('timedelta64[D]').astype(int)
+            pnl = np.concatenate([event[6] for event in sells])
+        else:
+            durations = np.array([], dtype=np.int64)
+            pnl = np.array([], dtype=np.float64)
+        
+        return trades, pnl, durations
+    
+    def run(self, close, entry, exit, index, symbols=None, slippage=None, priority=None):
+        close = np.asarray(close, dtype=np.float64)
+        n, num_symbols = close.shape
+        symbols = list(symbols) if symbols is not None else list(range(num_symbols))
+        
+        if n == 0:
+            return {
+                'metrics': self._empty_metrics(),
+                'trades': pd.DataFrame(),
+                'equity_curve': pd.DataFrame(),
+                'symbol_summary': pd.DataFrame()
+            }
+        
+        if slippage is None:
+            slippage = np.full((n, num_symbols), self.base_slippage)
+        
+        cash_curve, position_curve, marked, events = self._simulate_portfolio(
+            close, slippage, np.asarray(entry, dtype=bool), np.asarray(exit, dtype=bool), priority
+        )
+        
+        position_value = np.where(position_curve > 0, position_curve * np.nan_to_num(marked), 0.0)
+        invested = position_value.sum(axis=1)
+        equity = cash_curve + invested
+        
+        trades, pnl, durations = self._trade_frame(index, symbols, events)
+        equity_stats = PerformanceMetrics.equity_stats(equity, self.initial_capital)
+        trade_stats = PerformanceMetrics.trade_stats(
+            pnl, durations, equity_stats['total_return'], equity_stats['max_drawdown'], equity_stats['total_days']
+        )
+        trade_stats['exposure_time'] = np.count_nonzero(invested > 0) / n * 100
+        metrics = PerformanceMetrics.summarize(equity_stats, trade_stats)
+        
+        if trades.empty:
+            symbol_summary = pd.DataFrame()
+        else:
+            sells = trades[trades['type'] == 'SELL']
+            symbol_summary = sells.groupby('symbol').agg(
+                num_trades=('pnl', 'size'),
+                total_pnl=('pnl', 'sum'),
+                win_rate_pct=('pnl', lambda values: (values > 0).mean() * 100)
+            ).sort_values('total_pnl', ascending=False)
+        
+        return {
+            'metrics': metrics,
+            'trades': trades,
+            'equity_curve': pd.DataFrame({
+                'date': index,
+                'equity': equity,
+                'cash': cash_curve,
+                'invested': invested,
+                'num_positions': np.count_nonzero(position_curve, axis=1)
+            }, copy=False),
+            'symbol_summary': symbol_summary
+        }
+    
+    def run_panel(self, panel, strategy_name, indicator_params=None, strategy_params=None):
+        close, slippage, entry, exit, symbols = self.prepare_signals(
+            panel, strategy_name, indicator_params, strategy_params
+        )
+        return self.run(close, entry, exit, panel.index, symbols, slippage)
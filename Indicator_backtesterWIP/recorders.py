@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from metrics import PerformanceMetrics
+
+class TradeRecord:
+    
+    __slots__ = ('row', 'type', 'price', 'shares', 'value', 'pnl', 'pnl_pct')
+    
+    def __init__(self, row, trade_type, price, shares, value, pnl=np.nan, pnl_pct=np.nan):
+        self.row = row
+        self.type = trade_type
+        self.price = price
+        self.shares = shares
+        self.value = value
+        self.pnl = pnl
+        self.pnl_pct = pnl_pct
+    
+    def __iter__(self):
+        return iter((self.row, self.type, self.price, self.shares, self.value, self.pnl, self.pnl_pct))
+
+class TradeRecorder:
+    
+    __slots__ = ('size', 'rows', 'is_buy', 'price', 'shares', 'value', 'pnl', 'pnl_pct')
+    
+    def __init__(self, capacity=64):
+        self.size = 0
+        self.rows = np.empty(capacity, dtype=np.int64)
+        self.is_buy = np.empty(capacity, dtype=bool)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.shares = np.empty(capacity, dtype=np.int64)
+        self.value = np.empty(capacity, dtype=np.float64)
+        self.pnl = np.empty(capacity, dtype=np.float64)
+        self.pnl_pct = np.empty(capacity, dtype=np.float64)
+    
+    @classmethod
+    def from_columns(cls, rows, is_buy, price, shares, value, pnl, pnl_pct):
+        recorder = cls(0)
+        recorder.size = len(rows)
+        recorder.rows, recorder.is_buy, recorder.price = rows, is_buy, price
+        recorder.shares, recorder.value, recorder.pnl, recorder.pnl_pct = shares, value, pnl, pnl_pct
+        return recorder
+    
+    def _grow(self):
+        capacity = max(2 * len(self.rows), 1)
+        for name in ('rows', 'is_buy', 'price', 'shares', 'value', 'pnl', 'pnl_pct'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def record(self, row, trade_type, price, shares, value, pnl=np.nan, pnl_pct=np.nan):
+        if self.size == len(self.rows):
+            self._grow()
+        
+        i = self.size
+        self.rows[i] = row
+        self.is_buy[i] = trade_type == 'BUY'
+        self.price[i] = price
+        self.shares[i] = shares
+        self.value[i] = value
+        self.pnl[i] = pnl
+        self.pnl_pct[i] = pnl_pct
+        self.size += 1
+    
+    def __len__(self):
+        return self.size
+    
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError('trade index out of range')
+        
+        return TradeRecord(
+            int(self.rows[i]), 'BUY' if self.is_buy[i] else 'SELL', float(self.price[i]),
+            int(self.shares[i]), float(self.value[i]), float(self.pnl[i]), float(self.pnl_pct[i])
+        )
+    
+    def __iter__(self):
+        for i in range(self.size):
+            yield tuple(self[i])
+    
+    @property
+    def num_sells(self):
+        return int(self.size - self.is_buy[:self.size].sum())
+    
+    def sell_pnl(self):
+        return self.pnl[:self.size][~self.is_buy[:self.size]]
+    
+    def durations(self, index):
+        rows = self.rows[:self.size]
+        is_buy = self.is_buy[:self.size]
+        dates = index.values
+        return PerformanceMetrics.trade_durations(dates[rows[is_buy]], dates[rows[~is_buy]])
+    
+    def to_frame(self, index):
+        if self.size == 0:
+            return pd.DataFrame()
+        
+        is_buy = self.is_buy[:self.size]
+        columns = {
+            'date': index[self.rows[:self.size]],
+            'type': np.where(is_buy, 'BUY', 'SELL'),
+            'price': self.price[:self.size],
+            'shares': self.shares[:self.size],
+            'value': self.value[:self.size]
+        }
+        if not is_buy.all():
+            columns['pnl'] = self.pnl[:self.size]
+            columns['pnl_pct'] = self.pnl_pct[:self.size]
+        
+        return pd.DataFrame(columns, copy=False)
+
+class EquityRecorder:
+    
+    __slots__ = ('size', 'equity', 'capital', 'position_value')
+    
+    def __init__(self, capacity):
+        self.size = 0
+        self.equity = np.empty(capacity, dtype=np.float64)
+        self.capital = np.empty(capacity, dtype=np.float64)
+        self.position_value = np.empty(capacity, dtype=np.float64)
+    
+    def record(self, equity, capital, position_value):
+        i = self.size
+        self.equity[i] = equity
+        self.capital[i] = capital
+        self.position_value[i] = position_value
+        self.size += 1
+    
+    @staticmethod
+    def frame(index, equity, capital, position_value):
+        return pd.DataFrame({
+            'date': index,
+            'equity': equity,
+            'capital': capital,
+            'position_value': position_value
+        }, copy=False)
+    
+    def to_frame(self, index):
+        return self.frame(
+            index[:self.size], self.equity[:self.size], self.capital[:self.size],
+            self.position_value[:self.size]
+        )
@@ -1,53 +1,215 @@
 import json
 import os
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 import pandas as pd
 
 class ResultsLogger:
     
-    def __init__(self, log_file='backtest_results.json'):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            strategy_name TEXT NOT NULL,
+            metrics TEXT NOT NULL,
+            data_info TEXT NOT NULL,
+            run_type TEXT NOT NULL DEFAULT 'backtest'
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_strategy ON results (strategy_name, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results (timestamp);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    
+    def __init__(self, log_file='backtest_results.db', legacy_file='backtest_results.json'):
         self.log_file = log_file
+        self.legacy_file = legacy_file
+        self._connection = None
+        self._buffer = None
+        self._flush_every = None
+        self._verbose = True
+        self._cache = None
+        self._cache_signature = None
         self._ensure_log_exists()
     
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.log_file)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+        return self._connection
+    
     def _ensure_log_exists(self):
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, 'w') as f:
-                json.dump([], f)
+        connection = self._connect()
+        with connection:
+            connection.executescript(self.SCHEMA)
+            # Logs written before run types existed only hold plain backtests.
+            columns = [row[1] for row in connection.execute('PRAGMA table_info(results)')]
+            if 'run_type' not in columns:
+                connection.execute("ALTER TABLE results ADD COLUMN run_type TEXT NOT NULL DEFAULT 'backtest'")
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_results_run_type ON results (run_type, strategy_name, timestamp)'
+            )
+        self._migrate_legacy_log()
+    
+    def _migrate_legacy_log(self):
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        
+        connection = self._connect()
+        marker = f"migrated:{os.path.abspath(self.legacy_file)}"
+        if connection.execute('SELECT 1 FROM meta WHERE key = ?', (marker,)).fetchone():
+            return
+        
+        try:
+            with open(self.legacy_file, 'r') as f:
+                legacy_results = json.load(f)
+        except json.JSONDecodeError:
+            legacy_results = []
+        
+        with connection:
+            self._insert(connection, legacy_results)
+            connection.execute(
+                'INSERT INTO meta (key, value) VALUES (?, ?)',
+                (marker, datetime.now().isoformat())
+            )
+        
+        if legacy_results:
+            print(f"✓ Migrated {len(legacy_results)} results from {self.legacy_file}")
+    
+    @staticmethod
+    def _insert(connection, results):
+        connection.executemany(
+            'INSERT INTO results (timestamp, strategy_name, metrics, data_info, run_type) VALUES (?, ?, ?, ?, ?)',
+            [
+                (
+                    result['timestamp'],
+                    result['strategy_name'],
+                    json.dumps(result['metrics']),
+                    json.dumps(result.get('data_info') or {}),
+                    result.get('run_type', 'backtest')
+                )
+                for result in results
+            ]
+        )
+    
+    def _query(self, where='', params=()):
+        rows = self._connect().execute(
+            f'SELECT timestamp, strategy_name, metrics, data_info, run_type FROM results {where} ORDER BY id',
+            params
+        )
+        return [
+            {
+                'timestamp': timestamp,
+                'strategy_name': strategy_name,
+                'metrics': json.loads(metrics),
+                'data_info': json.loads(data_info),
+                'run_type': run_type
+            }
+            for timestamp, strategy_name, metrics, data_info, run_type in rows
+        ]
     
-    def save_result(self, strategy_name, metrics, data_info=None):
-        results = self.load_all_results()
+    def _signature(self):
+        signature = []
+        for path in (self.log_file, f"{self.log_file}-wal"):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def _cached_results(self):
+        signature = self._signature()
+        if self._cache is None or signature != self._cache_signature:
+            self._cache = self._query()
+            self._cache_signature = signature
+        return self._cache
+    
+    def _write(self, results):
+        cache_current = self._cache is not None and self._signature() == self._cache_signature
+        
+        connection = self._connect()
+        with connection:
+            self._insert(connection, results)
         
+        if cache_current:
+            self._cache.extend(results)
+            self._cache_signature = self._signature()
+        else:
+            self._cache = None
+    
+    @contextmanager
+    def session(self, flush_every=100, verbose=True):
+        if self._buffer is not None:
+            yield self
+            return
+        
+        self._buffer = []
+        self._flush_every = flush_every
+        self._verbose = verbose
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._buffer = None
+                self._flush_every = None
+                self._verbose = True
+    
+    def flush(self):
+        if not self._buffer:
+            return
+        
+        pending = self._buffer
+        self._write(pending)
+        self._buffer = []
+        if self._verbose:
+            print(f"✓ {len(pending)} results saved")
+    
+    def save_result(self, strategy_name, metrics, data_info=None, run_type='backtest'):
         result = {
             'timestamp': datetime.now().isoformat(),
             'strategy_name': strategy_name,
             'metrics': metrics,
-            'data_info': data_info or {}
+            'data_info': data_info or {},
+            'run_type': run_type
         }
         
-        results.append(result)
-        
-        with open(self.log_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        if self._buffer is not None:
+            self._buffer.append(result)
+            if self._flush_every and len(self._buffer) >= self._flush_every:
+                self.flush()
+            return
         
+        self._write([result])
         print(f"✓ Results saved for: {strategy_name}")
     
     def load_all_results(self):
-        try:
-            with open(self.log_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self._cached_results() + (self._buffer or [])
+    
+    def _pending(self, run_type):
+        return [r for r in self._buffer or [] if run_type is None or r['run_type'] == run_type]
     
-    def get_results_by_strategy(self, strategy_name):
-        all_results = self.load_all_results()
-        return [r for r in all_results if r['strategy_name'] == strategy_name]
+    def get_results_by_strategy(self, strategy_name, run_type='backtest'):
+        pending = [r for r in self._pending(run_type) if r['strategy_name'] == strategy_name]
+        if run_type is None:
+            return self._query('WHERE strategy_name = ?', (strategy_name,)) + pending
+        return self._query('WHERE run_type = ? AND strategy_name = ?', (run_type, strategy_name)) + pending
     
-    def get_unique_strategies(self):
-        all_results = self.load_all_results()
-        return list(set(r['strategy_name'] for r in all_results))
+    def get_unique_strategies(self, run_type='backtest'):
+        if run_type is None:
+            rows = self._connect().execute('SELECT DISTINCT strategy_name FROM results')
+        else:
+            rows = self._connect().execute('SELECT DISTINCT strategy_name FROM results WHERE run_type = ?', (run_type,))
+        names = [strategy_name for (strategy_name,) in rows]
+        return list(dict.fromkeys(names + [r['strategy_name'] for r in self._pending(run_type)]))
     
-    def get_summary_dataframe(self):
-        all_results = self.load_all_results()
+    def get_summary_dataframe(self, run_type='backtest'):
+        all_results = [r for r in self.load_all_results() if run_type is None or r['run_type'] == run_type]
         
         if not all_results:
             return pd.DataFrame()
@@ -57,6 +219,7 @@ class ResultsLogger:
             row = {
                 'timestamp': result['timestamp'],
                 'strategy': result['strategy_name'],
+                'run_type': result['run_type']
             }
             row.update(result['metrics'])
             rows.append(row)
@@ -65,21 +228,32 @@ class ResultsLogger:
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         return df
     
-    def compare_strategies(self, metric='total_return_pct'):
-        df = self.get_summary_dataframe()
+    def compare_strategies(self, metric='total_return_pct', run_type='backtest'):
+        if run_type is None:
+            rows = self._connect().execute(
+                'SELECT strategy_name, json_extract(metrics, ?) FROM results ORDER BY id',
+                (f'$.{metric}',)
+            ).fetchall()
+        else:
+            rows = self._connect().execute(
+                'SELECT strategy_name, json_extract(metrics, ?) FROM results WHERE run_type = ? ORDER BY id',
+                (f'$.{metric}', run_type)
+            ).fetchall()
+        rows += [(r['strategy_name'], r['metrics'].get(metric)) for r in self._pending(run_type)]
         
-        if df.empty:
+        if not rows:
             print("No results to compare yet.")
             return pd.DataFrame()
         
+        df = pd.DataFrame(rows, columns=['strategy', metric])
         summary = df.groupby('strategy')[metric].agg(['mean', 'std', 'count', 'min', 'max'])
         summary = summary.sort_values('mean', ascending=False)
         summary.columns = ['avg', 'std_dev', 'num_tests', 'min', 'max']
         
         return summary
     
-    def get_best_strategy(self, metric='total_return_pct', min_tests=1):
-        comparison = self.compare_strategies(metric)
+    def get_best_strategy(self, metric='total_return_pct', min_tests=1, run_type='backtest'):
+        comparison = self.compare_strategies(metric, run_type)
         
         if comparison.empty:
             return None, None
@@ -95,14 +269,23 @@ class ResultsLogger:
         return best_strategy, best_value
     
     def clear_results(self):
-        with open(self.log_file, 'w') as f:
-            json.dump([], f)
+        connection = self._connect()
+        with connection:
+            connection.execute('DELETE FROM results')
+        if self._buffer is not None:
+            self._buffer = []
+        self._cache = None
         print("All results cleared.")
     
     def export_to_csv(self, filename='backtest_results.csv'):
-        df = self.get_summary_dataframe()
+        df = self.get_summary_dataframe(run_type=None)
         if not df.empty:
             df.to_csv(filename, index=False)
             print(f"Results exported to {filename}")
         else:
             print("No results to export.")
+    
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
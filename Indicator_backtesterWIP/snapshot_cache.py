@@ -0,0 +1,124 @@
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import data_generator
+import indicators
+import kernels
+from indicators import LazyIndicatorFrame
+
+class SnapshotCache:
+    
+    # Source files whose code shapes a snapshot; editing any of them changes every key.
+    SOURCE_MODULES = (data_generator, indicators, kernels)
+    
+    DEFAULT_ROOT = os.path.join('data_cache', 'snapshots')
+    
+    _code_version = None
+    
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+    
+    @classmethod
+    def code_version(cls):
+        if cls._code_version is None:
+            digest = hashlib.blake2b(digest_size=8)
+            for module in cls.SOURCE_MODULES:
+                with open(module.__file__, 'rb') as f:
+                    digest.update(f.read())
+            cls._code_version = digest.hexdigest()
+        return cls._code_version
+    
+    @classmethod
+    def key(cls, generator_params, indicator_params):
+        payload = json.dumps(
+            {'generator': generator_params, 'indicators': indicator_params, 'code': cls.code_version()},
+            sort_keys=True, default=str
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def _path(self, key, name=None):
+        directory = os.path.join(self.root, key)
+        return directory if name is None else os.path.join(directory, f"{name}.npy")
+    
+    def contains(self, key):
+        return os.path.exists(os.path.join(self._path(key), 'meta.json'))
+    
+    def save(self, key, data, indicator_frame, columns=None, meta=None):
+        columns = list(LazyIndicatorFrame.INDICATOR_COLUMNS if columns is None else columns)
+        
+        arrays = {'Date': data.index.values.astype('datetime64[ns]')}
+        constants = {}
+        for column in data.columns:
+            if pd.api.types.is_numeric_dtype(data[column]):
+                arrays[column] = data[column].to_numpy()
+            elif len(data) > 0 and data[column].nunique() == 1:
+                constants[column] = str(data[column].iloc[0])
+            else:
+                raise ValueError(f"Column {column} is neither numeric nor constant and cannot be snapshotted")
+        
+        indicator_values = {column: indicator_frame[column].to_numpy(dtype=np.float64) for column in columns}
+        
+        tmp_dir = f"{self._path(key)}.{os.getpid()}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        
+        for name, values in {**arrays, **indicator_values}.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), values)
+        
+        info = {
+            'key': key,
+            'rows': len(data),
+            'data_columns': list(data.columns),
+            'array_columns': list(arrays),
+            'constants': constants,
+            'indicator_columns': columns,
+            'created': datetime.now().isoformat(),
+            **(meta or {})
+        }
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(info, f, indent=2, default=str)
+        
+        # The directory only appears under its final name once complete; if another process
+        # won the race, its identical snapshot is kept.
+        try:
+            os.replace(tmp_dir, self._path(key))
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return info
+    
+    def load(self, key, mmap=True, indicator_params=None):
+        with open(os.path.join(self._path(key), 'meta.json'), 'r') as f:
+            info = json.load(f)
+        
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(self._path(key, name), mmap_mode=mode) for name in info['array_columns']}
+        index = pd.DatetimeIndex(arrays.pop('Date'), name='Date')
+        data = pd.DataFrame(arrays, index=index, copy=False)
+        for column, value in info['constants'].items():
+            data[column] = value
+        data = data[info['data_columns']]
+        
+        frame = LazyIndicatorFrame(data, **(indicator_params or {}))
+        frame.preload({
+            column: np.load(self._path(key, column), mmap_mode=mode) for column in info['indicator_columns']
+        })
+        return data, frame
+    
+    def get_or_build(self, generator_params, indicator_params, build):
+        key = self.key(generator_params, indicator_params)
+        if self.contains(key):
+            data, frame = self.load(key, indicator_params=indicator_params)
+            return data, frame, True
+        
+        data = build()
+        frame = LazyIndicatorFrame(data, **indicator_params)
+        self.save(key, data, frame, meta={'generator': generator_params, 'indicators': indicator_params})
+        return data, frame, False
+    
+    def clear(self):
+        for name in os.listdir(self.root):
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
@@ -1,99 +1,150 @@
+import numpy as np
 import pandas as pd
+from strategy_dsl import Rule, SignalGraph, col, param, crosses_above, crosses_below, all_of
+
+RSI = col('TEMP_RSI')
+MACD = col('TEMP_MACD')
+MACD_SIGNAL = col('TEMP_MACD_Signal')
+STOCH_K = col('TEMP_Stoch_K')
 
 class StrategyGenerator:
     
-    @staticmethod
-    def TEMP_strategy_rsi_only(data):
-        signals = pd.DataFrame(index=data.index)
-        signals['entry'] = (data['TEMP_RSI'] > 30) & (data['TEMP_RSI'].shift(1) <= 30)
-        signals['exit'] = (data['TEMP_RSI'] < 70) & (data['TEMP_RSI'].shift(1) >= 70)
-        return signals
-    
-    @staticmethod
-    def TEMP_strategy_macd_only(data):
-        signals = pd.DataFrame(index=data.index)
-        signals['entry'] = (data['TEMP_MACD'] > data['TEMP_MACD_Signal']) & \
-                          (data['TEMP_MACD'].shift(1) <= data['TEMP_MACD_Signal'].shift(1))
-        signals['exit'] = (data['TEMP_MACD'] < data['TEMP_MACD_Signal']) & \
-                         (data['TEMP_MACD'].shift(1) >= data['TEMP_MACD_Signal'].shift(1))
-        return signals
+    RULES = {
+        'TEMP_RSI_Only': Rule(
+            entry=crosses_above(RSI, param('oversold', 30)),
+            exit=crosses_below(RSI, param('overbought', 70)),
+            description='TEMPORARY - Uses: RSI (14)'
+        ),
+        'TEMP_MACD_Only': Rule(
+            entry=crosses_above(MACD, MACD_SIGNAL),
+            exit=crosses_below(MACD, MACD_SIGNAL),
+            description='TEMPORARY - Uses: MACD (12,26,9)'
+        ),
+        'TEMP_SMA_Crossover': Rule(
+            entry=crosses_above(col('TEMP_SMA_20'), col('TEMP_SMA_50')),
+            exit=crosses_below(col('TEMP_SMA_20'), col('TEMP_SMA_50')),
+            description='TEMPORARY - Uses: SMA(20), SMA(50)'
+        ),
+        'TEMP_RSI_MACD_Combo': Rule(
+            entry=(RSI > param('oversold', 30)) & crosses_above(MACD, MACD_SIGNAL),
+            exit=(RSI > param('overbought', 70)) | crosses_below(MACD, MACD_SIGNAL),
+            description='TEMPORARY - Uses: RSI (14), MACD (12,26,9)'
+        ),
+        'TEMP_BBands_RSI': Rule(
+            entry=(col('Close') <= col('TEMP_BB_Lower')) & (RSI < param('oversold', 35)),
+            exit=(col('Close') >= col('TEMP_BB_Upper')) | (RSI > param('overbought', 65)),
+            description='TEMPORARY - Uses: Bollinger Bands (20,2), RSI (14)'
+        ),
+        'TEMP_Stochastic_Only': Rule(
+            entry=crosses_above(STOCH_K, param('oversold', 20)),
+            exit=crosses_below(STOCH_K, param('overbought', 80)),
+            description='TEMPORARY - Uses: Stochastic (14,3)'
+        ),
+        'TEMP_Triple_Confirmation': Rule(
+            entry=all_of(
+                RSI > param('oversold', 30),
+                crosses_above(MACD, MACD_SIGNAL),
+                STOCH_K > param('stoch_oversold', 20)
+            ),
+            exit=(RSI > param('overbought', 70)) | (MACD < MACD_SIGNAL),
+            description='TEMPORARY - Uses: RSI (14), MACD (12,26,9), Stochastic (14,3)'
+        )
+    }
     
     @staticmethod
-    def TEMP_strategy_sma_crossover(data):
-        signals = pd.DataFrame(index=data.index)
-        signals['entry'] = (data['TEMP_SMA_20'] > data['TEMP_SMA_50']) & \
-                          (data['TEMP_SMA_20'].shift(1) <= data['TEMP_SMA_50'].shift(1))
-        signals['exit'] = (data['TEMP_SMA_20'] < data['TEMP_SMA_50']) & \
-                         (data['TEMP_SMA_20'].shift(1) >= data['TEMP_SMA_50'].shift(1))
-        return signals
+    def strategy_function(strategy_name):
+        # Parameters and their defaults come from the rule's param() terms.
+        rule = StrategyGenerator.RULES[strategy_name]
+        
+        def strategy(data, **params):
+            return rule.evaluate(data, **params)
+        
+        strategy.__name__ = strategy_name
+        return strategy
     
     @staticmethod
-    def TEMP_strategy_rsi_macd_combo(data):
-        signals = pd.DataFrame(index=data.index)
+    def generate_signals(data, strategy_names=None, strategy_params=None):
+        # Every strategy shares one graph over the full frame. Each result is then cut to the rows
+        # that strategy's trimmed frame keeps, and its first max_lag rows are re-evaluated on that
+        # trimmed head so shift() sees the same missing history as a per-strategy call.
+        strategy_names = list(StrategyGenerator.RULES if strategy_names is None else strategy_names)
+        strategy_params = strategy_params or {}
         
-        rsi_bullish = data['TEMP_RSI'] > 30
-        macd_cross_up = (data['TEMP_MACD'] > data['TEMP_MACD_Signal']) & \
-                       (data['TEMP_MACD'].shift(1) <= data['TEMP_MACD_Signal'].shift(1))
+        graph = SignalGraph()
+        for name in strategy_names:
+            graph.add(name, StrategyGenerator.RULES[name], **strategy_params.get(name, {}))
+        outputs = graph.evaluate(data)
         
-        rsi_bearish = data['TEMP_RSI'] > 70
-        macd_cross_down = (data['TEMP_MACD'] < data['TEMP_MACD_Signal']) & \
-                         (data['TEMP_MACD'].shift(1) >= data['TEMP_MACD_Signal'].shift(1))
+        missing = {}
+        signals = {}
+        for name in strategy_names:
+            rule = StrategyGenerator.RULES[name]
+            rule_graph = SignalGraph()
+            rule_graph.add(name, rule, **strategy_params.get(name, {}))
+            
+            invalid = np.zeros(len(data), dtype=bool)
+            for column in ['Close'] + list(StrategyGenerator.get_strategy_requirements(name)):
+                if column not in missing:
+                    missing[column] = np.isnan(data[column].to_numpy(dtype=np.float64))
+                invalid |= missing[column]
+            rows = np.flatnonzero(~invalid)
+            
+            if len(rows) > 0 and rows[-1] - rows[0] + 1 != len(rows):
+                entry, exit = (np.array(values, dtype=bool) for values in rule_graph.evaluate(data, rows)[name])
+            else:
+                rows = slice(rows[0], rows[-1] + 1) if len(rows) > 0 else slice(0, 0)
+                entry, exit = (np.array(values[rows], dtype=bool) for values in outputs[name])
+                head = min(rule.max_lag(), len(entry))
+                if head > 0:
+                    head_rows = slice(rows.start, rows.start + head)
+                    entry[:head], exit[:head] = rule_graph.evaluate(data, head_rows)[name]
+            
+            signals[name] = pd.DataFrame({'entry': entry, 'exit': exit}, index=data.index[rows])
         
-        signals['entry'] = rsi_bullish & macd_cross_up
-        signals['exit'] = rsi_bearish | macd_cross_down
         return signals
     
     @staticmethod
-    def TEMP_strategy_bbands_rsi(data):
-        signals = pd.DataFrame(index=data.index)
-        signals['entry'] = (data['Close'] <= data['TEMP_BB_Lower']) & (data['TEMP_RSI'] < 35)
-        signals['exit'] = (data['Close'] >= data['TEMP_BB_Upper']) | (data['TEMP_RSI'] > 65)
-        return signals
+    def get_all_strategies():
+        return {name: StrategyGenerator.strategy_function(name) for name in StrategyGenerator.RULES}
     
     @staticmethod
-    def TEMP_strategy_stochastic_only(data):
-        signals = pd.DataFrame(index=data.index)
-        signals['entry'] = (data['TEMP_Stoch_K'] > 20) & (data['TEMP_Stoch_K'].shift(1) <= 20)
-        signals['exit'] = (data['TEMP_Stoch_K'] < 80) & (data['TEMP_Stoch_K'].shift(1) >= 80)
-        return signals
+    def get_strategy_description(strategy_name):
+        rule = StrategyGenerator.RULES.get(strategy_name)
+        return rule.description if rule is not None and rule.description else 'No description available'
     
     @staticmethod
-    def TEMP_strategy_triple_confirmation(data):
-        signals = pd.DataFrame(index=data.index)
-        
-        rsi_ok = data['TEMP_RSI'] > 30
-        macd_bullish = data['TEMP_MACD'] > data['TEMP_MACD_Signal']
-        macd_was_bearish = data['TEMP_MACD'].shift(1) <= data['TEMP_MACD_Signal'].shift(1)
-        stoch_ok = data['TEMP_Stoch_K'] > 20
+    def get_parameter_grid(strategy_name):
+        rsi = {'rsi_period': [7, 10, 14, 21]}
+        macd = {'macd_fast': [8, 12], 'macd_slow': [21, 26], 'macd_signal': [7, 9]}
+        bbands = {'bb_period': [15, 20, 25], 'bb_std': [1.5, 2, 2.5]}
+        stochastic = {'stoch_k': [9, 14, 21], 'stoch_d': [3, 5]}
         
-        rsi_exit = data['TEMP_RSI'] > 70
-        macd_bearish = data['TEMP_MACD'] < data['TEMP_MACD_Signal']
-        
-        signals['entry'] = rsi_ok & macd_bullish & macd_was_bearish & stoch_ok
-        signals['exit'] = rsi_exit | macd_bearish
-        return signals
-    
-    @staticmethod
-    def get_all_strategies():
-        return {
-            'TEMP_RSI_Only': StrategyGenerator.TEMP_strategy_rsi_only,
-            'TEMP_MACD_Only': StrategyGenerator.TEMP_strategy_macd_only,
-            'TEMP_SMA_Crossover': StrategyGenerator.TEMP_strategy_sma_crossover,
-            'TEMP_RSI_MACD_Combo': StrategyGenerator.TEMP_strategy_rsi_macd_combo,
-            'TEMP_BBands_RSI': StrategyGenerator.TEMP_strategy_bbands_rsi,
-            'TEMP_Stochastic_Only': StrategyGenerator.TEMP_strategy_stochastic_only,
-            'TEMP_Triple_Confirmation': StrategyGenerator.TEMP_strategy_triple_confirmation
+        grids = {
+            'TEMP_RSI_Only': (
+                rsi,
+                {'oversold': [20, 25, 30, 35], 'overbought': [65, 70, 75, 80]}
+            ),
+            'TEMP_MACD_Only': (macd, {}),
+            'TEMP_SMA_Crossover': ({}, {}),
+            'TEMP_RSI_MACD_Combo': (
+                {**rsi, **macd},
+                {'oversold': [25, 30, 35], 'overbought': [65, 70, 75]}
+            ),
+            'TEMP_BBands_RSI': (
+                {**rsi, **bbands},
+                {'oversold': [30, 35, 40], 'overbought': [60, 65, 70]}
+            ),
+            'TEMP_Stochastic_Only': (
+                stochastic,
+                {'oversold': [10, 15, 20, 25], 'overbought': [75, 80, 85, 90]}
+            ),
+            'TEMP_Triple_Confirmation': (
+                {**rsi, **macd, **stochastic},
+                {'oversold': [25, 30, 35], 'overbought': [65, 70, 75], 'stoch_oversold': [15, 20, 25]}
+            )
         }
+        return grids.get(strategy_name, ({}, {}))
     
     @staticmethod
-    def get_strategy_description(strategy_name):
-        descriptions = {
-            'TEMP_RSI_Only': 'TEMPORARY - Uses: RSI (14)',
-            'TEMP_MACD_Only': 'TEMPORARY - Uses: MACD (12,26,9)',
-            'TEMP_SMA_Crossover': 'TEMPORARY - Uses: SMA(20), SMA(50)',
-            'TEMP_RSI_MACD_Combo': 'TEMPORARY - Uses: RSI (14), MACD (12,26,9)',
-            'TEMP_BBands_RSI': 'TEMPORARY - Uses: Bollinger Bands (20,2), RSI (14)',
-            'TEMP_Stochastic_Only': 'TEMPORARY - Uses: Stochastic (14,3)',
-            'TEMP_Triple_Confirmation': 'TEMPORARY - Uses: RSI (14), MACD (12,26,9), Stochastic (14,3)'
-        }
-        return descriptions.get(strategy_name, 'No description available')
+    def get_strategy_requirements(strategy_name):
+        return StrategyGenerator.RULES[strategy_name].columns()
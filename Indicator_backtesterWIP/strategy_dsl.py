@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+
+class Expr:
+    
+    __slots__ = ('op', 'args', 'key')
+    
+    def __init__(self, op, args, key):
+        self.op = op
+        self.args = args
+        self.key = key
+    
+    @staticmethod
+    def wrap(value):
+        if isinstance(value, Expr):
+            return value
+        if isinstance(value, (bool, np.bool_)):
+            raise ValueError("Use comparisons or column expressions instead of bare booleans")
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            return Expr.const(value)
+        raise ValueError(f"Cannot use {value!r} in a rule; wrap column names with col()")
+    
+    @staticmethod
+    def const(value):
+        value = float(value)
+        return Expr('const', (value,), ('const', value))
+    
+    @staticmethod
+    def compare(op, left, right):
+        # Only > and >= exist in the graph: a < b is b > a, so both spellings share one node.
+        # Equality is symmetric, so its operands are ordered like and/or.
+        left, right = Expr.wrap(left), Expr.wrap(right)
+        if op == '==' and repr(right.key) < repr(left.key):
+            left, right = right, left
+        return Expr(op, (left, right), (op, left.key, right.key))
+    
+    @staticmethod
+    def logical(op, left, right):
+        left, right = Expr.wrap(left), Expr.wrap(right)
+        if left.op in ('const', 'column', 'param', 'shift') or right.op in ('const', 'column', 'param', 'shift'):
+            raise ValueError(f"'{op}' needs boolean operands such as comparisons or crossovers")
+        if repr(right.key) < repr(left.key):
+            left, right = right, left
+        return Expr(op, (left, right), (op, left.key, right.key))
+    
+    def shift(self, periods=1):
+        if periods < 0:
+            raise ValueError("Negative shifts would look ahead; only periods >= 0 are allowed")
+        if self.op not in ('column', 'const', 'param', 'shift'):
+            raise ValueError("Only numeric expressions can be shifted")
+        if periods == 0 or self.op in ('const', 'param'):
+            return self
+        if self.op == 'shift':
+            periods += self.args[1]
+            source = self.args[0]
+        else:
+            source = self
+        return Expr('shift', (source, periods), ('shift', periods, source.key))
+    
+    def __gt__(self, other):
+        return Expr.compare('>', self, other)
+    
+    def __ge__(self, other):
+        return Expr.compare('>=', self, other)
+    
+    def __lt__(self, other):
+        return Expr.compare('>', other, self)
+    
+    def __le__(self, other):
+        return Expr.compare('>=', other, self)
+    
+    def equals(self, other):
+        return Expr.compare('==', self, other)
+    
+    def not_equals(self, other):
+        return ~self.equals(other)
+    
+    def __eq__(self, other):
+        raise TypeError("Rule expressions are symbolic; use .equals() or .not_equals() instead of == and !=")
+    
+    def __ne__(self, other):
+        raise TypeError("Rule expressions are symbolic; use .equals() or .not_equals() instead of == and !=")
+    
+    __hash__ = object.__hash__
+    
+    def __and__(self, other):
+        return Expr.logical('and', self, other)
+    
+    def __rand__(self, other):
+        return Expr.logical('and', other, self)
+    
+    def __or__(self, other):
+        return Expr.logical('or', self, other)
+    
+    def __ror__(self, other):
+        return Expr.logical('or', other, self)
+    
+    def __invert__(self):
+        if self.op in ('const', 'column', 'param', 'shift'):
+            raise ValueError("'not' needs a boolean operand such as a comparison or crossover")
+        return Expr('not', (self,), ('not', self.key))
+    
+    def __bool__(self):
+        raise TypeError("Rule expressions are symbolic; combine them with & and | instead of and/or")
+    
+    def __repr__(self):
+        return f"Expr{self.key!r}"
+    
+    def walk(self, seen=None):
+        seen = {} if seen is None else seen
+        if self.key not in seen:
+            for arg in self.args:
+                if isinstance(arg, Expr):
+                    arg.walk(seen)
+            seen[self.key] = self
+        return seen
+    
+    def bind(self, params, memo=None):
+        memo = {} if memo is None else memo
+        if self.key in memo:
+            return memo[self.key]
+        
+        if self.op == 'param':
+            name, default = self.args
+            bound = Expr.const(params.get(name, default))
+        elif self.op == 'shift':
+            bound = self.args[0].bind(params, memo).shift(self.args[1])
+        elif self.op in ('>', '>=', '=='):
+            bound = Expr.compare(self.op, self.args[0].bind(params, memo), self.args[1].bind(params, memo))
+        elif self.op in ('and', 'or'):
+            bound = Expr.logical(self.op, self.args[0].bind(params, memo), self.args[1].bind(params, memo))
+        elif self.op == 'not':
+            bound = ~self.args[0].bind(params, memo)
+        else:
+            bound = self
+        
+        memo[self.key] = bound
+        return bound
+
+def col(name):
+    return Expr('column', (name,), ('column', name))
+
+def param(name, default):
+    return Expr('param', (name, float(default)), ('param', name))
+
+def crosses_above(series, level):
+    series, level = Expr.wrap(series), Expr.wrap(level)
+    return (series > level) & (series.shift(1) <= level.shift(1))
+
+def crosses_below(series, level):
+    series, level = Expr.wrap(series), Expr.wrap(level)
+    return (series < level) & (series.shift(1) >= level.shift(1))
+
+def all_of(*conditions):
+    result = conditions[0]
+    for condition in conditions[1:]:
+        result = result & condition
+    return result
+
+def any_of(*conditions):
+    result = conditions[0]
+    for condition in conditions[1:]:
+        result = result | condition
+    return result
+
+class Rule:
+    
+    __slots__ = ('entry', 'exit', 'description')
+    
+    def __init__(self, entry, exit, description=None):
+        self.entry = Expr.wrap(entry)
+        self.exit = Expr.wrap(exit)
+        self.description = description
+    
+    def nodes(self):
+        return self.exit.walk(self.entry.walk())
+    
+    def columns(self):
+        return [node.args[0] for node in self.nodes().values() if node.op == 'column']
+    
+    def params(self):
+        return {node.args[0]: node.args[1] for node in self.nodes().values() if node.op == 'param'}
+    
+    def max_lag(self):
+        lags = {}
+        for key, node in self.nodes().items():
+            child_lags = [lags[arg.key] for arg in node.args if isinstance(arg, Expr)]
+            lags[key] = (node.args[1] if node.op == 'shift' else 0) + max(child_lags, default=0)
+        return max(lags.values(), default=0)
+    
+    def bind(self, **params):
+        unknown = set(params) - set(self.params())
+        if unknown:
+            raise TypeError(f"Unknown rule parameters: {', '.join(sorted(unknown))}")
+        
+        memo = {}
+        return Rule(self.entry.bind(params, memo), self.exit.bind(params, memo), self.description)
+    
+    def evaluate(self, data, **params):
+        graph = SignalGraph()
+        graph.add('signals', self, **params)
+        return graph.signals(data)['signals']
+
+class SignalGraph:
+    
+    def __init__(self):
+        self.nodes = {}
+        self.outputs = {}
+    
+    def add(self, name, rule, **params):
+        bound = rule.bind(**params)
+        bound.entry.walk(self.nodes)
+        bound.exit.walk(self.nodes)
+        self.outputs[name] = (bound.entry.key, bound.exit.key)
+    
+    def evaluate(self, data, rows=None):
+        if rows is None:
+            n = len(data)
+        else:
+            n = len(range(len(data))[rows]) if isinstance(rows, slice) else len(rows)
+        values = {}
+        
+        # walk() registers children before parents, so insertion order is a valid schedule.
+        for key, node in self.nodes.items():
+            op, args = node.op, node.args
+            if op == 'const':
+                values[key] = args[0]
+            elif op == 'column':
+                column = data[args[0]].to_numpy(dtype=np.float64)
+                values[key] = column if rows is None else column[rows]
+            elif op == 'shift':
+                source, periods = values[args[0].key], args[1]
+                shifted = np.full(n, np.nan)
+                if periods < n:
+                    shifted[periods:] = source[:n - periods]
+                values[key] = shifted
+            elif op == '>':
+                values[key] = np.greater(values[args[0].key], values[args[1].key])
+            elif op == '>=':
+                values[key] = np.greater_equal(values[args[0].key], values[args[1].key])
+            elif op == '==':
+                values[key] = np.equal(values[args[0].key], values[args[1].key])
+            elif op == 'and':
+                values[key] = np.logical_and(values[args[0].key], values[args[1].key])
+            elif op == 'or':
+                values[key] = np.logical_or(values[args[0].key], values[args[1].key])
+            elif op == 'not':
+                values[key] = np.logical_not(values[args[0].key])
+            else:
+                raise ValueError(f"Unbound parameter {args[0]} in signal graph")
+        
+        return {
+            name: (np.broadcast_to(values[entry], (n,)), np.broadcast_to(values[exit], (n,)))
+            for name, (entry, exit) in self.outputs.items()
+        }
+    
+    def signals(self, data):
+        return {
+            name: pd.DataFrame({'entry': np.array(entry, dtype=bool), 'exit': np.array(exit, dtype=bool)}, index=data.index)
+            for name, (entry, exit) in self.evaluate(data).items()
+        }
@@ -0,0 +1,357 @@
+import math
+import numpy as np
+import pandas as pd
+from backtest_engine import BacktestEngine
+from strategies import StrategyGenerator
+from streaming_indicators import StreamingIndicators
+from recorders import TradeRecorder
+from metrics import PerformanceMetrics
+
+class BarSource:
+    
+    @staticmethod
+    def from_frame(data, chunk_size=10000):
+        for start in range(0, len(data), chunk_size):
+            yield data.iloc[start:start + chunk_size]
+    
+    @staticmethod
+    def from_csv(filename, chunk_size=10000):
+        for chunk in pd.read_csv(filename, index_col=0, parse_dates=True, chunksize=chunk_size):
+            yield chunk
+    
+    @staticmethod
+    def from_parquet(filename):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet row groups requires pyarrow (pip install pyarrow)")
+        
+        parquet_file = pq.ParquetFile(filename)
+        for i in range(parquet_file.num_row_groups):
+            chunk = parquet_file.read_row_group(i).to_pandas()
+            if 'Date' in chunk.columns:
+                chunk = chunk.set_index('Date')
+            yield chunk
+
+class RunningEquityStats:
+    
+    def __init__(self, initial_capital):
+        self.initial_capital = initial_capital
+        self.count = 0
+        self.final_equity = initial_capital
+        self.prev_equity = None
+        self.peak = None
+        
+        self.returns = _Welford()
+        self.downside_returns = _Welford()
+        
+        self.max_drawdown = 0.0
+        self.drawdown_sum = 0.0
+        self.drawdown_sq_sum = 0.0
+        self.current_drawdown_duration = 0
+        self.max_drawdown_duration = 0
+    
+    def update(self, equity):
+        for value in equity:
+            value = float(value)
+            self.count += 1
+            
+            if self.prev_equity is not None:
+                ret = value / self.prev_equity - 1
+                if ret == ret:
+                    self.returns.update(ret)
+                    if ret < 0:
+                        self.downside_returns.update(ret)
+            self.prev_equity = value
+            
+            self.peak = value if self.peak is None else max(self.peak, value)
+            drawdown = (value - self.peak) / self.peak * 100
+            
+            self.max_drawdown = min(self.max_drawdown, drawdown)
+            self.drawdown_sum += drawdown
+            self.drawdown_sq_sum += drawdown ** 2
+            
+            if drawdown < 0:
+                self.current_drawdown_duration += 1
+                self.max_drawdown_duration = max(self.max_drawdown_duration, self.current_drawdown_duration)
+            else:
+                self.current_drawdown_duration = 0
+            
+            self.final_equity = value
+    
+    def summary(self):
+        total_return = ((self.final_equity / self.initial_capital) - 1) * 100
+        returns_std = self.returns.std()
+        
+        if self.returns.count > 0 and returns_std > 0:
+            sharpe_ratio = (self.returns.mean / returns_std) * np.sqrt(252)
+            downside_std = self.downside_returns.std()
+            if self.downside_returns.count > 0 and downside_std > 0:
+                sortino_ratio = (self.returns.mean / downside_std) * np.sqrt(252)
+            else:
+                sortino_ratio = 0
+            calmar_ratio = (total_return / abs(self.max_drawdown)) if self.max_drawdown != 0 else 0
+        else:
+            sharpe_ratio = 0
+            sortino_ratio = 0
+            calmar_ratio = 0
+        
+        return {
+            'final_equity': self.final_equity,
+            'total_return': total_return,
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'calmar_ratio': calmar_ratio,
+            'max_drawdown': self.max_drawdown,
+            'avg_drawdown': self.drawdown_sum / self.count,
+            'drawdown_duration': self.max_drawdown_duration,
+            'ulcer_index': math.sqrt(self.drawdown_sq_sum / self.count),
+            'total_days': self.count
+        }
+
+class RunningTradeStats:
+    
+    def __init__(self):
+        self.num_trades = 0
+        self.num_wins = 0
+        self.num_losses = 0
+        self.total_wins = 0.0
+        self.total_losses = 0.0
+        self.max_win = 0.0
+        self.max_loss = 0.0
+        self.win_run = 0
+        self.loss_run = 0
+        self.max_win_run = 0
+        self.max_loss_run = 0
+        self.open_date = None
+        self.num_durations = 0
+        self.duration_sum = 0
+        self.max_duration = None
+        self.min_duration = None
+    
+    def update(self, trade):
+        if trade['type'] == 'BUY':
+            self.open_date = pd.Timestamp(trade['date']).to_datetime64()
+            return
+        
+        if self.open_date is not None:
+            duration = int((pd.Timestamp(trade['date']).to_datetime64() - self.open_date).astype('timedelta64[D]').astype(int))
+            self.num_durations += 1
+            self.duration_sum += duration
+            self.max_duration = duration if self.max_duration is None else max(self.max_duration, duration)
+            self.min_duration = duration if self.min_duration is None else min(self.min_duration, duration)
+            self.open_date = None
+        
+        pnl = float(trade['pnl'])
+        self.num_trades += 1
+        if pnl > 0:
+            self.num_wins += 1
+            self.total_wins += pnl
+            self.max_win = pnl if self.num_wins == 1 else max(self.max_win, pnl)
+        elif pnl < 0:
+            self.num_losses += 1
+            self.total_losses += pnl
+            self.max_loss = pnl if self.num_losses == 1 else min(self.max_loss, pnl)
+        
+        self.win_run = self.win_run + 1 if pnl > 0 else 0
+        self.loss_run = self.loss_run + 1 if pnl < 0 else 0
+        self.max_win_run = max(self.max_win_run, self.win_run)
+        self.max_loss_run = max(self.max_loss_run, self.loss_run)
+    
+    def summary(self, total_return, max_drawdown, total_days):
+        # Mirrors PerformanceMetrics.trade_stats from running totals instead of the full trade list.
+        if self.num_trades == 0:
+            return PerformanceMetrics.trade_stats([], [], total_return, max_drawdown, total_days)
+        
+        win_rate = (self.num_wins / self.num_trades) * 100
+        avg_win = self.total_wins / self.num_wins if self.num_wins > 0 else 0
+        avg_loss = self.total_losses / self.num_losses if self.num_losses > 0 else 0
+        total_losses = abs(self.total_losses)
+        payoff_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else 0
+        
+        if win_rate < 100 and payoff_ratio > 0:
+            kelly_pct = (win_rate/100 - (1 - win_rate/100) / payoff_ratio) * 100
+        else:
+            kelly_pct = 0
+        
+        return {
+            'num_trades': self.num_trades,
+            'num_wins': self.num_wins,
+            'num_losses': self.num_losses,
+            'win_rate': win_rate,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'profit_factor': self.total_wins / total_losses if total_losses != 0 else 0,
+            'payoff_ratio': payoff_ratio,
+            'expectancy': (win_rate/100 * avg_win) + ((1 - win_rate/100) * avg_loss),
+            'max_win': self.max_win,
+            'max_loss': self.max_loss,
+            'avg_trade_duration': self.duration_sum / self.num_durations if self.num_durations > 0 else 0,
+            'max_trade_duration': self.max_duration or 0,
+            'min_trade_duration': self.min_duration or 0,
+            'max_consecutive_wins': self.max_win_run,
+            'max_consecutive_losses': self.max_loss_run,
+            'recovery_factor': total_return / abs(max_drawdown) if max_drawdown != 0 else 0,
+            'kelly_pct': kelly_pct,
+            'exposure_time': (self.duration_sum / total_days * 100) if total_days > 0 else 0
+        }
+
+class _Welford:
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def std(self):
+        if self.count < 2:
+            return float('nan')
+        return math.sqrt(self.m2 / (self.count - 1))
+
+class StreamingBacktester:
+    
+    def __init__(self, strategy_name, engine=None, chunk_size=10000, indicator_params=None,
+                 strategy_params=None):
+        self.strategy_name = strategy_name
+        self.strategy_func = StrategyGenerator.get_all_strategies()[strategy_name]
+        self.requirements = StrategyGenerator.get_strategy_requirements(strategy_name)
+        self.context_rows = StrategyGenerator.RULES[strategy_name].max_lag()
+        self.engine = engine or BacktestEngine()
+        self.chunk_size = chunk_size
+        self.indicator_params = indicator_params or {}
+        self.strategy_params = strategy_params or {}
+        self.metrics = None
+    
+    def _iter_chunks(self, bars):
+        pending = []
+        for item in bars:
+            if isinstance(item, pd.DataFrame):
+                if pending:
+                    yield pd.DataFrame(pending)
+                    pending = []
+                yield item
+                continue
+            
+            pending.append(item)
+            if len(pending) >= self.chunk_size:
+                yield pd.DataFrame(pending)
+                pending = []
+        
+        if pending:
+            yield pd.DataFrame(pending)
+    
+    def _add_indicators(self, indicators, chunk):
+        rows = [
+            indicators.update({'High': high, 'Low': low, 'Close': close})
+            for high, low, close in zip(
+                chunk['High'].to_numpy(dtype=np.float64),
+                chunk['Low'].to_numpy(dtype=np.float64),
+                chunk['Close'].to_numpy(dtype=np.float64)
+            )
+        ]
+        enriched = chunk.copy(deep=False)
+        values = pd.DataFrame(rows, index=chunk.index)
+        for column in values.columns:
+            enriched[column] = values[column]
+        return enriched
+    
+    def _trade(self, date, trade_type, price, shares, value, pnl, pnl_pct):
+        trade = {
+            'date': date,
+            'type': trade_type,
+            'price': price,
+            'shares': shares,
+            'value': value
+        }
+        if trade_type == 'SELL':
+            trade['pnl'] = pnl
+            trade['pnl_pct'] = pnl_pct
+        return trade
+    
+    def run(self, bars):
+        engine = self.engine
+        indicators = StreamingIndicators(**self.indicator_params)
+        state = engine._new_long_only_state(1)
+        stats = RunningEquityStats(engine.initial_capital)
+        trade_stats = RunningTradeStats()
+        context = None
+        last_bar = None
+        self.metrics = None
+        
+        for chunk in self._iter_chunks(bars):
+            if not isinstance(chunk.index, pd.DatetimeIndex) and 'Date' in chunk.columns:
+                chunk = chunk.set_index('Date')
+            
+            kept = self._add_indicators(indicators, chunk).dropna(subset=['Close'] + self.requirements)
+            if len(kept) == 0:
+                continue
+            
+            # The last max_lag() kept rows are carried over so shifted terms see the previous chunk.
+            frame = kept if context is None else pd.concat([context, kept])
+            signals = self.strategy_func(frame, **self.strategy_params).iloc[len(frame) - len(kept):]
+            context = frame.iloc[len(frame) - self.context_rows:] if self.context_rows > 0 else None
+            
+            close = kept['Close'].to_numpy(dtype=np.float64)
+            slippage = engine._slippage_array(kept)
+            capital_curve, position_curve, trade_rows = engine._step_long_only(
+                close, slippage,
+                signals['entry'].to_numpy(dtype=bool)[:, None],
+                signals['exit'].to_numpy(dtype=bool)[:, None],
+                state
+            )
+            
+            for i, trade_type, price, shares, value, pnl, pnl_pct in trade_rows[0]:
+                trade = self._trade(kept.index[i], trade_type, price, shares, value, pnl, pnl_pct)
+                trade_stats.update(trade)
+                yield 'trade', trade
+            
+            position_curve = position_curve[:, 0]
+            capital_curve = capital_curve[:, 0]
+            position_value = np.where(position_curve > 0, position_curve * close, 0.0)
+            equity = capital_curve + position_value
+            stats.update(equity)
+            
+            yield 'equity', pd.DataFrame({
+                'date': kept.index,
+                'equity': equity,
+                'capital': capital_curve,
+                'position_value': position_value
+            })
+            
+            last_bar = (kept.index[-1], close[-1:], slippage[-1:])
+        
+        if last_bar is not None:
+            date, close, slippage = last_bar
+            trade_rows = [TradeRecorder()]
+            engine._close_open_positions(close[:, None], slippage[:, None], [0], state, trade_rows)
+            for _, trade_type, price, shares, value, pnl, pnl_pct in trade_rows[0]:
+                trade = self._trade(date, trade_type, price, shares, value, pnl, pnl_pct)
+                trade_stats.update(trade)
+                yield 'trade', trade
+        
+        if stats.count == 0:
+            self.metrics = engine._empty_metrics()
+        else:
+            summary = stats.summary()
+            self.metrics = PerformanceMetrics.summarize(
+                summary,
+                trade_stats.summary(summary['total_return'], summary['max_drawdown'], summary['total_days'])
+            )
+    
+    def run_to_completion(self, bars, keep_trades=True):
+        # Collecting the trade list is the caller's choice; run() itself only keeps running totals.
+        trades = []
+        for kind, payload in self.run(bars):
+            if kind == 'trade' and keep_trades:
+                trades.append(payload)
+        
+        return {
+            'metrics': self.metrics,
+            'trades': pd.DataFrame(trades)
+        }
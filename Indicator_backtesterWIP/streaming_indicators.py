@@ -0,0 +1,364 @@
+import sys
+import math
+from collections import deque
+
+NAN = float('nan')
+
+def _divide(numerator, denominator):
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+class _RollingMean:
+    
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self._reset()
+    
+    def _reset(self):
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.num_consecutive_same_value = 0
+        self.prev_value = None
+    
+    def _add(self, val):
+        if val == val:
+            self.nobs += 1
+            y = val - self.compensation_add
+            t = self.sum_x + y
+            self.compensation_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, val) < 0:
+                self.neg_ct += 1
+            if val == self.prev_value:
+                self.num_consecutive_same_value += 1
+            else:
+                self.num_consecutive_same_value = 1
+            self.prev_value = val
+    
+    def _remove(self, val):
+        if val == val:
+            self.nobs -= 1
+            y = -val - self.compensation_remove
+            t = self.sum_x + y
+            self.compensation_remove = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, val) < 0:
+                self.neg_ct -= 1
+    
+    def update(self, val):
+        self.values.append(val)
+        
+        if self.window == 1:
+            self.values.popleft()
+            self._reset()
+        elif len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._add(val)
+        
+        if self.nobs < self.window or self.nobs == 0:
+            return NAN
+        
+        result = self.sum_x / self.nobs
+        if self.num_consecutive_same_value >= self.nobs:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == self.nobs and result > 0:
+            result = 0.0
+        return result
+
+class _RollingVariance:
+    
+    INV_COND_TOL = sys.float_info.epsilon * 1e3
+    
+    def __init__(self, window, ddof=1):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque()
+        self._reset()
+    
+    def _reset(self):
+        self.nobs = 0.0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.numerically_unstable = False
+    
+    def _add(self, val):
+        if val != val:
+            return
+        prev_m2 = self.ssqdm_x
+        self.nobs += 1
+        
+        prev_mean = self.mean_x - self.compensation_add
+        y = val - self.compensation_add
+        t = y - self.mean_x
+        self.compensation_add = t + self.mean_x - y
+        if self.nobs:
+            self.mean_x = self.mean_x + t / self.nobs
+        else:
+            self.mean_x = 0.0
+        self.ssqdm_x = self.ssqdm_x + (val - prev_mean) * (val - self.mean_x)
+        
+        if prev_m2 * self.INV_COND_TOL > self.ssqdm_x:
+            self.numerically_unstable = True
+    
+    def _remove(self, val):
+        if val == val:
+            prev_m2 = self.ssqdm_x
+            self.nobs -= 1
+            if self.nobs:
+                prev_mean = self.mean_x - self.compensation_remove
+                y = val - self.compensation_remove
+                t = y - self.mean_x
+                self.compensation_remove = t + self.mean_x - y
+                self.mean_x = self.mean_x - t / self.nobs
+                self.ssqdm_x = self.ssqdm_x - (val - prev_mean) * (val - self.mean_x)
+                
+                if prev_m2 * self.INV_COND_TOL > self.ssqdm_x:
+                    self.numerically_unstable = True
+            else:
+                self.mean_x = 0.0
+                self.ssqdm_x = 0.0
+                self.numerically_unstable = False
+    
+    def update(self, val):
+        self.values.append(val)
+        recompute = len(self.values) == 1 or self.window == 1
+        
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not recompute:
+                self._remove(old)
+        if not recompute:
+            self._add(val)
+        
+        if recompute or self.numerically_unstable:
+            self._reset()
+            for value in self.values:
+                self._add(value)
+            self.numerically_unstable = False
+        
+        if self.nobs >= max(self.window, 1) and self.nobs > self.ddof:
+            return self.ssqdm_x / (self.nobs - self.ddof)
+        return NAN
+
+class _RollingExtreme:
+    
+    def __init__(self, window, is_max):
+        self.window = window
+        self.is_max = is_max
+        self.count = 0
+        self.nobs = 0
+        self.values = deque()
+        self.candidates = deque()
+    
+    def update(self, val):
+        index = self.count
+        self.count += 1
+        
+        self.values.append(val)
+        if val == val:
+            self.nobs += 1
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+        
+        while self.candidates and self.candidates[0][0] <= index - self.window:
+            self.candidates.popleft()
+        
+        if val == val:
+            if self.is_max:
+                while self.candidates and self.candidates[-1][1] <= val:
+                    self.candidates.pop()
+            else:
+                while self.candidates and self.candidates[-1][1] >= val:
+                    self.candidates.pop()
+            self.candidates.append((index, val))
+        
+        if self.nobs < self.window or not self.candidates:
+            return NAN
+        return self.candidates[0][1]
+
+class _EWMMean:
+    
+    def __init__(self, span):
+        com = (span - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - self.alpha
+        self.weighted = None
+    
+    def update(self, cur):
+        if self.weighted is None:
+            self.weighted = cur
+        elif self.weighted == self.weighted:
+            if cur == cur:
+                old_wt = self.old_wt_factor
+                if self.weighted != cur:
+                    weighted = old_wt * self.weighted + self.alpha * cur
+                    self.weighted = weighted / (old_wt + self.alpha)
+        elif cur == cur:
+            self.weighted = cur
+        return self.weighted
+
+class StreamingSMA:
+    
+    def __init__(self, period=20):
+        self.period = period
+        self._mean = _RollingMean(period)
+        self.value = NAN
+    
+    def update(self, bar):
+        self.value = self._mean.update(float(bar['Close']))
+        return self.value
+
+class StreamingEMA:
+    
+    def __init__(self, period=12):
+        self.period = period
+        self._ema = _EWMMean(period)
+        self.value = NAN
+    
+    def update(self, bar):
+        self.value = self._ema.update(float(bar['Close']))
+        return self.value
+
+class StreamingRSI:
+    
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self._gain = _RollingMean(period)
+        self._loss = _RollingMean(period)
+        self.value = NAN
+    
+    def update(self, bar):
+        close = float(bar['Close'])
+        delta = NAN if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-(delta if delta < 0 else 0.0))
+        
+        rs = _divide(gain, loss)
+        self.value = 100 - _divide(100, 1 + rs)
+        return self.value
+
+class StreamingMACD:
+    
+    def __init__(self, fast=12, slow=26, signal=9):
+        self._fast = _EWMMean(fast)
+        self._slow = _EWMMean(slow)
+        self._signal = _EWMMean(signal)
+        self.value = {'MACD': NAN, 'Signal': NAN, 'Histogram': NAN}
+    
+    def update(self, bar):
+        close = float(bar['Close'])
+        macd = self._fast.update(close) - self._slow.update(close)
+        signal_line = self._signal.update(macd)
+        
+        self.value = {
+            'MACD': macd,
+            'Signal': signal_line,
+            'Histogram': macd - signal_line
+        }
+        return self.value
+
+class StreamingBBands:
+    
+    def __init__(self, period=20, std_dev=2):
+        self.std_dev = std_dev
+        self._mean = _RollingMean(period)
+        self._var = _RollingVariance(period)
+        self.value = {'BB_Upper': NAN, 'BB_Middle': NAN, 'BB_Lower': NAN}
+    
+    def update(self, bar):
+        close = float(bar['Close'])
+        sma = self._mean.update(close)
+        var = self._var.update(close)
+        std = NAN if var != var else (math.sqrt(var) if var >= 0 else 0.0)
+        
+        self.value = {
+            'BB_Upper': sma + (std * self.std_dev),
+            'BB_Middle': sma,
+            'BB_Lower': sma - (std * self.std_dev)
+        }
+        return self.value
+
+class StreamingStochastic:
+    
+    def __init__(self, k_period=14, d_period=3):
+        self._low = _RollingExtreme(k_period, is_max=False)
+        self._high = _RollingExtreme(k_period, is_max=True)
+        self._d = _RollingMean(d_period)
+        self.value = {'Stoch_K': NAN, 'Stoch_D': NAN}
+    
+    def update(self, bar):
+        low_min = self._low.update(float(bar['Low']))
+        high_max = self._high.update(float(bar['High']))
+        
+        k = 100 * _divide(float(bar['Close']) - low_min, high_max - low_min)
+        self.value = {'Stoch_K': k, 'Stoch_D': self._d.update(k)}
+        return self.value
+
+class StreamingATR:
+    
+    def __init__(self, period=14):
+        self.prev_close = None
+        self._mean = _RollingMean(period)
+        self.value = NAN
+    
+    def update(self, bar):
+        high = float(bar['High'])
+        low = float(bar['Low'])
+        
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = float(bar['Close'])
+        
+        self.value = self._mean.update(true_range)
+        return self.value
+
+class StreamingIndicators:
+    
+    def __init__(self, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9,
+                 bb_period=20, bb_std=2, stoch_k=14, stoch_d=3, atr_period=14):
+        self.rsi = StreamingRSI(rsi_period)
+        self.sma_20 = StreamingSMA(20)
+        self.sma_50 = StreamingSMA(50)
+        self.ema_12 = StreamingEMA(12)
+        self.macd = StreamingMACD(macd_fast, macd_slow, macd_signal)
+        self.bbands = StreamingBBands(bb_period, bb_std)
+        self.stochastic = StreamingStochastic(stoch_k, stoch_d)
+        self.atr = StreamingATR(atr_period)
+    
+    def update(self, bar):
+        macd = self.macd.update(bar)
+        bbands = self.bbands.update(bar)
+        stochastic = self.stochastic.update(bar)
+        
+        return {
+            'TEMP_RSI': self.rsi.update(bar),
+            'TEMP_SMA_20': self.sma_20.update(bar),
+            'TEMP_SMA_50': self.sma_50.update(bar),
+            'TEMP_EMA_12': self.ema_12.update(bar),
+            'TEMP_MACD': macd['MACD'],
+            'TEMP_MACD_Signal': macd['Signal'],
+            'TEMP_MACD_Hist': macd['Histogram'],
+            'TEMP_BB_Upper': bbands['BB_Upper'],
+            'TEMP_BB_Middle': bbands['BB_Middle'],
+            'TEMP_BB_Lower': bbands['BB_Lower'],
+            'TEMP_Stoch_K': stochastic['Stoch_K'],
+            'TEMP_Stoch_D': stochastic['Stoch_D'],
+            'TEMP_ATR': self.atr.update(bar)
+        }
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+import backends
+from data_generator import HistoricalDataGenerator
+from indicators import TechnicalIndicators
+from metrics import PerformanceMetrics
+from strategies import StrategyGenerator
+from backtest_engine import BacktestEngine
+
+NUM_BARS = 2000
+NUM_RUNS = 8
+
+@pytest.fixture(params=[name for name in backends.BACKENDS if name != 'numpy'])
+def backend(request, monkeypatch):
+    if request.param not in backends.available_backends():
+        pytest.skip(f"{request.param} is not installed")
+    monkeypatch.setattr(backends, '_backend', backends.get_backend())
+    return request.param
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+def run_with(backend, func):
+    backends.set_backend(backend)
+    return func()
+
+def assert_identical(expected, actual):
+    assert len(expected) == len(actual)
+    for a, b in zip(expected, actual):
+        assert np.array_equal(a, b, equal_nan=a.dtype.kind == 'f')
+
+@pytest.mark.parametrize('num_bars', [0, 1, 2, NUM_BARS])
+def test_ar_filter_matches_numpy(backend, rng, num_bars):
+    shocks = rng.normal(0.0003, 0.015, num_bars)
+    coefficients = rng.uniform(0.05, 0.15, num_bars)
+    coefficients[rng.integers(0, max(num_bars, 1), num_bars // 100)] = 0
+    coefficients[:1] = 0
+    
+    def output():
+        return HistoricalDataGenerator._ar_filter(shocks, coefficients)
+    
+    # The kernel runs the sequential recurrence rather than the doubling scan, so only rounding may differ.
+    np.testing.assert_allclose(run_with(backend, output), run_with('numpy', output), rtol=1e-12, atol=1e-15)
+
+def test_ar_filter_recurrence(backend, rng):
+    shocks = rng.normal(0, 1, 50)
+    coefficients = rng.uniform(-0.9, 0.9, 50)
+    expected = shocks.copy()
+    for i in range(1, len(shocks)):
+        expected[i] = shocks[i] + coefficients[i] * expected[i - 1]
+    
+    np.testing.assert_allclose(
+        run_with(backend, lambda: HistoricalDataGenerator._ar_filter(shocks, coefficients)), expected, rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        run_with('numpy', lambda: HistoricalDataGenerator._ar_filter(shocks, coefficients)), expected,
+        rtol=1e-9, atol=1e-12
+    )
+
+def test_longest_run_matches_numpy(backend, rng):
+    mask = rng.random((NUM_RUNS, NUM_BARS)) < 0.6
+    
+    def output():
+        return [PerformanceMetrics.longest_run(mask), np.atleast_1d(PerformanceMetrics.longest_run(mask[0]))]
+    
+    assert_identical(run_with('numpy', output), run_with(backend, output))
+
+def test_long_only_matches_numpy(backend, rng):
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, NUM_BARS)))
+    slippage = rng.uniform(0.0005, 0.005, NUM_BARS)
+    entry = rng.random((NUM_BARS, NUM_RUNS)) < 0.05
+    exit = rng.random((NUM_BARS, NUM_RUNS)) < 0.05
+    last_rows = np.full(NUM_RUNS, NUM_BARS - 1)
+    last_rows[0] = NUM_BARS // 2
+    engine = BacktestEngine()
+    
+    def output():
+        capital_curve, position_curve, trade_rows = engine._simulate_long_only(close, slippage, entry, exit, last_rows)
+        trades = [
+            np.concatenate([getattr(trades, name)[:trades.size] for trades in trade_rows])
+            for name in ('rows', 'is_buy', 'price', 'shares', 'value', 'pnl', 'pnl_pct')
+        ]
+        return [capital_curve, position_curve] + trades
+    
+    assert_identical(run_with('numpy', output), run_with(backend, output))
+
+def test_batch_backtest_matches_numpy(backend):
+    # Generate the data once: the AR filter kernel only agrees with NumPy to rounding.
+    data = run_with('numpy', lambda: HistoricalDataGenerator(3).generate_ohlcv('SPY', '2020-01-01', '2022-12-31'))
+    data = TechnicalIndicators.add_all_indicators(data).dropna()
+    signals = {name: func(data) for name, func in StrategyGenerator.get_all_strategies().items()}
+    
+    def output():
+        return BacktestEngine().run_backtest_batch(data, signals)
+    
+    expected = run_with('numpy', output)
+    actual = run_with(backend, output)
+    for name, result in expected.items():
+        pd.testing.assert_frame_equal(result['trades'], actual[name]['trades'], check_exact=True)
+        pd.testing.assert_frame_equal(result['equity_curve'], actual[name]['equity_curve'], check_exact=True)
+        assert result['metrics'] == actual[name]['metrics']
+
+def test_set_backend_rejects_unknown_names(monkeypatch):
+    monkeypatch.setattr(backends, '_backend', backends.get_backend())
+    with pytest.raises(ValueError):
+        backends.set_backend('fortran')
+    if backends.numba is None:
+        with pytest.raises(ValueError):
+            backends.set_backend('numba')
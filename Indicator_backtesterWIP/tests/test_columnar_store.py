@@ -0,0 +1,40 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from data_generator import HistoricalDataGenerator
+from columnar_store import ColumnarStore
+
+@pytest.fixture
+def data():
+    return HistoricalDataGenerator(3).generate_ohlcv('SPY', '2021-01-01', '2021-12-31')
+
+def write_csv(path, data, blank_lines):
+    lines = data[['Open', 'High', 'Low', 'Close', 'Volume']].to_csv(index_label='Date').splitlines()
+    middle = len(lines) // 2
+    lines = lines[:middle] + [''] * blank_lines + lines[middle:] + [''] * blank_lines
+    path.write_text('\n'.join(lines) + '\n')
+
+@pytest.mark.parametrize('chunksize', [40, 1_000_000])
+@pytest.mark.parametrize('blank_lines', [0, 3])
+def test_ingest_trims_to_parsed_rows(tmp_path, data, chunksize, blank_lines):
+    csv_path = tmp_path / 'SPY.csv'
+    write_csv(csv_path, data, blank_lines)
+    assert ColumnarStore._count_rows(csv_path) == len(data) + 2 * blank_lines
+    
+    store = ColumnarStore(tmp_path / 'store')
+    meta = store.ingest_csv(csv_path, chunksize=chunksize)
+    loaded = store.load('SPY', mmap=False)
+    
+    assert meta['rows'] == len(data) == len(loaded)
+    for column, values in store.load_arrays('SPY').items():
+        assert len(values) == len(data), column
+    np.testing.assert_array_equal(loaded.index.values, data.index.values.astype('datetime64[ns]'))
+    np.testing.assert_allclose(loaded['Close'].to_numpy(), data['Close'].to_numpy())
+    assert not any(name.endswith('.tmp.npy') for name in os.listdir(store._symbol_dir('SPY')))
+
+def test_ingest_rejects_unsorted_dates(tmp_path, data):
+    csv_path = tmp_path / 'SPY.csv'
+    write_csv(csv_path, data.iloc[::-1], 0)
+    with pytest.raises(ValueError):
+        ColumnarStore(tmp_path / 'store').ingest_csv(csv_path)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_generator import HistoricalDataGenerator
+from indicators import TechnicalIndicators
+from strategies import StrategyGenerator
+from backtest_engine import BacktestEngine
+
+@pytest.fixture(scope='module')
+def data():
+    raw = HistoricalDataGenerator(7).generate_ohlcv('SPY', '2020-01-01', '2022-06-30')
+    return TechnicalIndicators.add_all_indicators(raw).dropna()
+
+def assert_same_run(expected, actual):
+    pd.testing.assert_frame_equal(expected['trades'], actual['trades'], check_dtype=False, rtol=1e-12)
+    pd.testing.assert_frame_equal(expected['equity_curve'], actual['equity_curve'], check_dtype=False, rtol=1e-12)
+    assert expected['metrics'].keys() == actual['metrics'].keys()
+    for key, value in expected['metrics'].items():
+        assert actual['metrics'][key] == pytest.approx(value, rel=1e-9, nan_ok=True), key
+
+@pytest.mark.parametrize('strategy_name', list(StrategyGenerator.get_all_strategies()))
+def test_builtin_strategies_match_loop(data, strategy_name):
+    signals = StrategyGenerator.get_all_strategies()[strategy_name](data)
+    engine = BacktestEngine()
+    assert_same_run(engine.run_backtest(data, signals), engine.run_backtest_vectorized(data, signals))
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_masks_match_loop(data, seed):
+    rng = np.random.default_rng(seed)
+    signals = pd.DataFrame({
+        'entry': rng.random(len(data)) < 0.1,
+        'exit': rng.random(len(data)) < 0.1
+    }, index=data.index)
+    engine = BacktestEngine()
+    assert_same_run(engine.run_backtest(data, signals), engine.run_backtest_vectorized(data, signals))
+
+def test_empty_data_matches_loop(data):
+    empty = data.iloc[:0]
+    signals = pd.DataFrame({'entry': [], 'exit': []}, index=empty.index, dtype=bool)
+    engine = BacktestEngine()
+    expected, actual = engine.run_backtest(empty, signals), engine.run_backtest_vectorized(empty, signals)
+    assert expected['metrics'] == actual['metrics']
+    assert len(actual['trades']) == 0
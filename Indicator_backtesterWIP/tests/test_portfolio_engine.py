@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from portfolio_engine import PortfolioEngine
+
+def run(engine, close, entry, exit, priority=None):
+    close = np.asarray(close, dtype=np.float64)
+    index = pd.date_range('2021-01-01', periods=len(close), freq='D')
+    return engine.run(close, np.asarray(entry, dtype=bool), np.asarray(exit, dtype=bool), index,
+                      symbols=[f"S{i}" for i in range(close.shape[1])], priority=priority)
+
+def test_exit_and_entry_on_same_bar_does_not_reenter():
+    engine = PortfolioEngine(initial_capital=10000, commission=0.0, base_slippage=0.0, max_positions=2)
+    close = np.full((5, 2), 100.0)
+    entry = np.zeros((5, 2), dtype=bool)
+    exit = np.zeros((5, 2), dtype=bool)
+    entry[0, 0] = True
+    entry[2, :] = True
+    exit[2, :] = True
+    
+    results = run(engine, close, entry, exit)
+    trades = results['trades']
+    held = trades[trades['symbol'] == 'S0']
+    assert list(held['type']) == ['BUY', 'SELL']
+    assert list(held['date']) == list(results['equity_curve']['date'].iloc[[0, 2]])
+    
+    # A flat symbol with both flags set on a bar is bought, as in the single-symbol engine.
+    flat = trades[trades['symbol'] == 'S1']
+    assert list(flat['type']) == ['BUY', 'SELL']
+    assert flat['date'].iloc[0] == results['equity_curve']['date'].iloc[2]
+    assert results['equity_curve']['num_positions'].tolist() == [1, 1, 1, 1, 1]
+
+def test_buy_budget_split_across_candidates_when_cash_is_short():
+    engine = PortfolioEngine(initial_capital=10000, commission=0.001, base_slippage=0.0,
+                             max_positions=4, position_size=0.5)
+    close = np.full((3, 4), 100.0)
+    entry = np.zeros((3, 4), dtype=bool)
+    entry[0, :] = True
+    
+    results = run(engine, close, entry, np.zeros((3, 4), dtype=bool))
+    buys = results['trades'][results['trades']['type'] == 'BUY']
+    assert len(buys) == 4
+    assert (buys['shares'] == int(2500 / (100 * 1.001))).all()
+    assert (results['equity_curve']['cash'] >= 0).all()
+    assert results['equity_curve']['cash'].iloc[0] == 10000 - buys['value'].sum()
+
+def test_priority_picks_candidates_for_free_slots():
+    engine = PortfolioEngine(initial_capital=10000, commission=0.0, base_slippage=0.0, max_positions=2)
+    close = np.full((2, 3), 50.0)
+    entry = np.zeros((2, 3), dtype=bool)
+    entry[0, :] = True
+    priority = np.array([[1.0, 3.0, 2.0], [0.0, 0.0, 0.0]])
+    
+    results = run(engine, close, entry, np.zeros((2, 3), dtype=bool), priority)
+    buys = results['trades'][results['trades']['type'] == 'BUY']
+    assert sorted(buys['symbol']) == ['S1', 'S2']
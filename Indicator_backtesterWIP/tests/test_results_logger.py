@@ -0,0 +1,51 @@
+import sqlite3
+import pytest
+from results_logger import ResultsLogger
+
+@pytest.fixture
+def logger(tmp_path):
+    logger = ResultsLogger(str(tmp_path / 'results.db'), None)
+    yield logger
+    logger.close()
+
+def test_summaries_only_count_plain_backtests(logger):
+    logger.save_result('TEMP_RSI_Only', {'total_return_pct': 10.0})
+    with logger.session():
+        for value in (100.0, 200.0, 300.0):
+            logger.save_result('TEMP_RSI_Only', {'total_return_pct': value}, {'params': {}}, run_type='optimization')
+        logger.save_result('TEMP_MACD_Only', {'total_return_pct': 5.0}, run_type='walk_forward')
+        
+        assert logger.get_unique_strategies() == ['TEMP_RSI_Only']
+        assert logger.compare_strategies().loc['TEMP_RSI_Only', 'num_tests'] == 1
+    
+    assert logger.get_unique_strategies() == ['TEMP_RSI_Only']
+    assert sorted(logger.get_unique_strategies(run_type=None)) == ['TEMP_MACD_Only', 'TEMP_RSI_Only']
+    comparison = logger.compare_strategies()
+    assert list(comparison.index) == ['TEMP_RSI_Only']
+    assert comparison.loc['TEMP_RSI_Only', 'avg'] == 10.0
+    assert logger.get_best_strategy() == ('TEMP_RSI_Only', 10.0)
+    assert len(logger.get_results_by_strategy('TEMP_RSI_Only')) == 1
+    assert len(logger.get_results_by_strategy('TEMP_RSI_Only', run_type='optimization')) == 3
+    assert len(logger.get_summary_dataframe()) == 1
+    assert len(logger.get_summary_dataframe(run_type=None)) == 5
+
+def test_old_logs_gain_run_type_column(tmp_path):
+    path = str(tmp_path / 'old.db')
+    connection = sqlite3.connect(path)
+    connection.execute(
+        'CREATE TABLE results (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, '
+        'strategy_name TEXT NOT NULL, metrics TEXT NOT NULL, data_info TEXT NOT NULL)'
+    )
+    connection.execute(
+        "INSERT INTO results (timestamp, strategy_name, metrics, data_info) "
+        "VALUES ('2024-01-01T00:00:00', 'TEMP_RSI_Only', '{\"total_return_pct\": 1.0}', '{}')"
+    )
+    connection.commit()
+    connection.close()
+    
+    logger = ResultsLogger(path, None)
+    try:
+        assert logger.load_all_results()[0]['run_type'] == 'backtest'
+        assert logger.get_unique_strategies() == ['TEMP_RSI_Only']
+    finally:
+        logger.close()
@@ -0,0 +1,54 @@
+import types
+import numpy as np
+import pytest
+from data_generator import HistoricalDataGenerator
+from indicators import LazyIndicatorFrame
+from snapshot_cache import SnapshotCache
+
+GENERATOR_PARAMS = {'seed': 9, 'symbol': 'SPY', 'start': '2022-01-01', 'end': '2022-12-31'}
+
+def build():
+    return HistoricalDataGenerator(9).generate_ohlcv('SPY', '2022-01-01', '2022-12-31')
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(SnapshotCache, '_code_version', None)
+    return SnapshotCache(str(tmp_path / 'snapshots'))
+
+def test_round_trip(cache):
+    data, frame, hit = cache.get_or_build(GENERATOR_PARAMS, {}, build)
+    assert not hit
+    
+    loaded, loaded_frame, hit = cache.get_or_build(GENERATOR_PARAMS, {}, build)
+    assert hit
+    assert list(loaded.columns) == list(data.columns)
+    np.testing.assert_array_equal(loaded.index.values, data.index.values.astype('datetime64[ns]'))
+    for column in data.columns:
+        np.testing.assert_array_equal(np.asarray(loaded[column]), np.asarray(data[column]), err_msg=column)
+    for column in LazyIndicatorFrame.INDICATOR_COLUMNS:
+        np.testing.assert_array_equal(loaded_frame[column].to_numpy(), frame[column].to_numpy(), err_msg=column)
+
+def test_code_version_change_invalidates(cache, monkeypatch):
+    cache.get_or_build(GENERATOR_PARAMS, {}, build)
+    key = SnapshotCache.key(GENERATOR_PARAMS, {})
+    assert cache.contains(key)
+    
+    monkeypatch.setattr(SnapshotCache, '_code_version', 'edited')
+    assert SnapshotCache.key(GENERATOR_PARAMS, {}) != key
+    _, _, hit = cache.get_or_build(GENERATOR_PARAMS, {}, build)
+    assert not hit
+
+def test_code_version_follows_source(tmp_path, monkeypatch):
+    source = tmp_path / 'module.py'
+    source.write_text('VALUE = 1\n')
+    monkeypatch.setattr(SnapshotCache, 'SOURCE_MODULES', (types.SimpleNamespace(__file__=str(source)),))
+    
+    monkeypatch.setattr(SnapshotCache, '_code_version', None)
+    before = SnapshotCache.code_version()
+    source.write_text('VALUE = 2\n')
+    monkeypatch.setattr(SnapshotCache, '_code_version', None)
+    assert SnapshotCache.code_version() != before
+
+def test_params_change_key(cache):
+    assert SnapshotCache.key(GENERATOR_PARAMS, {}) != SnapshotCache.key(GENERATOR_PARAMS, {'rsi_period': 10})
+    assert SnapshotCache.key(GENERATOR_PARAMS, {}) != SnapshotCache.key({**GENERATOR_PARAMS, 'seed': 10}, {})
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_generator import HistoricalDataGenerator
+from indicators import LazyIndicatorFrame
+from strategies import StrategyGenerator, RSI, MACD, MACD_SIGNAL
+from strategy_dsl import Rule, SignalGraph, col, param, crosses_above, crosses_below
+
+@pytest.fixture(scope='module')
+def frame():
+    return LazyIndicatorFrame(HistoricalDataGenerator(11).generate_ohlcv('SPY', '2020-01-01', '2023-12-31'))
+
+def test_mirrored_comparisons_share_one_node():
+    assert (RSI < 30).key == (30 > RSI).key
+    assert (RSI <= MACD).key == (MACD >= RSI).key
+    assert ((RSI > 30) & (MACD > 0)).key == ((MACD > 0) & (RSI > 30)).key
+    assert RSI.equals(30).key == col('TEMP_RSI').equals(30).key
+    assert RSI.shift(1).shift(2).key == RSI.shift(3).key
+
+def test_shared_subexpressions_are_evaluated_once():
+    graph = SignalGraph()
+    for name in ('TEMP_MACD_Only', 'TEMP_RSI_MACD_Combo', 'TEMP_Triple_Confirmation'):
+        graph.add(name, StrategyGenerator.RULES[name])
+    
+    cross = crosses_above(MACD, MACD_SIGNAL).key
+    assert cross in graph.nodes
+    separate = sum(len(StrategyGenerator.RULES[name].bind().nodes()) for name in graph.outputs)
+    assert len(graph.nodes) < separate
+
+def test_generate_signals_matches_each_rule(frame):
+    data = frame.materialize(LazyIndicatorFrame.INDICATOR_COLUMNS)
+    params = {'TEMP_RSI_Only': {'oversold': 25}, 'TEMP_Triple_Confirmation': {'stoch_oversold': 15}}
+    signals = StrategyGenerator.generate_signals(data, strategy_params=params)
+    
+    assert list(signals) == list(StrategyGenerator.RULES)
+    for name, rule in StrategyGenerator.RULES.items():
+        trimmed = frame.trimmed(StrategyGenerator.get_strategy_requirements(name))
+        expected = rule.evaluate(trimmed, **params.get(name, {}))
+        pd.testing.assert_frame_equal(signals[name], expected)
+
+def test_generate_signals_handles_holes(frame):
+    data = frame.materialize(LazyIndicatorFrame.INDICATOR_COLUMNS).copy()
+    data.iloc[300:305, data.columns.get_loc('TEMP_RSI')] = np.nan
+    signals = StrategyGenerator.generate_signals(data, ['TEMP_RSI_Only'])['TEMP_RSI_Only']
+    expected = StrategyGenerator.RULES['TEMP_RSI_Only'].evaluate(data.dropna(subset=['TEMP_RSI']))
+    pd.testing.assert_frame_equal(signals, expected)
+
+def test_registered_rule_drops_in(monkeypatch, frame):
+    rule = Rule(
+        entry=crosses_above(RSI, RSI.shift(3)),
+        exit=crosses_below(RSI, param('exit_level', 60)),
+        description='RSI momentum'
+    )
+    monkeypatch.setitem(StrategyGenerator.RULES, 'RSI_Momentum', rule)
+    
+    assert StrategyGenerator.get_strategy_requirements('RSI_Momentum') == ['TEMP_RSI']
+    assert StrategyGenerator.get_strategy_description('RSI_Momentum') == 'RSI momentum'
+    assert rule.max_lag() == 4
+    
+    data = frame.trimmed(['TEMP_RSI'])
+    strategy = StrategyGenerator.get_all_strategies()['RSI_Momentum']
+    pd.testing.assert_frame_equal(strategy(data, exit_level=55), rule.evaluate(data, exit_level=55))
+    with pytest.raises(TypeError):
+        strategy(data, exit_levle=55)
+
+@pytest.mark.parametrize('build', [
+    lambda: RSI == 30,
+    lambda: RSI != 30,
+    lambda: 30 == RSI,
+    lambda: bool(RSI > 30),
+    lambda: (RSI > 30) and (MACD > 0)
+])
+def test_python_comparisons_and_truthiness_raise(build):
+    with pytest.raises(TypeError):
+        build()
+
+def test_numeric_operands_are_rejected_by_logic():
+    with pytest.raises(ValueError):
+        RSI & (MACD > 0)
+    with pytest.raises(ValueError):
+        ~RSI
+    with pytest.raises(ValueError):
+        RSI.shift(-1)
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from data_generator import HistoricalDataGenerator
+from indicators import LazyIndicatorFrame
+from strategies import StrategyGenerator, RSI
+from strategy_dsl import Rule, crosses_above, crosses_below
+from streaming_backtest import StreamingBacktester, BarSource
+from backtest_engine import BacktestEngine
+
+CHUNK_SIZES = [7, 50, 10_000]
+
+@pytest.fixture(scope='module')
+def data():
+    return HistoricalDataGenerator(2).generate_ohlcv('SPY', '2013-01-01', '2016-12-31')
+
+@pytest.fixture
+def lag_rule(monkeypatch):
+    rule = Rule(entry=crosses_above(RSI, RSI.shift(3)), exit=crosses_below(RSI, RSI.shift(3)))
+    monkeypatch.setitem(StrategyGenerator.RULES, 'RSI_Lag3', rule)
+    return 'RSI_Lag3'
+
+def batch_result(data, strategy_name):
+    trimmed = LazyIndicatorFrame(data).trimmed(StrategyGenerator.get_strategy_requirements(strategy_name))
+    signals = StrategyGenerator.get_all_strategies()[strategy_name](trimmed)
+    return BacktestEngine().run_backtest_vectorized(trimmed, signals)
+
+def stream_result(data, strategy_name, chunk_size):
+    backtester = StreamingBacktester(strategy_name, chunk_size=chunk_size)
+    return backtester.run_to_completion(BarSource.from_frame(data, chunk_size))
+
+def assert_matches_batch(data, strategy_name, chunk_size):
+    expected = batch_result(data, strategy_name)
+    actual = stream_result(data, strategy_name, chunk_size)
+    
+    pd.testing.assert_series_equal(
+        actual['trades']['date'], expected['trades']['date'], check_names=False, check_dtype=False
+    )
+    pd.testing.assert_frame_equal(
+        actual['trades'][['type', 'price', 'shares', 'value']],
+        expected['trades'][['type', 'price', 'shares', 'value']],
+        check_dtype=False, rtol=1e-12
+    )
+    for key, value in expected['metrics'].items():
+        assert actual['metrics'][key] == pytest.approx(value, abs=0.011), key
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('strategy_name', list(StrategyGenerator.RULES))
+def test_builtin_strategies_match_batch(data, strategy_name, chunk_size):
+    assert_matches_batch(data, strategy_name, chunk_size)
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_lagged_rule_matches_batch(data, lag_rule, chunk_size):
+    assert StrategyGenerator.RULES[lag_rule].max_lag() == 4
+    assert_matches_batch(data, lag_rule, chunk_size)
+
+def test_run_keeps_no_trade_history(data):
+    backtester = StreamingBacktester('TEMP_MACD_Only', chunk_size=100)
+    trades = [payload for kind, payload in backtester.run(BarSource.from_frame(data, 100)) if kind == 'trade']
+    
+    assert not hasattr(backtester, 'trades')
+    assert backtester.metrics['num_trades'] == sum(trade['type'] == 'SELL' for trade in trades)
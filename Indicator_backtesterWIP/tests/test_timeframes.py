@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from timeframes import TimeframeResampler
+
+@pytest.fixture(scope='module')
+def base():
+    rng = np.random.default_rng(5)
+    index = pd.date_range('2024-01-02 09:30', periods=400, freq='1min')
+    # Drop a few minutes so some buckets close without their last base bar.
+    index = index.delete([7, 8, 9, 61, 239])
+    close = 100 + np.cumsum(rng.normal(0, 0.1, len(index)))
+    spread = rng.uniform(0.01, 0.2, len(index))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.05, len(index)),
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(100, 1000, len(index)).astype(np.float64)
+    }, index=pd.DatetimeIndex(index, name='Date'))
+
+def test_completed_rows_at_bucket_boundary(base):
+    resampler = TimeframeResampler(base.iloc[:20], timeframes=('5m',))
+    rows = resampler.completed_rows('5m')
+    # 09:30-09:33 are still inside the first bucket and 09:34 closes it at 09:35. 09:37-09:39 are
+    # missing, so the 09:35 bucket first becomes usable at the close of the 09:40 bar.
+    assert base.index[:9].strftime('%H:%M').tolist() == [
+        '09:30', '09:31', '09:32', '09:33', '09:34', '09:35', '09:36', '09:40', '09:41'
+    ]
+    assert rows[:9].tolist() == [-1, -1, -1, -1, 0, 0, 0, 1, 1]
+    assert rows[base.index.get_loc(pd.Timestamp('2024-01-02 09:44'))] == 2
+    assert rows[base.index.get_loc(pd.Timestamp('2024-01-02 09:43'))] == 1
+
+@pytest.mark.parametrize('timeframe', ['5m', '15m', '1H'])
+def test_completed_rows_never_look_ahead(base, timeframe):
+    resampler = TimeframeResampler(base, timeframes=(timeframe,))
+    rows = resampler.completed_rows(timeframe)
+    step = resampler.timeframes[timeframe]
+    base_close = base.index.values.astype('datetime64[ns]').view(np.int64) + resampler.base_step
+    bucket_start = resampler.bars(timeframe).index.values.astype('datetime64[ns]').view(np.int64)
+    
+    available = rows >= 0
+    assert np.all(bucket_start[rows[available]] + step <= base_close[available])
+    following = rows + 1
+    pending = following < len(bucket_start)
+    assert np.all(bucket_start[following[pending]] + step > base_close[pending])
+
+def test_incremental_updates_match_one_shot(base):
+    timeframes = ('5m', '15m', '1H')
+    one_shot = TimeframeResampler(base, timeframes=timeframes)
+    
+    incremental = TimeframeResampler(base.iloc[:13], timeframes=timeframes)
+    for timeframe in timeframes:
+        incremental.completed_rows(timeframe)
+    for lo, hi in ((13, 50), (50, 51), (51, 200)):
+        incremental.update(base.iloc[lo:hi])
+        for timeframe in timeframes:
+            incremental.completed_rows(timeframe)
+    for timestamp, bar in base.iloc[200:].iterrows():
+        incremental.add_bar(timestamp, bar['Open'], bar['High'], bar['Low'], bar['Close'], bar['Volume'])
+        if timestamp.minute % 7 == 0:
+            incremental.completed_rows('5m')
+    
+    pd.testing.assert_frame_equal(incremental.base(), one_shot.base())
+    for timeframe in timeframes:
+        pd.testing.assert_frame_equal(incremental.bars(timeframe), one_shot.bars(timeframe))
+        np.testing.assert_array_equal(incremental.completed_rows(timeframe), one_shot.completed_rows(timeframe))
+        pd.testing.assert_frame_equal(incremental.aligned_frame(timeframe), one_shot.aligned_frame(timeframe))
+        assert incremental.latest(timeframe) == one_shot.latest(timeframe)
+
+def test_out_of_order_bars_rejected(base):
+    resampler = TimeframeResampler(base.iloc[:10], timeframes=('5m',))
+    with pytest.raises(ValueError):
+        resampler.update(base.iloc[5:15])
+    with pytest.raises(ValueError):
+        resampler.add_bar(base.index[9], 1.0, 1.0, 1.0, 1.0)
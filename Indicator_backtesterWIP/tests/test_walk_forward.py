@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from data_generator import HistoricalDataGenerator
+from indicators import TechnicalIndicators
+from strategies import StrategyGenerator
+from backtest_engine import BacktestEngine
+from walk_forward import WalkForwardScheduler
+
+@pytest.fixture(scope='module')
+def data():
+    return HistoricalDataGenerator(11).generate_ohlcv('SPY', '2016-01-01', '2019-12-31')
+
+def test_windows_reject_overlapping_test_slices():
+    with pytest.raises(ValueError):
+        WalkForwardScheduler.windows(1000, 252, 126, step_bars=63)
+
+@pytest.mark.parametrize('anchored', [False, True])
+def test_windows_test_slices_are_disjoint(anchored):
+    windows = WalkForwardScheduler.windows(1000, 252, 126, step_bars=150, anchored=anchored)
+    for (_, _, previous_end), (_, test_start, _) in zip(windows, windows[1:]):
+        assert test_start >= previous_end
+
+@pytest.mark.parametrize('step_bars', [None, 200])
+def test_stitched_dates_strictly_increasing(data, step_bars):
+    scheduler = WalkForwardScheduler(data, max_workers=2)
+    results = scheduler.run('TEMP_SMA_Crossover', train_bars=252, test_bars=126, step_bars=step_bars,
+                            n_iter=2, seed=0)
+    dates = results['equity_curve']['date']
+    assert len(dates) > 0
+    assert dates.is_monotonic_increasing and dates.is_unique
+
+def test_stitch_keeps_whole_shares(data):
+    frame = TechnicalIndicators.add_all_indicators(data).dropna()
+    signals = StrategyGenerator.get_all_strategies()['TEMP_RSI_Only'](frame)
+    engine = BacktestEngine()
+    half = len(frame) // 2
+    window_results = [
+        (None, engine.run_backtest_vectorized(frame.iloc[rows], signals.iloc[rows]))
+        for rows in (slice(0, half), slice(half, None))
+    ]
+    
+    _, trades = WalkForwardScheduler(data)._stitch(window_results)
+    second = window_results[1][1]['trades']
+    scale = window_results[0][1]['equity_curve']['equity'].iloc[-1] / engine.initial_capital
+    assert len(second) > 0 and scale != pytest.approx(1.0)
+    assert np.array_equal(trades['shares'], np.round(trades['shares']))
+    np.testing.assert_allclose(trades['pnl'].to_numpy()[-len(second):], second['pnl'].to_numpy() * scale)
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+from indicators import LazyIndicatorFrame
+
+class _BarBuffer:
+    
+    __slots__ = ('size', 'start', 'open', 'high', 'low', 'close', 'volume')
+    
+    COLUMNS = ('start', 'open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.start = np.empty(capacity, dtype=np.int64)
+        self.open = np.empty(capacity, dtype=np.float64)
+        self.high = np.empty(capacity, dtype=np.float64)
+        self.low = np.empty(capacity, dtype=np.float64)
+        self.close = np.empty(capacity, dtype=np.float64)
+        self.volume = np.empty(capacity, dtype=np.float64)
+    
+    def _grow(self, needed):
+        capacity = max(2 * len(self.start), needed, 1)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def extend(self, start, open_, high, low, close, volume):
+        count = len(start)
+        if self.size + count > len(self.start):
+            self._grow(self.size + count)
+        
+        rows = slice(self.size, self.size + count)
+        self.start[rows] = start
+        self.open[rows] = open_
+        self.high[rows] = high
+        self.low[rows] = low
+        self.close[rows] = close
+        self.volume[rows] = volume
+        self.size += count
+    
+    def merge_last(self, high, low, close, volume):
+        i = self.size - 1
+        self.high[i] = np.fmax(self.high[i], high)
+        self.low[i] = np.fmin(self.low[i], low)
+        self.close[i] = close
+        self.volume[i] += volume
+    
+    def to_frame(self):
+        n = self.size
+        return pd.DataFrame({
+            'Open': self.open[:n],
+            'High': self.high[:n],
+            'Low': self.low[:n],
+            'Close': self.close[:n],
+            'Volume': self.volume[:n]
+        }, index=pd.DatetimeIndex(self.start[:n].view('datetime64[ns]'), name='Date'), copy=False)
+
+class TimeframeResampler:
+    
+    TIMEFRAMES = {'5m': '5min', '15m': '15min', '1H': '1h', '4H': '4h'}
+    
+    def __init__(self, base, timeframes=('5m', '15m', '1H', '4H'), base_freq='1min'):
+        self.base_step = pd.Timedelta(base_freq).value
+        self.timeframes = {timeframe: self._step(timeframe) for timeframe in timeframes}
+        for timeframe, step in self.timeframes.items():
+            if step % self.base_step != 0:
+                raise ValueError(f"Timeframe {timeframe} is not a multiple of the {base_freq} base bars")
+        
+        self._base = _BarBuffer()
+        self._bars = {timeframe: _BarBuffer() for timeframe in self.timeframes}
+        self._frames = {}
+        self._rows = {}
+        self.update(base)
+    
+    def _step(self, timeframe):
+        if timeframe in self.TIMEFRAMES:
+            return pd.Timedelta(self.TIMEFRAMES[timeframe]).value
+        if str(timeframe).isdigit():
+            return pd.Timedelta(minutes=int(timeframe)).value
+        return pd.Timedelta(timeframe).value
+    
+    @staticmethod
+    def _aggregate(start, open_, high, low, close, volume, step):
+        bucket = start - start % step
+        breaks = np.flatnonzero(bucket[1:] != bucket[:-1]) + 1
+        first = np.concatenate(([0], breaks))
+        last = np.concatenate((breaks - 1, [len(start) - 1]))
+        return (
+            bucket[first], open_[first], np.fmax.reduceat(high, first), np.fmin.reduceat(low, first),
+            close[last], np.add.reduceat(volume, first)
+        )
+    
+    def update(self, data):
+        data = LazyIndicatorFrame.from_arrays(data)
+        if len(data) == 0:
+            return
+        
+        start = data.index.values.astype('datetime64[ns]').view(np.int64)
+        if np.any(start[1:] <= start[:-1]) or (self._base.size > 0 and start[0] <= self._base.start[self._base.size - 1]):
+            raise ValueError("Base bars must arrive in strictly increasing time order")
+        
+        columns = [data[column].to_numpy(dtype=np.float64) for column in ('Open', 'High', 'Low', 'Close', 'Volume')]
+        self._base.extend(start, *columns)
+        
+        for timeframe, step in self.timeframes.items():
+            bars = self._bars[timeframe]
+            aggregated = self._aggregate(start, *columns, step)
+            
+            if bars.size > 0 and aggregated[0][0] == bars.start[bars.size - 1]:
+                bars.merge_last(aggregated[2][0], aggregated[3][0], aggregated[4][0], aggregated[5][0])
+                aggregated = tuple(column[1:] for column in aggregated)
+            bars.extend(*aggregated)
+        
+        self._frames.clear()
+    
+    def add_bar(self, timestamp, open_, high, low, close, volume=0.0):
+        start = pd.Timestamp(timestamp).value
+        if self._base.size > 0 and start <= self._base.start[self._base.size - 1]:
+            raise ValueError("Base bars must arrive in strictly increasing time order")
+        
+        self._base.extend([start], [open_], [high], [low], [close], [volume])
+        for timeframe, step in self.timeframes.items():
+            bars = self._bars[timeframe]
+            bucket = start - start % step
+            if bars.size > 0 and bars.start[bars.size - 1] == bucket:
+                bars.merge_last(high, low, close, volume)
+            else:
+                bars.extend([bucket], [open_], [high], [low], [close], [volume])
+        
+        self._frames.clear()
+    
+    def base(self):
+        if None not in self._frames:
+            self._frames[None] = self._base.to_frame()
+        return self._frames[None]
+    
+    def bars(self, timeframe):
+        if timeframe not in self._frames:
+            self._frames[timeframe] = self._bars[timeframe].to_frame()
+        return self._frames[timeframe]
+    
+    def completed_rows(self, timeframe):
+        # A higher-timeframe bar is usable from the first base bar whose close reaches the bucket
+        # end: the bucket's closing bar sees it at its own close, earlier bars never do. Base bars
+        # only append and finished buckets never change, so only newly appended bars are aligned.
+        rows, count = self._rows.get(timeframe, (np.empty(0, dtype=np.int64), 0))
+        size = self._base.size
+        if count < size:
+            if size > len(rows):
+                grown = np.empty(max(2 * len(rows), size), dtype=np.int64)
+                grown[:count] = rows[:count]
+                rows = grown
+            
+            bars = self._bars[timeframe]
+            base_close = self._base.start[count:size] + self.base_step
+            rows[count:size] = np.searchsorted(
+                bars.start[:bars.size], base_close - self.timeframes[timeframe], side='right'
+            ) - 1
+            self._rows[timeframe] = (rows, size)
+        return rows[:size]
+    
+    def align(self, timeframe, values):
+        values = np.asarray(values)
+        rows = self.completed_rows(timeframe)
+        aligned = np.full(len(rows), np.nan, dtype=np.result_type(values.dtype, np.float64))
+        available = rows >= 0
+        aligned[available] = values[rows[available]]
+        return aligned
+    
+    def aligned_frame(self, timeframe, columns=('Open', 'High', 'Low', 'Close', 'Volume')):
+        bars = self.bars(timeframe)
+        return pd.DataFrame(
+            {f"{column}_{timeframe}": self.align(timeframe, bars[column].to_numpy()) for column in columns},
+            index=self.base().index
+        )
+    
+    def latest(self, timeframe):
+        bars = self._bars[timeframe]
+        if bars.size == 0:
+            return None
+        
+        last_close = self._base.start[self._base.size - 1] + self.base_step
+        i = bars.size - 1
+        if bars.start[i] + self.timeframes[timeframe] > last_close:
+            i -= 1
+        if i < 0:
+            return None
+        
+        return {
+            'Date': pd.Timestamp(bars.start[i]),
+            'Open': bars.open[i],
+            'High': bars.high[i],
+            'Low': bars.low[i],
+            'Close': bars.close[i],
+            'Volume': bars.volume[i]
+        }
@@ -0,0 +1,197 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import optimizer
+from optimizer import SharedOHLCV, ParameterOptimizer, _init_worker
+from indicators import LazyIndicatorFrame
+from strategies import StrategyGenerator
+from backtest_engine import BacktestEngine
+
+_WORKER_FRAMES = {}
+_WORKER_SIGNALS = {}
+
+def _worker_frame(strategy_name, indicator_params):
+    key = (strategy_name, tuple(sorted(indicator_params.items())))
+    if key not in _WORKER_FRAMES:
+        frame = LazyIndicatorFrame(optimizer._WORKER_DATA, calculator=optimizer._WORKER_CACHE, **indicator_params)
+        _WORKER_FRAMES[key] = frame.trimmed(StrategyGenerator.get_strategy_requirements(strategy_name))
+    return _WORKER_FRAMES[key]
+
+def _worker_signals(strategy_name, indicator_params, params):
+    # Signals only depend on the parameter set, so every window this worker handles slices the same run.
+    key = (strategy_name, tuple(sorted(indicator_params.items())), tuple(sorted(params.items())))
+    if key not in _WORKER_SIGNALS:
+        frame = _worker_frame(strategy_name, indicator_params)
+        _WORKER_SIGNALS[key] = StrategyGenerator.get_all_strategies()[strategy_name](frame, **params)
+    return _WORKER_SIGNALS[key]
+
+def _slice_rows(index, start, end):
+    return slice(index.searchsorted(start), len(index) if end is None else index.searchsorted(end))
+
+def _run_window(strategy_name, window, tasks, metric, initial_capital, commission):
+    data_index = optimizer._WORKER_DATA.index
+    train_lo, train_hi, test_hi = window
+    train_start = data_index[train_lo]
+    test_start = data_index[train_hi]
+    test_end = data_index[test_hi] if test_hi < len(data_index) else None
+    
+    engine = BacktestEngine(initial_capital=initial_capital, commission=commission)
+    best = None
+    
+    for indicator_params, param_sets in tasks:
+        frame = _worker_frame(strategy_name, indicator_params)
+        train_rows = _slice_rows(frame.index, train_start, test_start)
+        train = frame.iloc[train_rows]
+        if len(train) == 0:
+            continue
+        
+        signals = [_worker_signals(strategy_name, indicator_params, params) for params in param_sets]
+        results = engine.run_backtest_batch(
+            train, {i: strategy_signals.iloc[train_rows] for i, strategy_signals in enumerate(signals)}
+        )
+        
+        for i, params in enumerate(param_sets):
+            score = results[i]['metrics'][metric]
+            if best is None or score > best[0]:
+                best = (score, indicator_params, params, frame, signals[i], results[i]['metrics'])
+    
+    if best is None:
+        return window, None
+    
+    score, indicator_params, strategy_params, frame, signals, in_sample = best
+    test_rows = _slice_rows(frame.index, test_start, test_end)
+    out_of_sample = engine.run_backtest_vectorized(frame.iloc[test_rows], signals.iloc[test_rows])
+    
+    return window, {
+        'indicator_params': indicator_params,
+        'strategy_params': strategy_params,
+        'in_sample': in_sample,
+        'out_of_sample': out_of_sample['metrics'],
+        'equity_curve': out_of_sample['equity_curve'],
+        'trades': out_of_sample['trades']
+    }
+
+class WalkForwardScheduler:
+    
+    def __init__(self, data, initial_capital=10000, commission=0.001, max_workers=None, cache_dir=None):
+        self.data = data
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+    
+    @staticmethod
+    def windows(num_bars, train_bars, test_bars, step_bars=None, anchored=False):
+        step_bars = step_bars or test_bars
+        if step_bars < test_bars:
+            # Overlapping out-of-sample slices would be chained twice in the stitched equity curve.
+            raise ValueError(f"step_bars ({step_bars}) must be at least test_bars ({test_bars})")
+        windows = []
+        
+        train_hi = train_bars
+        while train_hi < num_bars:
+            train_lo = 0 if anchored else train_hi - train_bars
+            test_hi = min(train_hi + test_bars, num_bars)
+            windows.append((train_lo, train_hi, test_hi))
+            train_hi += step_bars
+        
+        return windows
+    
+    def _stitch(self, window_results):
+        # Each window is simulated from initial_capital; rescale its equity and trade value/pnl to
+        # the capital the stitched curve actually carries into the window.
+        segments = []
+        trades = []
+        capital = self.initial_capital
+        
+        for window_number, (_, result) in enumerate(window_results):
+            if result is None or result['equity_curve'].empty:
+                continue
+            
+            equity_curve = result['equity_curve']
+            growth = equity_curve['equity'].to_numpy() / self.initial_capital
+            segments.append(pd.DataFrame({
+                'date': equity_curve['date'],
+                'equity': capital * growth,
+                'window': window_number
+            }))
+            
+            if not result['trades'].empty:
+                window_trades = result['trades'].copy()
+                scale = capital / self.initial_capital
+                for column in ('value', 'pnl'):
+                    if column in window_trades:
+                        window_trades[column] = window_trades[column] * scale
+                trades.append(window_trades)
+            
+            capital = capital * growth[-1]
+        
+        if not segments:
+            return pd.DataFrame(columns=['date', 'equity', 'window']), pd.DataFrame()
+        trades = pd.concat(trades, ignore_index=True) if trades else pd.DataFrame()
+        return pd.concat(segments, ignore_index=True), trades
+    
+    def run(self, strategy_name, train_bars=504, test_bars=126, step_bars=None, anchored=False,
+            indicator_grid=None, strategy_grid=None, n_iter=None, metric='sharpe_ratio', seed=None):
+        default_indicator_grid, default_strategy_grid = StrategyGenerator.get_parameter_grid(strategy_name)
+        indicator_grid = default_indicator_grid if indicator_grid is None else indicator_grid
+        strategy_grid = default_strategy_grid if strategy_grid is None else strategy_grid
+        
+        tasks = ParameterOptimizer.expand_grid(indicator_grid, strategy_grid, n_iter, seed)
+        windows = self.windows(len(self.data), train_bars, test_bars, step_bars, anchored)
+        num_runs = sum(len(param_sets) for _, param_sets in tasks)
+        print(f"Walk-forward {strategy_name}: {len(windows)} windows x {num_runs} parameter sets "
+              f"across {self.max_workers} workers...")
+        
+        shared = SharedOHLCV(self.data)
+        window_results = {}
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(shared.spec, self.cache_dir)) as executor:
+                futures = [
+                    executor.submit(_run_window, strategy_name, window, tasks, metric,
+                                    self.initial_capital, self.commission)
+                    for window in windows
+                ]
+                
+                for future in as_completed(futures):
+                    window, result = future.result()
+                    window_results[window] = result
+                    print(f"  {len(window_results)}/{len(windows)} windows done")
+        finally:
+            shared.close()
+        
+        ordered = [(window, window_results[window]) for window in windows]
+        index = self.data.index
+        rows = []
+        for window_number, ((train_lo, train_hi, test_hi), result) in enumerate(ordered):
+            row = {
+                'window': window_number,
+                'train_start': index[train_lo],
+                'train_end': index[train_hi - 1],
+                'test_start': index[train_hi],
+                'test_end': index[test_hi - 1]
+            }
+            if result is not None:
+                row['params'] = ParameterOptimizer.format_label(
+                    strategy_name, result['indicator_params'], result['strategy_params']
+                )
+                row[f'is_{metric}'] = result['in_sample'][metric]
+                row.update(result['out_of_sample'])
+            rows.append(row)
+        
+        equity_curve, trades = self._stitch(ordered)
+        
+        engine = BacktestEngine(initial_capital=self.initial_capital, commission=self.commission)
+        metrics = engine._calculate_metrics(
+            {'equity': equity_curve['equity'].to_numpy(dtype=np.float64)},
+            trades,
+            self.initial_capital
+        )
+        
+        return {
+            'windows': pd.DataFrame(rows),
+            'equity_curve': equity_curve,
+            'metrics': metrics
+        }